@@ -0,0 +1,36 @@
+"""Benchmark of the size and encoding time of the graph data embedded in the HTML.
+
+Compares the JSON text of a graph with its binary form of base64-encoded typed arrays,
+which the templates decode in the browser.
+
+Usage: python bench_binary_payload.py
+
+"""
+
+import time
+
+import networkx as nx
+
+import gravis as gv
+
+
+def measure(data, binary):
+    start = time.perf_counter()
+    text = str(gv._internal.conversion._internal.GraphDataJSON(data, binary=binary))
+    duration = time.perf_counter() - start
+    return duration, len(text)
+
+
+def main():
+    graph = nx.gnm_random_graph(10**5, 10**6, seed=42)
+    nx.set_node_attributes(graph, 'red', 'color')
+    nx.set_edge_attributes(graph, 1.5, 'size')
+    data = gv._internal.conversion._internal.normalize_graph_data(graph)
+    print('{:>8} {:>10} {:>12}'.format('format', 'time [s]', 'size [MB]'))
+    for name, binary in [('json', False), ('binary', True)]:
+        duration, size = measure(data, binary)
+        print('{:>8} {:>10.2f} {:>12.1f}'.format(name, duration, size / 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""Benchmark of the file size and export time of compressed standalone HTML files.
+
+Compares a plain export with one where the javascript code and graph data are embedded
+in gzip-compressed form, for a small and a large graph.
+
+Usage: python bench_compressed_html.py
+
+"""
+
+import os
+import tempfile
+import time
+
+import networkx as nx
+
+import gravis as gv
+
+
+def measure(fig, filepath, compress):
+    start = time.perf_counter()
+    fig.export_html(filepath, overwrite=True, compress=compress)
+    duration = time.perf_counter() - start
+    return duration, os.path.getsize(filepath)
+
+
+def main():
+    small_graph = nx.les_miserables_graph()
+    large_graph = nx.gnm_random_graph(10**5, 10**6, seed=42)
+    nx.set_edge_attributes(large_graph, 1.5, 'size')
+    print('{:>8} {:>10} {:>10} {:>10}'.format('graph', 'compress', 'time [s]', 'size [MB]'))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filepath = os.path.join(tmpdir, 'figure.html')
+        for name, graph in [('small', small_graph), ('large', large_graph)]:
+            fig = gv.d3(graph)
+            for compress in [False, True]:
+                duration, size = measure(fig, filepath, compress)
+                print('{:>8} {:>10} {:>10.2f} {:>10.2f}'.format(
+                    name, str(compress), duration, size / 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark of time and peak memory needed for reading a large gJGF file.
+
+Compares loading the complete file with ``json.load``, as done previously, with the
+incremental parser that fills columnar graphs batch by batch.
+
+Usage: python bench_gjgf_streaming.py
+
+"""
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import networkx as nx
+
+import gravis as gv
+from gravis._internal.conversion import _streaming
+
+
+def load_in_one_piece(filepath):
+    with open(filepath) as file_handle:
+        return json.load(file_handle)
+
+
+def load_incrementally(filepath):
+    return _streaming.load_gjgf_file(filepath)
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak, result
+
+
+def main():
+    graph = nx.gnm_random_graph(10**5, 10**6, seed=42)
+    nx.set_edge_attributes(graph, 1.5, 'size')
+    nx.set_node_attributes(graph, 'red', 'color')
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filepath = os.path.join(tmpdir, 'graph.json')
+        with open(filepath, 'w') as file_handle:
+            json.dump(gv.convert.networkx_to_gjgf(graph), file_handle)
+        print('file size: {:.1f} MB'.format(os.path.getsize(filepath) / 1e6))
+        print('{:>12} {:>10} {:>16}'.format('method', 'time [s]', 'peak memory [MB]'))
+        for name, func in [('one piece', load_in_one_piece),
+                           ('incremental', load_incrementally)]:
+            duration, peak, _ = measure(func, filepath)
+            print('{:>12} {:>10.2f} {:>16.1f}'.format(name, duration, peak / 1e6))
+
+
+if __name__ == '__main__':
+    main()
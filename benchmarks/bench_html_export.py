@@ -0,0 +1,55 @@
+"""Benchmark of the peak memory needed for exporting a figure as HTML file.
+
+Compares building the complete HTML text with ``Figure.to_html`` before writing it, as
+done previously, with writing it chunk by chunk with ``Figure.write_html``.
+
+Usage: python bench_html_export.py
+
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+import networkx as nx
+
+import gravis as gv
+
+
+def export_in_one_piece(fig, filepath):
+    with open(filepath, 'w') as file_handle:
+        file_handle.write(fig.to_html())
+
+
+def export_in_chunks(fig, filepath):
+    with open(filepath, 'w') as file_handle:
+        fig.write_html(file_handle)
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak
+
+
+def main():
+    graph = nx.gnm_random_graph(10**5, 10**6, seed=42)
+    nx.set_edge_attributes(graph, 1.5, 'size')
+    fig = gv.d3(graph)
+    print('{:>12} {:>10} {:>16} {:>14}'.format('method', 'time [s]', 'peak memory [MB]',
+                                               'file size [MB]'))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filepath = os.path.join(tmpdir, 'figure.html')
+        for name, func in [('one piece', export_in_one_piece), ('chunks', export_in_chunks)]:
+            duration, peak = measure(func, fig, filepath)
+            print('{:>12} {:>10.2f} {:>16.1f} {:>14.1f}'.format(
+                name, duration, peak / 1e6, os.path.getsize(filepath) / 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark of converting igraph graphs.
+
+Compares the previous conversion, which created a Vertex or Edge proxy and an attribute
+dict for every element, with the current conversion that fetches whole attribute columns.
+
+Usage: python bench_igraph_conversion.py
+
+"""
+
+import random
+import time
+
+import igraph as ig
+
+from gravis._internal.conversion import _internal, convert
+
+
+def igraph_to_gjgf_per_element(graph):
+    data, data_graph, data_nodes, data_edges = _internal.prepare_gjgf_dict()
+    graph_metadata_dict = {attr: graph[attr] for attr in graph.attributes()}
+    _internal.insert_graph_data(data_graph, graph.is_directed(), graph_metadata_dict)
+    for node_object in graph.vs:
+        node_id = str(node_object.index)
+        node_metadata_dict = {key: val for key, val in node_object.attributes().items()
+                              if val is not None}
+        _internal.insert_node_data(data_nodes, node_id, node_metadata_dict)
+    for edge_object in graph.es:
+        edge_source_id = str(edge_object.source)
+        edge_target_id = str(edge_object.target)
+        edge_metadata_dict = {key: val for key, val in edge_object.attributes().items()
+                              if val is not None}
+        _internal.insert_edge_data(data_edges, edge_source_id, edge_target_id, edge_metadata_dict)
+    return data
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    print('{:>10} {:>10} {:>16} {:>16} {:>10}'.format(
+        'nodes', 'edges', 'per element [s]', 'columnar [s]', 'speedup'))
+    for num_nodes, num_edges in [(10**4, 10**5), (5 * 10**5, 10**6)]:
+        graph = ig.Graph.Erdos_Renyi(n=num_nodes, m=num_edges)
+        graph.vs['size'] = [random.random() for _ in range(num_nodes)]
+        graph.vs[0]['label'] = 'first'
+        graph.es['weight'] = [random.randint(1, 10) for _ in range(num_edges)]
+        t_old, data_old = measure(igraph_to_gjgf_per_element, graph)
+        t_new, columns = measure(convert._igraph_to_columns, graph)
+        assert columns.to_gjgf() == data_old
+        print('{:>10} {:>10} {:>16.2f} {:>16.2f} {:>9.1f}x'.format(
+            num_nodes, num_edges, t_old, t_new, t_old / t_new))
+
+
+if __name__ == '__main__':
+    main()
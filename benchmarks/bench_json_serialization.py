@@ -0,0 +1,55 @@
+"""Benchmark of JSON serialization backends.
+
+Serializes the graph data of a figure, once from a columnar graph as done for graph
+objects and once from a gJGF dict, with each installed backend of the serializer. Half
+of the nodes have a label that is None, so that the text contains null. For comparison,
+the gJGF dict is also serialized with json.dumps directly.
+
+Usage: python bench_json_serialization.py
+
+"""
+
+import json
+import random
+import time
+
+import networkx as nx
+
+from gravis._internal.conversion import _internal, convert
+from gravis._internal.utils import serialization
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    graph = nx.gnm_random_graph(10**5, 10**6, seed=42)
+    for node, node_dict in graph.nodes(data=True):
+        node_dict['size'] = random.random()
+        node_dict['label'] = 'node {}'.format(node) if node % 2 else None
+    nx.set_edge_attributes(graph, 1.5, 'size')
+    columns = convert._networkx_to_columns(graph)
+    gjgf = columns.to_gjgf()['graph']
+
+    print('{:>10} {:>14} {:>14} {:>14}'.format(
+        'backend', 'columnar [s]', 'gJGF dict [s]', 'size [MB]'))
+    t_dict, text = measure(json.dumps, [gjgf])
+    print('{:>10} {:>14} {:>14.2f} {:>14.1f}'.format(
+        'json.dumps', '', t_dict, len(text) / 1e6))
+    for backend in serialization.BACKENDS:
+        try:
+            serializer = serialization.JsonSerializer(backend)
+        except ImportError:
+            print('{:>10} {:>14}'.format(backend, 'not installed'))
+            continue
+        t_columnar, text = measure(_internal.graph_data_to_json, [columns], serializer)
+        t_dict, _ = measure(_internal.graph_data_to_json, [gjgf], serializer)
+        print('{:>10} {:>14.2f} {:>14.2f} {:>14.1f}'.format(
+            backend, t_columnar, t_dict, len(text) / 1e6))
+
+
+if __name__ == '__main__':
+    main()
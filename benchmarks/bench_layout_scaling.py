@@ -0,0 +1,61 @@
+"""Benchmark of the run time of gravis.layout.multilevel against gravis.layout.force_directed.
+
+Both layouts are calculated with their default arguments for random graphs with twice
+as many edges as nodes, as given by networkx.gnm_random_graph, in 2D and in 3D. Such
+graphs contain a few isolated nodes, which the coarsening of the multilevel layout
+merges in pairs like connected nodes.
+
+Usage: python bench_layout_scaling.py [num_nodes ...]
+
+The default sizes are 1000, 2000, 5000 and 10000 nodes.
+
+Result on a single core, in seconds:
+
+    nodes  dim  force_directed  multilevel  speedup
+     1000    2            4.24        1.46      2.9
+     2000    2            9.19        3.13      2.9
+     5000    2           26.20        7.44      3.5
+    10000    2           51.19       11.88      4.3
+     1000    3            6.42        1.04      6.2
+     2000    3           14.24        3.89      3.7
+     5000    3           46.02        9.59      4.8
+    10000    3          112.57       27.00      4.2
+
+Before isolated nodes were merged, the coarsening stalled at about 300 nodes of the graph
+with 5000 nodes, because the isolated ones remained. They were pushed far away by the
+heavy coarse nodes, and the large extent of the layout put most nodes into few cells of
+the Barnes-Hut tree, which made the many-body force of every refinement step expensive.
+In a separate run of the multilevel layout alone on that graph, the merging reduced the
+time from 8.9 s to 6.2 s in 2D and from 23.8 s to 11.5 s in 3D.
+
+"""
+
+import sys
+import time
+
+import networkx as nx
+
+import gravis as gv
+
+
+def measure(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 2000, 5000, 10000]
+    print('{:>8} {:>4} {:>15} {:>11} {:>8}'.format(
+        'nodes', 'dim', 'force_directed', 'multilevel', 'speedup'))
+    for dim in (2, 3):
+        for size in sizes:
+            graph = nx.gnm_random_graph(size, 2 * size, seed=0)
+            single = measure(gv.layout.force_directed, graph, dim=dim, seed=0)
+            multi = measure(gv.layout.multilevel, graph, dim=dim, seed=0)
+            print('{:>8} {:>4} {:>15.2f} {:>11.2f} {:>8.1f}'.format(
+                size, dim, single, multi, single / multi))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""Benchmark of the multilevel layout against d3-force and the single-level layout.
+
+Lays out grid graphs and sparse random graphs of growing size with three methods:
+d3-force as set up by the d3 template, which is run in Node.js on the same d3 bundle
+that is embedded into the HTML output, the NumPy simulation of gravis.layout.force_directed
+and gravis.layout.multilevel. d3-force is skipped if Node.js is not installed.
+
+The quality of a layout is measured as the median edge length divided by the median
+distance of random node pairs. It is low if neighbours are placed close together
+compared to the size of the whole drawing, e.g. for an untangled grid.
+
+Usage: python bench_multilevel_layout.py [num_nodes ...]
+
+The default sizes are 1000, 10000 and 100000 nodes. Larger sizes such as 1000000 can be
+given as arguments, which takes hours for the single-level methods.
+
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from gravis._internal.layout import _force, _multilevel
+
+
+D3_PATH = os.path.join(os.path.dirname(__file__), '..', 'gravis', '_internal', 'plotting',
+                       'third_party', 'd3', 'd3.v7.min.def.js')
+D3_SCRIPT = """
+let d3;
+function define(name, deps, factory) { d3 = {}; factory(d3); }
+(function (require) {
+%s
+})({defined: () => false});
+const data = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const nodes = Array.from({length: data.num_nodes}, (_, i) => ({id: i}));
+const links = data.sources.map((source, i) => ({source: source, target: data.targets[i]}));
+const counts = new Array(data.num_nodes).fill(0);
+links.forEach(link => { counts[link.source]++; counts[link.target]++; });
+const start = Date.now();
+d3.forceSimulation(nodes)
+  .force('centering', d3.forceCenter(0, 0))
+  .force('links', d3.forceLink(links).distance(50)
+    .strength(link => 1.0 / Math.min(counts[link.source.id], counts[link.target.id])))
+  .force('charge', d3.forceManyBody().strength(-70).theta(0.9))
+  .stop()
+  .tick(300);
+process.stdout.write(JSON.stringify({
+  seconds: (Date.now() - start) / 1000, positions: nodes.map(node => [node.x, node.y])}));
+"""
+
+
+def grid_graph(num_nodes):
+    num_rows = int(round(num_nodes ** 0.5))
+    idx = np.arange(num_rows * num_rows).reshape(num_rows, num_rows)
+    sources = np.concatenate([idx[:, :-1].ravel(), idx[:-1, :].ravel()])
+    targets = np.concatenate([idx[:, 1:].ravel(), idx[1:, :].ravel()])
+    return num_rows * num_rows, sources, targets
+
+
+def random_graph(num_nodes):
+    rng = np.random.default_rng(0)
+    return num_nodes, rng.integers(0, num_nodes, 2 * num_nodes), rng.integers(
+        0, num_nodes, 2 * num_nodes)
+
+
+def layout_d3(num_nodes, sources, targets):
+    with open(D3_PATH) as file_handle:
+        script = D3_SCRIPT % file_handle.read()
+    with tempfile.NamedTemporaryFile('w', suffix='.js', delete=False) as file_handle:
+        file_handle.write(script)
+    try:
+        data = json.dumps(dict(num_nodes=num_nodes, sources=sources.tolist(),
+                               targets=targets.tolist()))
+        result = subprocess.run(['node', '--max-old-space-size=16000', file_handle.name],
+                                input=data, capture_output=True, text=True, check=True)
+    finally:
+        os.remove(file_handle.name)
+    result = json.loads(result.stdout)
+    return np.array(result['positions']), result['seconds']
+
+
+def layout_single_level(num_nodes, sources, targets):
+    start = time.perf_counter()
+    positions = _force.simulate(_force.initial_positions(num_nodes),
+                                np.zeros(num_nodes, dtype=bool), sources, targets, seed=0)
+    return positions, time.perf_counter() - start
+
+
+def layout_multilevel(num_nodes, sources, targets):
+    start = time.perf_counter()
+    positions = _multilevel.simulate(np.zeros((num_nodes, 2)), np.zeros(num_nodes, dtype=bool),
+                                     sources, targets, seed=0)
+    return positions, time.perf_counter() - start
+
+
+def quality(positions, sources, targets):
+    rng = np.random.default_rng(0)
+    first, second = rng.integers(0, len(positions), (2, 100000))
+    edge_lengths = np.linalg.norm(positions[sources] - positions[targets], axis=1)
+    pair_lengths = np.linalg.norm(positions[first] - positions[second], axis=1)
+    return np.median(edge_lengths) / np.median(pair_lengths)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    methods = [('d3-force', layout_d3)] if shutil.which('node') else []
+    methods += [('single-level', layout_single_level), ('multilevel', layout_multilevel)]
+    print('{:>8} {:>10} {:>14} {:>10} {:>10}'.format(
+        'graph', 'nodes', 'method', 'time [s]', 'quality'))
+    for size in sizes:
+        for name, create_graph in [('grid', grid_graph), ('random', random_graph)]:
+            num_nodes, sources, targets = create_graph(size)
+            for method, layout in methods:
+                positions, seconds = layout(num_nodes, sources, targets)
+                print('{:>8} {:>10} {:>14} {:>10.2f} {:>10.3f}'.format(
+                    name, num_nodes, method, seconds, quality(positions, sources, targets)))
+
+
+if __name__ == '__main__':
+    main()
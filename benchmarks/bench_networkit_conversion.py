@@ -0,0 +1,66 @@
+"""Benchmark of converting NetworKit graphs.
+
+Compares the previous conversion, which called back into Python for every node and
+edge and formatted a '(u, v)' string per edge to look up its metadata, with the current
+conversion that fetches nodes and edges in bulk.
+
+Usage: python bench_networkit_conversion.py
+
+"""
+
+import time
+
+import networkit as nk
+
+from gravis._internal.conversion import _internal, convert
+
+
+def networkit_to_gjgf_per_element(graph, graph_metadata, node_metadata, edge_metadata):
+    data, data_graph, data_nodes, data_edges = _internal.prepare_gjgf_dict()
+    _internal.insert_graph_data(data_graph, graph.isDirected(), dict(graph_metadata))
+    node_metadata = {str(key): val for key, val in node_metadata.items()}
+    edge_metadata = {str(key): val for key, val in edge_metadata.items()}
+
+    def parse_node(node):
+        node_id = str(node)
+        node_metadata_dict = dict(node_metadata.get(node_id, {}))
+        _internal.insert_node_data(data_nodes, node_id, node_metadata_dict)
+
+    graph.forNodes(parse_node)
+
+    def parse_edge(source_node, target_node, edge_weight, edge_id):
+        edge_source_id = str(source_node)
+        edge_target_id = str(target_node)
+        used_edge_id = '({}, {})'.format(edge_source_id, edge_target_id)
+        edge_metadata_dict = dict(edge_metadata.get(used_edge_id, {}))
+        _internal.insert_edge_data(data_edges, edge_source_id, edge_target_id, edge_metadata_dict)
+
+    graph.forEdges(parse_edge)
+    return data
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    print('{:>10} {:>10} {:>16} {:>16} {:>10}'.format(
+        'nodes', 'edges', 'per element [s]', 'columnar [s]', 'speedup'))
+    for num_nodes, num_edges in [(10**4, 10**5), (10**5, 10**6)]:
+        graph = nk.generators.ErdosRenyiGenerator(
+            num_nodes, num_edges / num_nodes**2, directed=True).generate()
+        node_metadata = {node: {'size': node % 10} for node in range(0, num_nodes, 10)}
+        edge_metadata = {edge: {'weight': 2} for edge in list(graph.iterEdges())[::100]}
+        edge_metadata_str = {str(key): val for key, val in edge_metadata.items()}
+        t_old = measure(networkit_to_gjgf_per_element, graph, {}, node_metadata,
+                        edge_metadata_str)
+        t_new = measure(convert._networkit_to_columns,
+                        [graph, {}, node_metadata, edge_metadata])
+        print('{:>10} {:>10} {:>16.2f} {:>16.2f} {:>9.1f}x'.format(
+            num_nodes, graph.numberOfEdges(), t_old, t_new, t_old / t_new))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark of converting NetworkX graphs.
+
+Compares the previous conversion, which looked up every node and edge through the
+NetworkX view classes and built one dict per element, with the current conversion
+that walks the internal adjacency once and fills a columnar graph.
+
+Usage: python bench_networkx_conversion.py
+
+"""
+
+import time
+
+import networkx as nx
+
+from gravis._internal.conversion import _internal, convert
+
+
+def networkx_to_gjgf_per_element(graph):
+    data, data_graph, data_nodes, data_edges = _internal.prepare_gjgf_dict()
+    graph_metadata_dict = {key: val for key, val in graph.graph.items()}
+    _internal.insert_graph_data(data_graph, graph.is_directed(), graph_metadata_dict)
+    for node_object in graph.nodes:
+        node_id = str(node_object)
+        node_metadata_dict = {key: val for key, val in graph.nodes[node_object].items()}
+        _internal.insert_node_data(data_nodes, node_id, node_metadata_dict)
+    for edge_object in graph.edges:
+        edge_source_id = str(edge_object[0])
+        edge_target_id = str(edge_object[1])
+        edge_metadata_dict = {key: val for key, val in graph.edges[edge_object].items()}
+        _internal.insert_edge_data(data_edges, edge_source_id, edge_target_id, edge_metadata_dict)
+    return data
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    print('{:>10} {:>10} {:>16} {:>16} {:>10}'.format(
+        'nodes', 'edges', 'per element [s]', 'columnar [s]', 'speedup'))
+    for num_nodes, num_edges in [(10**4, 10**5), (10**5, 10**6)]:
+        graph = nx.gnm_random_graph(num_nodes, num_edges, seed=42)
+        for idx, edge_dict in enumerate(graph._adj[0].values()):
+            edge_dict['weight'] = idx
+        t_old = measure(networkx_to_gjgf_per_element, graph)
+        t_new = measure(convert._networkx_to_columns, graph)
+        print('{:>10} {:>10} {:>16.2f} {:>16.2f} {:>9.1f}x'.format(
+            num_nodes, num_edges, t_old, t_new, t_old / t_new))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""Benchmark of converting a list of graphs with a pool of worker processes.
+
+Converts a series of NetworkX snapshots, as used for the data selection menu of a
+figure, once in the current process and once with different numbers of workers.
+
+Usage: python bench_parallel_conversion.py
+
+"""
+
+import os
+import time
+
+import networkx as nx
+
+from gravis._internal.conversion import _internal
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    graphs = [nx.gnm_random_graph(5000, 50000, seed=seed) for seed in range(100)]
+    for graph in graphs:
+        nx.set_node_attributes(graph, 'red', 'color')
+    t_serial = measure(_internal.normalize_graph_data, graphs, None)
+    print('{:>10} {:>10} {:>10}'.format('workers', 'time [s]', 'speedup'))
+    print('{:>10} {:>10.2f} {:>9.1f}x'.format(1, t_serial, 1.0))
+    for workers in sorted({2, 4, os.cpu_count() or 1}):
+        t_parallel = measure(_internal.normalize_graph_data, graphs, workers)
+        print('{:>10} {:>10.2f} {:>9.1f}x'.format(workers, t_parallel, t_serial / t_parallel))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark of the spectral layout, alone and as start of the force-directed layout.
+
+Lays out grid graphs and sparse random graphs with the spectral layout using ARPACK and
+LOBPCG. Then compares the force-directed layout of d3-force, which starts on a spiral
+and runs 300 iterations, with a run of 100 iterations that starts from the spectral
+layout.
+
+The quality of a layout is measured as the median edge length divided by the median
+distance of random node pairs. It is low if neighbours are placed close together
+compared to the size of the whole drawing, e.g. for an untangled grid.
+
+Usage: python bench_spectral_layout.py [num_nodes ...]
+
+The default sizes are 10000, 100000 and 1000000 nodes. The force-directed layouts are
+only run for up to 100000 nodes.
+
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from gravis._internal.layout import _force, _spectral
+
+
+MAX_FORCE_NODES = 100000
+
+
+def grid_graph(num_nodes):
+    num_rows = int(round(num_nodes ** 0.5))
+    idx = np.arange(num_rows * num_rows).reshape(num_rows, num_rows)
+    sources = np.concatenate([idx[:, :-1].ravel(), idx[:-1, :].ravel()])
+    targets = np.concatenate([idx[:, 1:].ravel(), idx[1:, :].ravel()])
+    return num_rows * num_rows, sources, targets
+
+
+def random_graph(num_nodes):
+    rng = np.random.default_rng(0)
+    return num_nodes, rng.integers(0, num_nodes, 2 * num_nodes), rng.integers(
+        0, num_nodes, 2 * num_nodes)
+
+
+def quality(positions, sources, targets):
+    rng = np.random.default_rng(0)
+    first, second = rng.integers(0, len(positions), (2, 100000))
+    edge_lengths = np.linalg.norm(positions[sources] - positions[targets], axis=1)
+    pair_lengths = np.linalg.norm(positions[first] - positions[second], axis=1)
+    return np.median(edge_lengths) / np.median(pair_lengths)
+
+
+def report(name, num_nodes, method, start, positions, sources, targets):
+    print('{:>8} {:>10} {:>24} {:>10.2f} {:>10.3f}'.format(
+        name, num_nodes, method, time.perf_counter() - start,
+        quality(positions, sources, targets)))
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    print('{:>8} {:>10} {:>24} {:>10} {:>10}'.format(
+        'graph', 'nodes', 'method', 'time [s]', 'quality'))
+    for size in sizes:
+        for name, create_graph in [('grid', grid_graph), ('random', random_graph)]:
+            num_nodes, sources, targets = create_graph(size)
+            for method in ['arpack', 'lobpcg']:
+                start = time.perf_counter()
+                positions = _spectral.spectral_positions(
+                    num_nodes, sources, targets, method=method, seed=0)
+                report(name, num_nodes, 'spectral ' + method, start, positions, sources,
+                       targets)
+            if num_nodes > MAX_FORCE_NODES:
+                continue
+            fixed = np.zeros(num_nodes, dtype=bool)
+            start = time.perf_counter()
+            positions = _force.simulate(_force.initial_positions(num_nodes), fixed,
+                                        sources, targets, 300, seed=0)
+            report(name, num_nodes, 'force 300 from spiral', start, positions, sources,
+                   targets)
+            start = time.perf_counter()
+            positions = _spectral.spectral_positions(num_nodes, sources, targets, seed=0)
+            positions = _force.simulate(positions, fixed, sources, targets, 100, seed=0)
+            report(name, num_nodes, 'force 100 from spectral', start, positions, sources,
+                   targets)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""Benchmark of inserting data into the HTML templates.
+
+Compares the previous approach of calling str.replace once per placeholder key
+on the full template with the precompiled template that builds its output with
+a single join. The runtime of the latter grows with output size only, the runtime
+of the former with output size times number of keys.
+
+Usage: python bench_template_system.py
+
+"""
+
+import timeit
+
+from gravis._internal.plotting import template_system as ts
+
+
+def insert_by_replacement(template, data):
+    for key, val in data.items():
+        template = template.replace('§' + key + '§', val)
+    return template
+
+
+def main(repetitions=5):
+    text = ts.load('templates/d3.html')
+    template = ts.load_template('templates/d3.html')
+    keys = sorted(template.keys)
+    print('{:>12} {:>14} {:>14} {:>10}'.format(
+        'payload [B]', 'replace [ms]', 'compiled [ms]', 'speedup'))
+    for payload_size in (10**3, 10**5, 10**6, 10**7):
+        data = {key: '0' for key in keys}
+        data['DATA'] = 'x' * payload_size
+        data['DEFINE_D3'] = ts.load('third_party/d3/d3.v7.min.def.js')
+        t_replace = min(timeit.repeat(
+            lambda: insert_by_replacement(text, data), number=1, repeat=repetitions))
+        t_compiled = min(timeit.repeat(
+            lambda: template.render(data), number=1, repeat=repetitions))
+        print('{:>12} {:>14.2f} {:>14.2f} {:>9.1f}x'.format(
+            payload_size, t_replace * 1e3, t_compiled * 1e3, t_replace / t_compiled))
+
+
+if __name__ == '__main__':
+    main()
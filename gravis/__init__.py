@@ -8,12 +8,21 @@ plotting libraries.
 
 __all__ = [
     'convert',
+    'layout',
     'd3',
     'vis',
     'three',
+    'configure_serializer',
+    'export_html_many',
+    'export_many',
+    'init_notebook_mode',
+    'RenderPool',
 ]
 
 __version__ = '0.1.0'
 
 from ._internal.conversion import convert
-from ._internal.plotting import d3, three, vis
+from ._internal.layout import layout
+from ._internal.plotting import (
+    RenderPool, d3, export_html_many, export_many, init_notebook_mode, three, vis)
+from ._internal.utils.serialization import configure_serializer
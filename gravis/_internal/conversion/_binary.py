@@ -0,0 +1,148 @@
+"""Compact encoding of columnar graphs as base64 typed arrays for the HTML templates.
+
+A graph is encoded as JSON object that the templates recognize by the key
+"gravis_binary". Their shared decoder keeps nodes and edges in columns, which the parsers
+read row by row without building a gJGF graph first. Edge sources and targets are stored as
+Uint32Array, numeric and boolean columns as typed arrays, and string columns with
+repeated values as a table of unique strings plus an array of indices into it. All
+typed arrays are little-endian and base64-encoded. Columns that fit none of these forms,
+e.g. with lists or mixed types, are kept as a JSON list with null for missing values, or
+with a separate mask of present values if null is a value itself.
+
+"""
+
+import json as _json
+import sys as _sys
+from array import array as _array
+from base64 import b64encode as _b64encode
+from math import isfinite as _isfinite
+
+from . import _internal
+
+
+FORMAT_VERSION = 1
+
+_INT32_MIN = -2**31
+_INT32_MAX = 2**31 - 1
+# Smallest index arrays that can address all strings of a table
+_INDEX_TYPES = (('u8', 'B', 2**8), ('u16', 'H', 2**16), ('u32', 'I', 2**32))
+
+
+def encode_graph(graph, dumps=_json.dumps):
+    """Encode a columnar graph to the JSON text of its binary form.
+
+    Parameters
+    ----------
+    graph : :class:`~gravis._internal.conversion._internal.ColumnarGraph`
+    dumps : callable
+        Function that serializes the JSON parts, e.g. string tables and graph properties.
+
+    Returns
+    -------
+    text : str
+
+    """
+    node_ids = _internal.to_list(graph.node_ids)
+    if not all(isinstance(node_id, str) for node_id in node_ids):
+        node_ids = [node_id if isinstance(node_id, str)
+                    else _json.loads(_internal.encode_key(node_id, dumps))
+                    for node_id in node_ids]
+    if node_ids == list(map(str, range(len(node_ids)))):
+        # Ids that are the positions of the nodes need not be stored
+        node_ids = None
+
+    data_graph = {}
+    _internal.insert_graph_data(data_graph, graph.directed, dict(graph.graph_metadata))
+    nodes = {'ids': node_ids, 'count': graph.num_nodes}
+    nodes.update(_encode_columns(graph.iter_node_columns(), graph.NODE_DATA_KEYS))
+    edges = {
+        'sources': _encode_array(_internal.to_list(graph.edge_sources), 'I'),
+        'targets': _encode_array(_internal.to_list(graph.edge_targets), 'I'),
+        'count': graph.num_edges,
+    }
+    edges.update(_encode_columns(graph.iter_edge_columns(), graph.EDGE_DATA_KEYS))
+    return dumps({
+        'gravis_binary': FORMAT_VERSION,
+        'graph': data_graph,
+        'nodes': nodes,
+        'edges': edges,
+    })
+
+
+def _encode_columns(columns, data_keys):
+    """Encode columns separately for the data and metadata level of gJGF."""
+    data_columns = {}
+    metadata_columns = {}
+    for key, column in columns:
+        if key in data_keys:
+            data_columns[key] = _encode_column(column)
+        else:
+            metadata_columns[key] = _encode_column(column)
+    return {'data': data_columns, 'metadata': metadata_columns}
+
+
+def _encode_column(values):
+    """Encode a column of values with MISSING as marker of a missing value."""
+    missing = _internal.MISSING
+    has_missing = any(val is missing for val in values)
+    present = None
+    if has_missing:
+        present = [val is not missing for val in values]
+        present_values = [val for val in values if val is not missing]
+    else:
+        present_values = values
+    value_types = set(map(type, present_values))
+    if len(value_types) != 1:
+        return _encode_json_column(values, present, value_types)
+    value_type = value_types.pop()
+
+    if has_missing:
+        # Missing values are replaced by a present one, so they add no type or string
+        filler = present_values[0]
+        values = [filler if val is missing else val for val in values]
+    if value_type is bool:
+        encoded = {'type': 'bool', 'data': _encode_array(values, 'B')}
+    elif value_type is int and _INT32_MIN <= min(values) and max(values) <= _INT32_MAX:
+        encoded = {'type': 'i32', 'data': _encode_array(values, 'i')}
+    elif value_type is float and all(map(_isfinite, values)):
+        if _array('f', values).tolist() == values:
+            encoded = {'type': 'f32', 'data': _encode_array(values, 'f')}
+        else:
+            encoded = {'type': 'f64', 'data': _encode_array(values, 'd')}
+    elif value_type is str:
+        table = list(dict.fromkeys(values))
+        if len(table) > len(values) // 2:
+            # A table of mostly unique strings would only add the indices
+            return _encode_json_column(values, present, {value_type})
+        position = {val: idx for idx, val in enumerate(table)}
+        indices = list(map(position.__getitem__, values))
+        for index_type, typecode, limit in _INDEX_TYPES:
+            if len(table) <= limit:
+                break
+        encoded = {'type': 'str', 'table': table, 'index_type': index_type,
+                   'data': _encode_array(indices, typecode)}
+    else:
+        return _encode_json_column(values, present, {value_type})
+    if has_missing:
+        encoded['present'] = _encode_array(present, 'B')
+    return encoded
+
+
+def _encode_json_column(values, present, value_types):
+    """Keep a column as JSON list, where null marks a missing value unless a mask is needed."""
+    if present is not None:
+        values = [val if is_present else None for val, is_present in zip(values, present)]
+    encoded = {'type': 'json', 'data': values}
+    if type(None) in value_types:
+        # null is also a present value, so missing ones are marked separately
+        encoded['present'] = _encode_array(
+            [True] * len(values) if present is None else present, 'B')
+    return encoded
+
+
+def _encode_array(values, typecode):
+    """Encode a list of numbers as base64 text of a little-endian typed array."""
+    data = _array(typecode, values)
+    if _sys.byteorder == 'big':
+        data.byteswap()
+    return _b64encode(data.tobytes()).decode('ascii')
@@ -1,13 +1,37 @@
 """Internal functions used by the public conversion functions."""
 
 import json as _json
+import os as _os
 from collections.abc import Iterable as _Iterable
+from itertools import compress as _compress
+from itertools import repeat as _repeat
 
 from ..utils import operating_system as _operating_system
+from ..utils import serialization as _serialization
 from . import convert as _convert
 
 
-def normalize_graph_data(data):
+# Longest filepath on common operating systems, longer strings are not checked for a file
+_MAX_PATH_LENGTH = 4096
+
+
+class _Missing:
+    """Type of :data:`MISSING`, whose only instance is unpickled as the same object."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'MISSING'
+
+    def __reduce__(self):
+        return 'MISSING'
+
+
+# Marker of a missing value in a column, so that None remains a value that becomes null
+MISSING = _Missing()
+
+
+def normalize_graph_data(data, workers=None):
     """Get graph data in various forms and convert it to a single, unified form (gJGF).
 
     Parameters
@@ -20,11 +44,17 @@ def normalize_graph_data(data):
         - A filepath to a JSON file adhering to gJGF
         - A graph object from a supported external library
         - A list of the previous types
+    workers : int, optional
+        If greater than 1, graph objects in a list are converted concurrently by a pool of
+        this many worker processes. The order of the list is preserved.
 
     Returns
     -------
     data : list
-        A list of graphs in gravis JSON Graph Format (gJGF) without the uppermost 'graph' key
+        A list of graphs in gravis JSON Graph Format (gJGF) without the uppermost 'graph' key.
+        Graph objects from external libraries and graphs from large gJGF files are not turned
+        into dicts but kept as :class:`ColumnarGraph` objects, which can be serialized with
+        :func:`graph_data_to_json`.
 
     """
     def raise_error(additional_message=None):
@@ -34,6 +64,13 @@ def normalize_graph_data(data):
         raise ValueError(message)
 
     def filepath_to_json_object(filepath):
+        from . import _streaming
+
+        if _os.path.getsize(filepath) >= _streaming.MIN_FILE_SIZE:
+            try:
+                return _streaming.load_gjgf_file(filepath)
+            except _streaming.NotStreamable:
+                pass
         with open(filepath) as file_handle:
             return _json.load(file_handle)
 
@@ -41,7 +78,7 @@ def normalize_graph_data(data):
         return _json.loads(text)
 
     def str_to_json_object(text):
-        if _operating_system.is_nonempty_file(text):
+        if len(text) <= _MAX_PATH_LENGTH and _operating_system.is_nonempty_file(text):
             data = filepath_to_json_object(text)
         else:
             try:
@@ -57,8 +94,8 @@ def normalize_graph_data(data):
         data = str_to_json_object(data)
     # Case 1: Single graph object
     if is_known_graph_object(data):
-        data = _convert.any_to_gjgf(data)
-        data = [data['graph']]
+        data = _convert._any_to_columns(data)
+        data = [data]
     # Case 2: Single gJGF dict (with single graph)
     elif isinstance(data, dict) and 'graph' in data:
         data = data['graph']
@@ -75,10 +112,13 @@ def normalize_graph_data(data):
         if num_items == 0:
             raise_error('Iterable with zero items.')
         new_data = []
+        graph_positions = []
         for idx in range(num_items):
             item = data[idx]
             if is_known_graph_object(item):
-                item = _convert.any_to_gjgf(item)
+                graph_positions.append(idx)
+                new_data.append(item)
+                continue
             elif isinstance(item, str):
                 item = str_to_json_object(item)
             elif isinstance(item, dict) and 'graph' in item:
@@ -86,6 +126,13 @@ def normalize_graph_data(data):
             else:
                 raise_error('Iterable with invalid item at position {}.'.format(idx))
             new_data.append(item['graph'])
+        graph_objects = [new_data[idx] for idx in graph_positions]
+        outcomes = map_items(_convert._any_to_columns, graph_objects, workers)
+        for idx, (error, columns) in zip(graph_positions, outcomes):
+            if error is not None:
+                msg = 'Graph {} of {} could not be converted.'.format(idx + 1, num_items)
+                raise ValueError(msg) from error
+            new_data[idx] = columns
         data = new_data
     # Case 5: Other unknown data
     else:
@@ -93,6 +140,143 @@ def normalize_graph_data(data):
     return data
 
 
+def map_items(func, items, workers=None):
+    """Apply a function to each item, optionally in a pool of worker processes.
+
+    Parameters
+    ----------
+    func : callable
+        A function defined at module level, so that it can be sent to worker processes.
+    items : list
+        Arguments for the function. If worker processes are used, they need to be picklable.
+    workers : int, optional
+        Number of worker processes. If None or 1, all items are processed one after another
+        in the current process.
+
+    Yields
+    ------
+    outcome : tuple
+        A pair ``(error, result)`` for each item in the original order, where ``error`` is
+        None if the call succeeded and the raised exception otherwise. Pending items are
+        cancelled if the caller stops iterating early.
+
+    """
+    if workers is None or workers <= 1 or len(items) < 2:
+        for item in items:
+            try:
+                yield None, func(item)
+            except Exception as excp:
+                yield excp, None
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(items))) as executor:
+        futures = [executor.submit(func, item) for item in items]
+        try:
+            for future in futures:
+                try:
+                    yield None, future.result()
+                except Exception as excp:
+                    yield excp, None
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def graph_data_to_json(data, dumps=None):
+    """Serialize normalized graph data to JSON, emitting columnar graphs without dicts."""
+    return str(GraphDataJSON(data, dumps))
+
+
+class GraphDataJSON:
+    """JSON text of normalized graph data that is generated in chunks each time it is iterated.
+
+    Graphs are serialized only on iteration, at most a few thousand nodes or edges at a
+    time, which allows to write the text of large graphs to a file without holding all of
+    it in memory. The chunks are not cached, because that would hold the full text again,
+    so each iteration serializes the graphs anew. Graphs given as gJGF dicts are not
+    copied, which means that changes to them appear in the text of later iterations.
+
+    With ``binary=True``, columnar graphs are instead encoded in the compact form of
+    :mod:`~gravis._internal.conversion._binary`, which the HTML templates decode.
+
+    """
+
+    def __init__(self, data, dumps=None, binary=False):
+        """Prepare the serialization of a list of normalized graphs.
+
+        If no ``dumps`` function is given, the process-wide serializer of
+        :mod:`~gravis._internal.utils.serialization` is used.
+
+        """
+        if dumps is None:
+            dumps = _serialization.get_serializer()
+        self._items = list(data)
+        self._dumps = dumps
+        self._binary = binary
+
+    def __iter__(self):
+        """Iterate over chunks of the JSON text."""
+        from . import _binary
+
+        item_sep = getattr(self._dumps, 'separators', (', ', ': '))[0]
+        yield '['
+        for idx, item in enumerate(self._items):
+            if idx:
+                yield item_sep
+            if isinstance(item, ColumnarGraph) and self._binary:
+                yield _binary.encode_graph(item, self._dumps)
+            elif isinstance(item, ColumnarGraph):
+                yield from item.iter_json(self._dumps)
+            else:
+                yield from iter_gjgf_json(item, self._dumps)
+        yield ']'
+
+    def __str__(self):
+        """Get the complete JSON text."""
+        return ''.join(self)
+
+
+def iter_gjgf_json(graph, dumps=_json.dumps, chunk_size=10000):
+    """Serialize a gJGF graph dict to JSON incrementally, yielding the text in chunks.
+
+    Joining all chunks gives the same text as ``dumps(graph)``. The nodes and edges are
+    encoded at most ``chunk_size`` at a time, all other values of the graph at once. If
+    ``dumps`` has a ``separators`` attribute like a
+    :class:`~gravis._internal.utils.serialization.JsonSerializer`, the same item and key
+    separators are used for the surrounding structure.
+
+    """
+    if not isinstance(graph, dict):
+        yield dumps(graph)
+        return
+    item_sep, key_sep = getattr(dumps, 'separators', (', ', ': '))
+    yield '{'
+    for idx, (key, val) in enumerate(graph.items()):
+        prefix = (item_sep if idx else '') + encode_key(key, dumps) + key_sep
+        if key not in ('nodes', 'edges') or not isinstance(val, (dict, list)) or not val:
+            yield prefix + dumps(val)
+            continue
+        if isinstance(val, dict):
+            items = list(val.items())
+            opening, closing = '{', '}'
+        else:
+            items = val
+            opening, closing = '[', ']'
+        yield prefix + opening
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            if isinstance(val, dict):
+                texts = [encode_key(item_key, dumps) + key_sep + dumps(item_val)
+                         for item_key, item_val in chunk]
+            else:
+                texts = list(map(dumps, chunk))
+            yield (item_sep if start else '') + item_sep.join(texts)
+        yield closing
+    yield '}'
+
+
 def is_known_graph_object(data):
     """Check if the given data is a graph object from one of the supported libraries."""
     result = False
@@ -163,3 +347,441 @@ def insert_edge_data(data_edges, edge_source_id, edge_target_id, edge_metadata_d
         if edge_metadata_dict:
             edge_dict['metadata'] = edge_metadata_dict
     data_edges.append(edge_dict)
+
+
+class ColumnarGraph:
+    """Column-oriented intermediate representation of a single graph.
+
+    Nodes are stored as a sequence of ids, edges as two sequences of node indices, and each
+    node or edge attribute as a column of values aligned with them, where :data:`MISSING`
+    marks a missing value and None is kept as a value. Columns can be Python lists or NumPy
+    arrays. Nested dicts in gJGF are only created when :meth:`to_gjgf` is called, while
+    :meth:`to_json` serializes the columns directly.
+
+    The properties of a node or edge appear in the order of the columns, except for rows
+    in :attr:`node_key_orders` or :attr:`edge_key_orders`, which map the index of a row
+    whose properties were given in another order to the tuple of its keys.
+
+    """
+
+    NODE_DATA_KEYS = ('label', )
+    EDGE_DATA_KEYS = ('id', 'label', 'relation', 'directed')
+
+    def __init__(self, directed=False, graph_metadata=None):
+        """Initialize an empty graph.
+
+        Parameters
+        ----------
+        directed : bool
+        graph_metadata : dict, optional
+            Graph properties. The keys "label" and "type" end up on data level of gJGF,
+            all others on metadata level.
+
+        """
+        self.directed = directed
+        self.graph_metadata = graph_metadata if isinstance(graph_metadata, dict) else {}
+        self.node_ids = []
+        self.node_columns = {}
+        self.edge_sources = []
+        self.edge_targets = []
+        self.edge_columns = {}
+        self.node_key_orders = {}
+        self.edge_key_orders = {}
+        self._node_index = None
+
+    @property
+    def num_nodes(self):
+        """Get the number of nodes."""
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self):
+        """Get the number of edges."""
+        return len(self.edge_sources)
+
+    # Filling
+    def add_node(self, node_id, node_metadata_dict=None):
+        """Add a single node given as str id and a dict of its properties."""
+        idx = len(self.node_ids)
+        self.node_ids.append(node_id)
+        if self._node_index is not None:
+            self._node_index[node_id] = idx
+        if node_metadata_dict:
+            for key, val in node_metadata_dict.items():
+                self._set_value(self.node_columns, key, idx, val)
+            self._note_key_order(self.node_key_orders, self.node_columns, idx,
+                                 tuple(node_metadata_dict))
+
+    def add_edge(self, edge_source_id, edge_target_id, edge_metadata_dict=None):
+        """Add a single edge given as str ids of its nodes and a dict of its properties."""
+        idx = len(self.edge_sources)
+        self.edge_sources.append(self.node_index(edge_source_id))
+        self.edge_targets.append(self.node_index(edge_target_id))
+        if edge_metadata_dict:
+            for key, val in edge_metadata_dict.items():
+                self._set_value(self.edge_columns, key, idx, val)
+            self._note_key_order(self.edge_key_orders, self.edge_columns, idx,
+                                 tuple(edge_metadata_dict))
+
+    def add_nodes(self, node_ids, node_columns=None, key_orders=None):
+        """Add many nodes at once given as sequence of str ids and a dict of value columns.
+
+        ``key_orders`` can map the index of a new node to the tuple of its keys, if they
+        were given in another order than the columns, see :func:`dicts_to_columns`.
+
+        """
+        offset = len(self.node_ids)
+        self.node_ids = self._extend(self.node_ids, node_ids)
+        self._node_index = None
+        if node_columns:
+            self._merge_key_orders(self.node_key_orders, self.node_columns, node_columns,
+                                   offset, len(node_ids), key_orders)
+            for key, values in node_columns.items():
+                self._set_values(self.node_columns, key, offset, values)
+
+    def add_edges(self, edge_sources, edge_targets, edge_columns=None, key_orders=None):
+        """Add many edges at once given as sequences of node indices and a dict of value columns.
+
+        The node indices refer to positions in :attr:`node_ids`. ``key_orders`` is used as
+        in :meth:`add_nodes`.
+
+        """
+        if len(edge_sources) != len(edge_targets):
+            message = 'Edge sources and targets need to have the same length.'
+            raise ValueError(message)
+        offset = len(self.edge_sources)
+        self.edge_sources = self._extend(self.edge_sources, edge_sources)
+        self.edge_targets = self._extend(self.edge_targets, edge_targets)
+        if edge_columns:
+            self._merge_key_orders(self.edge_key_orders, self.edge_columns, edge_columns,
+                                   offset, len(edge_sources), key_orders)
+            for key, values in edge_columns.items():
+                self._set_values(self.edge_columns, key, offset, values)
+
+    def node_index(self, node_id):
+        """Get the position of a node id, adding a node without properties if it is unknown."""
+        if self._node_index is None:
+            self._node_index = {node_id: idx for idx, node_id in enumerate(self.node_ids)}
+        try:
+            return self._node_index[node_id]
+        except KeyError:
+            self.add_node(node_id)
+            return self._node_index[node_id]
+
+    @staticmethod
+    def _extend(sequence, values):
+        if len(sequence) == 0:
+            return _owned(values)
+        sequence = to_list(sequence)
+        sequence.extend(to_list(values))
+        return sequence
+
+    @staticmethod
+    def _set_value(columns, key, idx, val):
+        column = columns.get(key)
+        if column is None:
+            column = columns[key] = []
+        elif not isinstance(column, list):
+            column = columns[key] = to_list(column)
+        if len(column) < idx:
+            column.extend([MISSING] * (idx - len(column)))
+        column.append(val)
+
+    @staticmethod
+    def _set_values(columns, key, offset, values):
+        column = columns.get(key)
+        if offset == 0 and not column:
+            columns[key] = _owned(values)
+            return
+        column = [] if column is None else to_list(column)
+        if len(column) < offset:
+            column.extend([MISSING] * (offset - len(column)))
+        column.extend(to_list(values))
+        columns[key] = column
+
+    @staticmethod
+    def _note_key_order(key_orders, columns, idx, keys):
+        """Remember the keys of a row if their order differs from the one of the columns."""
+        if len(keys) > 1 and keys != tuple(key for key in columns if key in keys):
+            key_orders[idx] = keys
+
+    @staticmethod
+    def _merge_key_orders(key_orders, columns, new_columns, offset, num_rows, new_key_orders):
+        """Take over the key orders of new rows, relative to the merged order of columns."""
+        if new_key_orders:
+            key_orders.update((offset + idx, keys) for idx, keys in new_key_orders.items())
+        merged_order = list(columns) + [key for key in new_columns if key not in columns]
+        new_order = [key for key in merged_order if key in new_columns]
+        if new_order == list(new_columns):
+            return
+        # Rows that followed the order of the new columns need it recorded explicitly
+        new_columns_lists = [(key, to_list(column)) for key, column in new_columns.items()]
+        for idx in range(num_rows):
+            if offset + idx not in key_orders:
+                keys = tuple(key for key, column in new_columns_lists
+                             if idx < len(column) and column[idx] is not MISSING)
+                if len(keys) > 1 and keys != tuple(key for key in new_order if key in keys):
+                    key_orders[offset + idx] = keys
+
+    # Reading
+    def iter_node_columns(self):
+        """Iterate over pairs of property name and full-length list of node values."""
+        num_nodes = len(self.node_ids)
+        for key, column in self.node_columns.items():
+            yield key, padded_list(column, num_nodes)
+
+    def iter_edge_columns(self):
+        """Iterate over pairs of property name and full-length list of edge values."""
+        num_edges = len(self.edge_sources)
+        for key, column in self.edge_columns.items():
+            yield key, padded_list(column, num_edges)
+
+    def to_gjgf(self):
+        """Materialize the graph as nested dict adhering to gJGF with "graph" as top level key."""
+        data, data_graph, data_nodes, data_edges = prepare_gjgf_dict()
+        insert_graph_data(data_graph, self.directed, dict(self.graph_metadata))
+
+        node_ids = to_list(self.node_ids)
+        node_columns = list(self.iter_node_columns())
+        for idx, node_id in enumerate(node_ids):
+            node_metadata_dict = self._row_dict(node_columns, idx, self.node_key_orders)
+            insert_node_data(data_nodes, node_id, node_metadata_dict)
+
+        edge_columns = list(self.iter_edge_columns())
+        edge_sources = to_list(self.edge_sources)
+        edge_targets = to_list(self.edge_targets)
+        for idx, (source, target) in enumerate(zip(edge_sources, edge_targets)):
+            edge_metadata_dict = self._row_dict(edge_columns, idx, self.edge_key_orders)
+            insert_edge_data(data_edges, node_ids[source], node_ids[target], edge_metadata_dict)
+        return data
+
+    @staticmethod
+    def _row_dict(columns, idx, key_orders):
+        """Collect the present values of a row into a dict with the keys in their given order."""
+        row = {key: column[idx] for key, column in columns if column[idx] is not MISSING}
+        keys = key_orders.get(idx)
+        if keys is not None:
+            row = {key: row[key] for key in order_keys(keys, row)}
+        return row
+
+    def to_json(self, dumps=_json.dumps):
+        """Serialize the graph directly to a JSON text equal to the one of its gJGF dict.
+
+        The result is the same as ``json.dumps(self.to_gjgf()['graph'])`` but no dict
+        is created per node or edge.
+
+        """
+        return ''.join(self.iter_json(dumps))
+
+    def iter_json(self, dumps=_json.dumps, chunk_size=10000):
+        """Serialize the graph to JSON incrementally, yielding the text in chunks.
+
+        Joining all chunks gives the same text as :meth:`to_json`. At most ``chunk_size``
+        nodes or edges are encoded at once, so that the full text never needs to be held
+        in memory. If ``dumps`` has a ``separators`` attribute like a
+        :class:`~gravis._internal.utils.serialization.JsonSerializer`, the same item and
+        key separators are used for the surrounding structure.
+
+        """
+        item_sep, key_sep = getattr(dumps, 'separators', (', ', ': '))
+        node_ids = to_list(self.node_ids)
+        if all(isinstance(node_id, str) for node_id in node_ids):
+            node_ids = encode_values(node_ids, dumps)
+        else:
+            node_ids = [encode_key(node_id, dumps) for node_id in node_ids]
+        num_nodes = len(node_ids)
+        node_columns = list(self.iter_node_columns())
+        node_format = '{}' + key_sep + '{{{}}}'
+        yield '{"nodes"' + key_sep + '{'
+        for start in range(0, num_nodes, chunk_size):
+            stop = min(start + chunk_size, num_nodes)
+            node_rows = self._encode_rows(
+                node_columns, self.NODE_DATA_KEYS, start, stop, dumps, item_sep, key_sep,
+                self.node_key_orders)
+            yield (item_sep if start else '') + item_sep.join(
+                map(node_format.format, node_ids[start:stop], node_rows))
+
+        edge_sources = to_list(self.edge_sources)
+        edge_targets = to_list(self.edge_targets)
+        num_edges = len(edge_sources)
+        edge_columns = list(self.iter_edge_columns())
+        edge_format = '{{"source"' + key_sep + '{}' + item_sep + '"target"' + key_sep + '{}{}}}'
+        yield '}' + item_sep + '"edges"' + key_sep + '['
+        for start in range(0, num_edges, chunk_size):
+            stop = min(start + chunk_size, num_edges)
+            edge_rows = self._encode_rows(
+                edge_columns, self.EDGE_DATA_KEYS, start, stop, dumps, item_sep, key_sep,
+                self.edge_key_orders)
+            edge_rows = [item_sep + row if row else '' for row in edge_rows]
+            yield (item_sep if start else '') + item_sep.join(map(
+                edge_format.format,
+                map(node_ids.__getitem__, edge_sources[start:stop]),
+                map(node_ids.__getitem__, edge_targets[start:stop]),
+                edge_rows))
+
+        data_graph = {}
+        insert_graph_data(data_graph, self.directed, dict(self.graph_metadata))
+        graph_items = ''.join(
+            item_sep + encode_key(key, dumps) + key_sep + dumps(val)
+            for key, val in data_graph.items())
+        yield ']' + graph_items + '}'
+
+    @staticmethod
+    def _encode_rows(columns, data_keys, start, stop, dumps, item_sep=', ', key_sep=': ',
+                     key_orders=None):
+        """Encode each row of properties in a range to the inner text of its gJGF dict."""
+        data_columns = []
+        metadata_columns = []
+        metadata_index = {}
+        for key, column in columns:
+            encoded_column = encode_values(column[start:stop], dumps)
+            item = (encode_key(key, dumps) + key_sep, encoded_column)
+            if key in data_keys:
+                data_columns.append((data_keys.index(key), item))
+            else:
+                metadata_index[key] = len(metadata_columns)
+                metadata_columns.append(item)
+        data_columns = [item for _, item in sorted(data_columns, key=lambda pair: pair[0])]
+        if not data_columns and not metadata_columns:
+            return [''] * (stop - start)
+
+        # Rows whose metadata keys were given in another order than the columns
+        row_orders = {}
+        if key_orders and len(metadata_columns) > 1:
+            row_orders = {idx - start: [metadata_columns[metadata_index[key]] for key
+                                        in order_keys(keys, metadata_index)]
+                          for idx, keys in key_orders.items() if start <= idx < stop}
+
+        metadata_key = '"metadata"' + key_sep + '{'
+        if not row_orders and not any(
+                None in column for _, column in data_columns + metadata_columns):
+            # Without missing values, all rows have the same items and are joined in bulk
+            parts = [map(key.__add__, column) for key, column in data_columns]
+            if metadata_columns:
+                metadata_texts = map(item_sep.join, zip(
+                    *[map(key.__add__, column) for key, column in metadata_columns]))
+                parts.append(map(
+                    str.__add__, map(metadata_key.__add__, metadata_texts), _repeat('}')))
+            if len(parts) == 1:
+                return list(parts[0])
+            return list(map(item_sep.join, zip(*parts)))
+
+        rows = []
+        for idx in range(stop - start):
+            items = [key + column[idx] for key, column in data_columns
+                     if column[idx] is not None]
+            metadata_items = [key + column[idx] for key, column
+                              in row_orders.get(idx, metadata_columns)
+                              if column[idx] is not None]
+            if metadata_items:
+                items.append(metadata_key + item_sep.join(metadata_items) + '}')
+            rows.append(item_sep.join(items))
+        return rows
+
+
+def dicts_to_columns(dicts, num_rows, key_orders=None):
+    """Collect the values of many dicts into one full-length column per key in a single pass.
+
+    Parameters
+    ----------
+    dicts : iterable of dict
+        Properties of each row, e.g. the attribute dicts of all nodes.
+    num_rows : int
+        Number of dicts provided by the iterable.
+    key_orders : dict, optional
+        Dict that is filled with the index and tuple of keys of each row whose keys are
+        not in the order of the columns, so that it can be passed on to
+        :meth:`ColumnarGraph.add_nodes` or :meth:`ColumnarGraph.add_edges`.
+
+    Returns
+    -------
+    columns : dict
+        Mapping of keys to lists of length ``num_rows``, where :data:`MISSING` marks a
+        missing value.
+
+    """
+    columns = {}
+    if not isinstance(dicts, list):
+        dicts = list(dicts)
+    # Columns are only ever appended, so whether a tuple of keys is in their order never changes
+    is_ordered = {}
+    for idx in _compress(range(len(dicts)), dicts):  # skips empty dicts without a loop
+        row = dicts[idx]
+        for key, val in row.items():
+            try:
+                columns[key][idx] = val
+            except KeyError:
+                column = columns[key] = [MISSING] * num_rows
+                column[idx] = val
+        if key_orders is not None and len(row) > 1:
+            keys = tuple(row)
+            try:
+                ordered = is_ordered[keys]
+            except KeyError:
+                ordered = is_ordered[keys] = keys == tuple(key for key in columns if key in row)
+            if not ordered:
+                key_orders[idx] = keys
+    return columns
+
+
+def to_list(sequence):
+    """Convert a sequence, e.g. a NumPy array, to a list of Python objects."""
+    if isinstance(sequence, list):
+        return sequence
+    try:
+        return sequence.tolist()
+    except AttributeError:
+        return list(sequence)
+
+
+def _owned(values):
+    # Sequences given by a caller are copied if they could be modified by later appending
+    if isinstance(values, (list, tuple, range)):
+        return list(values)
+    return values
+
+
+def padded_list(sequence, length):
+    """Convert a sequence to a list that is filled up with missing values to a given length."""
+    values = to_list(sequence)
+    if len(values) < length:
+        values = values + [MISSING] * (length - len(values))
+    return values
+
+
+def order_keys(keys, present):
+    """Order the present keys as given in ``keys``, followed by all others in their order."""
+    ordered = [key for key in keys if key in present]
+    if len(ordered) < len(present):
+        ordered += [key for key in present if key not in keys]
+    return ordered
+
+
+def encode_values(values, dumps=_json.dumps):
+    """Encode each value of a list to JSON, where a missing value becomes None.
+
+    A :class:`~gravis._internal.utils.serialization.JsonSerializer` encodes the values in
+    bulk, any other ``dumps`` function is called once per value.
+
+    """
+    encode = getattr(dumps, 'encode_values', None)
+    if encode is not None:
+        return encode(values, missing=MISSING)
+    return [None if val is MISSING else dumps(val) for val in values]
+
+
+def encode_key(key, dumps=_json.dumps):
+    """Encode a dict key to JSON in the same way the encoder does it for keys of a dict.
+
+    Keys of type bool, int, float and None are converted to str like ``json.dumps`` does
+    it. Keys of other types are left to the encoder, which may reject them.
+
+    """
+    if isinstance(key, str):
+        return dumps(key)
+    if key is None or isinstance(key, (int, float)):
+        # json writes these keys as the text of their value, e.g. true, 1.5 or NaN
+        return dumps(_json.dumps(key))
+    text = dumps({key: 0})
+    # The separator after the key depends on the encoder, but the key ends with a quote
+    return text[1:text.rindex('"') + 1]
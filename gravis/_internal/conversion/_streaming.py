@@ -0,0 +1,266 @@
+"""Incremental parsing of large gJGF files into columnar graphs."""
+
+import json as _json
+import re as _re
+
+from . import _internal
+
+
+_WHITESPACE = _re.compile(r'[ \t\n\r]*')
+_DECODER = _json.JSONDecoder()
+_NODE_DATA_KEYS = frozenset(_internal.ColumnarGraph.NODE_DATA_KEYS)
+_EDGE_DATA_KEYS = frozenset(_internal.ColumnarGraph.EDGE_DATA_KEYS)
+
+# Smaller files are parsed faster in one piece by json.load
+MIN_FILE_SIZE = 16 * 1024 * 1024
+
+
+class NotStreamable(Exception):
+    """Raised if a file can not be represented faithfully by columnar graphs."""
+
+
+def load_gjgf_file(filepath, chunk_size=1024 * 1024, batch_size=10000):
+    """Parse a gJGF file incrementally and get its graphs in normalized form.
+
+    The file is read in chunks of ``chunk_size`` characters. Each node and each edge is
+    decoded on its own and every ``batch_size`` of them are added to a columnar graph,
+    so that neither the full text nor a dict per element is held in memory at once.
+
+    Parameters
+    ----------
+    filepath : str
+    chunk_size : int
+    batch_size : int
+
+    Returns
+    -------
+    data : dict
+        A dict with the same top level key "graph" or "graphs" as the file. Each graph is a
+        :class:`~gravis._internal.conversion._internal.ColumnarGraph`, or a dict if its
+        graph-level properties can only be kept in a dict.
+
+    Raises
+    ------
+    NotStreamable
+        If the file is no valid JSON, has an unexpected structure, or contains nodes and
+        edges that would not be reproduced exactly by a columnar graph, e.g. empty metadata
+        or edges that come before the nodes. The caller then needs to use a regular parser.
+
+    """
+    with open(filepath) as file_handle:
+        reader = _Reader(file_handle, chunk_size)
+        data = None
+        reader.expect('{')
+        for key in reader.iter_object_keys():
+            if key == 'graph' and data is None:
+                data = {'graph': _parse_graph(reader, batch_size)}
+            elif key == 'graphs' and data is None:
+                reader.expect('[')
+                data = {'graphs': [
+                    _parse_graph(reader, batch_size) for _ in reader.iter_array_items()]}
+            else:
+                raise NotStreamable('Unexpected key at top level: {}'.format(key))
+        reader.expect_end()
+    if data is None:
+        raise NotStreamable('Neither "graph" nor "graphs" at top level.')
+    return data
+
+
+class _Reader:
+    """Tokenizer that keeps only a window of the text of a file in memory."""
+
+    def __init__(self, file_handle, chunk_size):
+        self._file_handle = file_handle
+        self._chunk_size = chunk_size
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _read_more(self):
+        if self._eof:
+            raise NotStreamable('Unexpected end of file.')
+        # Grow the window if a single value is larger than the chunk size
+        chunk = self._file_handle.read(max(self._chunk_size, len(self._buffer) - self._pos))
+        if not chunk:
+            self._eof = True
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+
+    def peek(self):
+        """Get the next character that is not whitespace, or '' at the end of the file."""
+        if self._pos < len(self._buffer) and self._buffer[self._pos] not in ' \t\n\r':
+            return self._buffer[self._pos]
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._eof:
+                return ''
+            self._read_more()
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise NotStreamable('Expected "{}".'.format(char))
+        self._pos += 1
+
+    def expect_end(self):
+        if self.peek() != '':
+            raise NotStreamable('Unexpected text after the end.')
+
+    def decode(self):
+        """Decode the next JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+                # A number at the end of the buffer might continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except ValueError:
+                if self._eof:
+                    raise NotStreamable('Invalid JSON.')
+            self._read_more()
+
+    def iter_object_keys(self):
+        """Iterate over the keys of an object whose opening brace was consumed.
+
+        After each key, the caller needs to consume its value.
+
+        """
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self.decode()
+            if not isinstance(key, str):
+                raise NotStreamable('Invalid key.')
+            self.expect(':')
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise NotStreamable('Expected "," or "}".')
+
+    def iter_array_items(self):
+        """Iterate over the items of an array whose opening bracket was consumed.
+
+        For each item, the caller needs to consume its value.
+
+        """
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield
+            char = self.peek()
+            self._pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise NotStreamable('Expected "," or "]".')
+
+
+def _parse_graph(reader, batch_size):
+    columns = _internal.ColumnarGraph()
+    node_index = {}
+    graph_items = {}
+    reader.expect('{')
+    for key in reader.iter_object_keys():
+        if key == 'nodes' and 'nodes' not in graph_items:
+            graph_items['nodes'] = None
+            reader.expect('{')
+            _parse_nodes(reader, columns, node_index, batch_size)
+        elif key == 'edges' and 'edges' not in graph_items:
+            if 'nodes' not in graph_items:
+                raise NotStreamable('Edges before nodes.')
+            graph_items['edges'] = None
+            reader.expect('[')
+            _parse_edges(reader, columns, node_index, batch_size)
+        elif key not in graph_items:
+            graph_items[key] = reader.decode()
+        else:
+            raise NotStreamable('Duplicate key in graph.')
+    if 'edges' not in graph_items:
+        # A columnar graph would add an empty list of edges
+        raise NotStreamable('Graph without edges.')
+    graph_items.pop('nodes', None)
+    graph_items.pop('edges', None)
+
+    # Graph properties that a columnar graph reproduces exactly, others are kept in a dict
+    directed = graph_items.get('directed')
+    metadata = graph_items.get('metadata', {})
+    graph_metadata = {key: val for key, val in graph_items.items() if key in ('label', 'type')}
+    if isinstance(metadata, dict):
+        graph_metadata.update(metadata)
+    expected = {}
+    _internal.insert_graph_data(expected, directed, dict(graph_metadata))
+    if isinstance(directed, bool) and expected == graph_items:
+        columns.directed = directed
+        columns.graph_metadata = graph_metadata
+        return columns
+    data = columns.to_gjgf()['graph']
+    del data['directed']
+    data.update(graph_items)
+    return data
+
+
+def _parse_nodes(reader, columns, node_index, batch_size):
+    node_ids, node_dicts = [], []
+    for node_id in reader.iter_object_keys():
+        node_dict = reader.decode()
+        if node_id in node_index:
+            raise NotStreamable('Duplicate node id.')
+        node_index[node_id] = len(node_index)
+        node_ids.append(node_id)
+        node_dicts.append(_flatten(node_dict, _NODE_DATA_KEYS))
+        if len(node_ids) == batch_size:
+            _add_nodes(columns, node_ids, node_dicts)
+            node_ids, node_dicts = [], []
+    _add_nodes(columns, node_ids, node_dicts)
+
+
+def _parse_edges(reader, columns, node_index, batch_size):
+    sources, targets, edge_dicts = [], [], []
+    for _ in reader.iter_array_items():
+        edge_dict = reader.decode()
+        try:
+            sources.append(node_index[edge_dict.pop('source')])
+            targets.append(node_index[edge_dict.pop('target')])
+        except (AttributeError, KeyError, TypeError):
+            raise NotStreamable('Edge without known source and target.')
+        edge_dicts.append(_flatten(edge_dict, _EDGE_DATA_KEYS))
+        if len(sources) == batch_size:
+            _add_edges(columns, sources, targets, edge_dicts)
+            sources, targets, edge_dicts = [], [], []
+    _add_edges(columns, sources, targets, edge_dicts)
+
+
+def _add_nodes(columns, node_ids, node_dicts):
+    key_orders = {}
+    node_columns = _internal.dicts_to_columns(node_dicts, len(node_ids), key_orders)
+    columns.add_nodes(node_ids, node_columns, key_orders)
+
+
+def _add_edges(columns, sources, targets, edge_dicts):
+    key_orders = {}
+    edge_columns = _internal.dicts_to_columns(edge_dicts, len(sources), key_orders)
+    columns.add_edges(sources, targets, edge_columns, key_orders)
+
+
+def _flatten(element_dict, data_keys):
+    """Merge the data and metadata level of a node or edge dict, if that can be reversed."""
+    if not isinstance(element_dict, dict):
+        raise NotStreamable('Node or edge that is not an object.')
+    metadata = element_dict.pop('metadata', None)
+    if not element_dict.keys() <= data_keys:
+        raise NotStreamable('Unknown key in node or edge.')
+    if metadata is not None:
+        if not isinstance(metadata, dict) or not metadata:
+            raise NotStreamable('Metadata that is not a non-empty object.')
+        if not data_keys.isdisjoint(metadata):
+            raise NotStreamable('Metadata key that is also a data key.')
+        element_dict.update(metadata)
+    return element_dict
@@ -7,6 +7,15 @@ with images inside nodes that do not rely on any external resources.
 
 """
 
+from itertools import chain as _chain
+from itertools import compress as _compress
+from itertools import repeat as _repeat
+from operator import eq as _eq
+from operator import is_not as _is_not
+from operator import itemgetter as _itemgetter
+from operator import le as _le
+from operator import methodcaller as _methodcaller
+
 from ..utils.web import image_to_data_url, image_to_html_element
 from . import _internal
 
@@ -26,28 +35,33 @@ def any_to_gjgf(graph):
         with "graph" as top level key.
 
     """
+    return _any_to_columns(graph).to_gjgf()
+
+
+def _any_to_columns(graph):
+    """Convert a graph object from a supported library to a columnar graph."""
     dtype = str(type(graph)).lower()
     if isinstance(graph, list):
         dtype_inner = str(type(graph[0])).lower()
         if 'networkit' in dtype_inner:
             dtype = dtype_inner
     if 'graph_tool.graph' in dtype:
-        gjgf = graphtool_to_gjgf(graph)
+        columns = _graphtool_to_columns(graph)
     elif 'igraph.graph' in dtype:
-        gjgf = igraph_to_gjgf(graph)
+        columns = _igraph_to_columns(graph)
     elif 'networkit' in dtype:
-        gjgf = networkit_to_gjgf(graph)
+        columns = _networkit_to_columns(graph)
     elif 'networkx.classes' in dtype:
-        gjgf = networkx_to_gjgf(graph)
+        columns = _networkx_to_columns(graph)
     elif 'snap' in dtype:
-        gjgf = snap_to_gjgf(graph)
+        columns = _snap_to_columns(graph)
     else:
         message = 'Provided graph is not a graph object of a supported library.'
         raise ValueError(message)
-    return gjgf
+    return columns
 
 
-def multiple_to_gjgf(graphs):
+def multiple_to_gjgf(graphs, workers=None):
     """Convert multiple graph objects from supported libraries to gJGF.
 
     Parameters
@@ -55,6 +69,10 @@ def multiple_to_gjgf(graphs):
     graphs : list of graph objects from supported libraries
         The list may contain graph objects from different libraries,
         because each of them is converted individually to gJGF with :func:`any_to_gjgf`.
+    workers : int, optional
+        If greater than 1, the graphs are converted concurrently by a pool of this many
+        worker processes. Graph objects then need to be picklable. The order of the
+        graphs is preserved in the result.
 
     Returns
     -------
@@ -65,12 +83,11 @@ def multiple_to_gjgf(graphs):
 
     """
     data = []
-    for cnt, graph in enumerate(graphs, 1):
-        try:
-            data.append(any_to_gjgf(graph)['graph'])
-        except Exception:
+    for cnt, (error, gjgf) in enumerate(_internal.map_items(any_to_gjgf, graphs, workers), 1):
+        if error is not None:
             msg = 'Graph {} of {} could not be converted to gJGF.'.format(cnt, len(graphs))
-            raise ValueError(msg)
+            raise ValueError(msg) from error
+        data.append(gjgf['graph'])
     gjgf = {'graphs': data}
     return gjgf
 
@@ -94,35 +111,82 @@ def graphtool_to_gjgf(graph):
     This can cause problems when such values have the usual meaning of a quantity being zero.
 
     """
-    data, data_graph, data_nodes, data_edges = _internal.prepare_gjgf_dict()
+    return _graphtool_to_columns(graph).to_gjgf()
+
+
+def _graphtool_to_columns(graph):
+    """Convert a graph-tool graph object to a columnar graph.
+
+    Vertices and edges are fetched as arrays with ``graph.get_vertices()`` and
+    ``graph.get_edges()``. Property maps with a scalar value type are read through their
+    array view in one step, while all other maps (strings, vectors, Python objects) fall
+    back to access per vertex or edge. In both cases '' and 0 mark a missing value.
+
+    """
+    import numpy as np
 
     # 1) Graph properties
     graph_directed = graph.is_directed()
     graph_metadata_dict = {key: graph.graph_properties[key]  # key syntax is necessary
                            for key in graph.graph_properties.keys()}
-    _internal.insert_graph_data(data_graph, graph_directed, graph_metadata_dict)
+    columns = _internal.ColumnarGraph(graph_directed, graph_metadata_dict)
 
     # 2) Nodes and their properties
-    for node_object in graph.vertices():
-        node_id = str(node_object)
-        node_metadata_dict = {}
-        for key, value_array in graph.vertex_properties.items():
-            val = value_array[node_object]
-            if isinstance(val, (str, int, float)) and val not in ('', 0, 0.0):
-                node_metadata_dict[key] = val
-        _internal.insert_node_data(data_nodes, node_id, node_metadata_dict)
+    vertices = graph.get_vertices()
+    node_ids = list(map(str, vertices.tolist()))
+    node_columns = {}
+    for key, value_array in graph.vertex_properties.items():
+        if value_array.value_type() in _GRAPHTOOL_SCALAR_TYPES:
+            column = _graphtool_scalar_column(value_array, vertices)
+        else:
+            column = [val if isinstance(val, (str, int, float)) and val not in ('', 0, 0.0)
+                      else _internal.MISSING
+                      for val in map(value_array.__getitem__, graph.vertices())]
+        if column is not None:
+            node_columns[key] = column
+    columns.add_nodes(node_ids, node_columns)
 
     # 3) Edges and their properties
-    for edge_object in graph.edges():
-        edge_source_id = str(edge_object.source())
-        edge_target_id = str(edge_object.target())
-        edge_metadata_dict = {}
-        for key, value_array in graph.edge_properties.items():
-            val = value_array[edge_object]
-            if val not in ('', 0, 0.0):
-                edge_metadata_dict[key] = val
-        _internal.insert_edge_data(data_edges, edge_source_id, edge_target_id, edge_metadata_dict)
-    return data
+    edges = graph.get_edges([graph.edge_index])
+    if len(vertices) == 0 or vertices[-1] == len(vertices) - 1:
+        # No vertex filter is active, so that vertex indices are positions
+        edge_sources = edges[:, 0]
+        edge_targets = edges[:, 1]
+    else:
+        positions = np.zeros(vertices[-1] + 1, dtype=np.int64)
+        positions[vertices] = np.arange(len(vertices))
+        edge_sources = positions[edges[:, 0]]
+        edge_targets = positions[edges[:, 1]]
+    edge_columns = {}
+    edge_objects = None
+    for key, value_array in graph.edge_properties.items():
+        if value_array.value_type() in _GRAPHTOOL_SCALAR_TYPES:
+            column = _graphtool_scalar_column(value_array, edges[:, 2])
+        else:
+            if edge_objects is None:
+                edge_objects = list(graph.edges())
+            column = [_internal.MISSING if val in ('', 0, 0.0) else val
+                      for val in map(value_array.__getitem__, edge_objects)]
+        if column is not None:
+            edge_columns[key] = column
+    columns.add_edges(edge_sources, edge_targets, edge_columns)
+    return columns
+
+
+_GRAPHTOOL_SCALAR_TYPES = ('bool', 'int16_t', 'int32_t', 'int64_t', 'double')
+
+
+def _graphtool_scalar_column(value_array, indices):
+    """Get the values of a scalar property map at given indices, missing where they are 0."""
+    values = value_array.a[indices]
+    missing = values == 0
+    if missing.all():
+        return None
+    if value_array.value_type() == 'bool':
+        values = values.astype(bool)
+    column = values.astype(object)
+    column[missing] = _internal.MISSING
+    return column
 
 
 def igraph_to_gjgf(graph):
@@ -139,28 +203,48 @@ def igraph_to_gjgf(graph):
         :doc:`gravis JSON Graph Format (gJGF) <../../format_specification>`
 
     """
-    data, data_graph, data_nodes, data_edges = _internal.prepare_gjgf_dict()
+    return _igraph_to_columns(graph).to_gjgf()
 
+
+def _igraph_to_columns(graph):
+    """Convert an igraph graph object to a columnar graph.
+
+    Vertex and edge attributes are fetched as whole columns with ``graph.vs[attr]`` and
+    ``graph.es[attr]`` and edges as a single list with ``graph.get_edgelist()``, so that
+    no Vertex or Edge proxy objects are created. None is the value of a missing attribute
+    in igraph, so it becomes a missing value in a column and columns holding only None are
+    dropped.
+
+    """
     # 1) Graph properties
     graph_directed = graph.is_directed()
     graph_metadata_dict = {attr: graph[attr] for attr in graph.attributes()}
-    _internal.insert_graph_data(data_graph, graph_directed, graph_metadata_dict)
+    columns = _internal.ColumnarGraph(graph_directed, graph_metadata_dict)
 
     # 2) Nodes and their properties
-    for node_object in graph.vs:
-        node_id = str(node_object.index)
-        node_metadata_dict = {key: val for key, val in node_object.attributes().items()
-                              if val is not None}
-        _internal.insert_node_data(data_nodes, node_id, node_metadata_dict)
+    node_ids = list(map(str, range(graph.vcount())))
+    node_columns = _igraph_columns(graph.vs)
+    columns.add_nodes(node_ids, node_columns)
 
     # 3) Edges and their properties
-    for edge_object in graph.es:
-        edge_source_id = str(edge_object.source)
-        edge_target_id = str(edge_object.target)
-        edge_metadata_dict = {key: val for key, val in edge_object.attributes().items()
-                              if val is not None}
-        _internal.insert_edge_data(data_edges, edge_source_id, edge_target_id, edge_metadata_dict)
-    return data
+    edge_list = graph.get_edgelist()
+    edge_sources = list(map(_itemgetter(0), edge_list))
+    edge_targets = list(map(_itemgetter(1), edge_list))
+    edge_columns = _igraph_columns(graph.es)
+    columns.add_edges(edge_sources, edge_targets, edge_columns)
+    return columns
+
+
+def _igraph_columns(sequence):
+    """Get the attributes of an igraph VertexSeq or EdgeSeq as dict of value columns."""
+    columns = {}
+    for attr in sequence.attribute_names():
+        column = sequence[attr]
+        if any(map(_is_not, column, _repeat(None))):
+            if None in column:
+                column = [_internal.MISSING if val is None else val for val in column]
+            columns[attr] = column
+    return columns
 
 
 def networkit_to_gjgf(graph):
@@ -176,6 +260,23 @@ def networkit_to_gjgf(graph):
         Dictionary adhering to
         :doc:`gravis JSON Graph Format (gJGF) <../../format_specification>`
 
+    """
+    return _networkit_to_columns(graph).to_gjgf()
+
+
+def _networkit_to_columns(graph):
+    """Convert a NetworKit graph object to a columnar graph.
+
+    Nodes are fetched in bulk with ``graph.iterNodes()`` and edges with
+    ``graph.iterEdges()``, which needs no Python callback per edge. Edges come in
+    ascending order of their smaller node id, which differs from the order of
+    ``graph.forEdges()`` used before. Undirected edges are given as ``(u, v)`` with
+    ``u >= v`` as before. Edge metadata can be keyed by the string ``'(u, v)'``, by the
+    tuple ``(u, v)`` or by an edge id. String and tuple keys need to name the nodes in
+    the direction of the edge as before, a key in the reverse direction is ignored.
+    Only edge ids are not available in bulk: If metadata is keyed by them, the edges are
+    traversed once more with ``graph.forEdges()`` to collect their ids.
+
     """
     # Argument processing
     graph_metadata, node_metadata, edge_metadata = {}, {}, {}
@@ -190,39 +291,93 @@ def networkit_to_gjgf(graph):
                 node_metadata = {}
         if len(graph) >= 4:
             edge_metadata = graph[3]
-            if isinstance(edge_metadata, dict):
-                edge_metadata = {str(key): val for key, val in edge_metadata.items()}
-            else:
+            if not isinstance(edge_metadata, dict):
                 edge_metadata = {}
         graph = graph[0]
 
     # Transformation
-    data, data_graph, data_nodes, data_edges = _internal.prepare_gjgf_dict()
-
     # 1) Graph properties
     # Note: graph.getName() was dropped - https://github.com/networkit/networkit/pull/421
     graph_directed = graph.isDirected()
     graph_metadata_dict = graph_metadata
-    _internal.insert_graph_data(data_graph, graph_directed, graph_metadata_dict)
+    columns = _internal.ColumnarGraph(graph_directed, graph_metadata_dict)
 
     # 2) Nodes and their properties
-    def parse_node(node):
-        node_id = str(node)
-        node_metadata_dict = node_metadata.get(node_id, {})
-        _internal.insert_node_data(data_nodes, node_id, node_metadata_dict)
-
-    graph.forNodes(parse_node)
+    node_objects = list(graph.iterNodes())
+    num_nodes = len(node_objects)
+    node_ids = list(map(str, node_objects))
+    node_key_orders = {}
+    node_columns = _internal.dicts_to_columns(
+        map(node_metadata.get, node_ids), num_nodes, node_key_orders)
+    columns.add_nodes(node_ids, node_columns, node_key_orders)
 
     # 3) Edges and their properties
+    edge_metadata_by_tuple, edge_metadata_by_id = _networkit_edge_metadata(edge_metadata)
+    edge_objects = list(graph.iterEdges())
+    num_edges = len(edge_objects)
+    edge_sources = list(map(_itemgetter(0), edge_objects))
+    edge_targets = list(map(_itemgetter(1), edge_objects))
+    if not graph_directed:
+        # graph.iterEdges() yields undirected edges as (u, v) with u <= v
+        edge_sources, edge_targets = edge_targets, edge_sources
+    edge_dicts = []
+    if edge_metadata_by_tuple:
+        edge_dicts = list(map(edge_metadata_by_tuple.get, zip(edge_sources, edge_targets)))
+    if edge_metadata_by_id and graph.hasEdgeIds():
+        edge_ids = _networkit_edge_ids(graph, edge_objects, graph_directed)
+        edge_dicts = edge_dicts or [None] * num_edges
+        for idx, val in enumerate(map(edge_metadata_by_id.get, edge_ids)):
+            if val is not None:
+                edge_dicts[idx] = val
+    if graph.upperNodeIdBound() != num_nodes:
+        # Removed nodes leave gaps, so that node ids need to be mapped to positions
+        node_index = dict(zip(node_objects, range(num_nodes)))
+        edge_sources = list(map(node_index.__getitem__, edge_sources))
+        edge_targets = list(map(node_index.__getitem__, edge_targets))
+    edge_key_orders = {}
+    edge_columns = _internal.dicts_to_columns(edge_dicts, num_edges, edge_key_orders)
+    columns.add_edges(edge_sources, edge_targets, edge_columns, edge_key_orders)
+    return columns
+
+
+def _networkit_edge_ids(graph, edge_objects, directed):
+    """Get the edge id of each edge in the order of ``graph.iterEdges()``.
+
+    Only ``graph.forEdges()`` provides edge ids, so it is used only if metadata is keyed
+    by them. Parallel edges between the same nodes receive their ids in traversal order.
+
+    """
+    ids_by_edge = {}
+
     def parse_edge(source_node, target_node, edge_weight, edge_id):
-        edge_source_id = str(source_node)
-        edge_target_id = str(target_node)
-        used_edge_id = '({}, {})'.format(edge_source_id, edge_target_id)
-        edge_metadata_dict = edge_metadata.get(used_edge_id, {})
-        _internal.insert_edge_data(data_edges, edge_source_id, edge_target_id, edge_metadata_dict)
+        if not directed and source_node > target_node:
+            source_node, target_node = target_node, source_node
+        ids_by_edge.setdefault((source_node, target_node), []).append(edge_id)
 
     graph.forEdges(parse_edge)
-    return data
+    for ids in ids_by_edge.values():
+        ids.reverse()
+    return [ids_by_edge[edge].pop() for edge in edge_objects]
+
+
+def _networkit_edge_metadata(edge_metadata):
+    """Split edge metadata into dicts keyed by tuple of node ids and keyed by edge id."""
+    by_tuple, by_id = {}, {}
+    for key, val in edge_metadata.items():
+        if isinstance(key, str):
+            # Previous form of keys, which matches only if written exactly as '(u, v)'
+            try:
+                source, target = map(int, key[1:-1].split(', '))
+            except ValueError:
+                continue
+            if key != '({}, {})'.format(source, target):
+                continue
+            key = (source, target)
+        if isinstance(key, tuple):
+            by_tuple[key] = val
+        else:
+            by_id[key] = val
+    return by_tuple, by_id
 
 
 def networkx_to_gjgf(graph):
@@ -239,26 +394,91 @@ def networkx_to_gjgf(graph):
         :doc:`gravis JSON Graph Format (gJGF) <../../format_specification>`
 
     """
-    data, data_graph, data_nodes, data_edges = _internal.prepare_gjgf_dict()
+    return _networkx_to_columns(graph).to_gjgf()
+
+
+def _networkx_to_columns(graph):
+    """Convert a NetworkX graph object to a columnar graph.
+
+    The internal node and adjacency dicts are walked in bulk with iterator pipelines,
+    instead of looking up each node and edge through the view classes. Edges are
+    visited in the same order as ``graph.edges`` yields them. In a multigraph, each
+    parallel edge is visited once with its own attribute dict.
+
+    """
+    node_dicts = getattr(graph, '_node', None)
+    if node_dicts is None:
+        node_dicts = dict(graph.nodes(data=True))
+    adjacency = getattr(graph, '_adj', None)
+    if adjacency is None:
+        adjacency = graph.adj
 
     # 1) Graph properties
     graph_directed = graph.is_directed()
     graph_metadata_dict = {key: val for key, val in graph.graph.items()}
-    _internal.insert_graph_data(data_graph, graph_directed, graph_metadata_dict)
+    columns = _internal.ColumnarGraph(graph_directed, graph_metadata_dict)
 
     # 2) Nodes and their properties
-    for node_object in graph.nodes:
-        node_id = str(node_object)
-        node_metadata_dict = {key: val for key, val in graph.nodes[node_object].items()}
-        _internal.insert_node_data(data_nodes, node_id, node_metadata_dict)
+    node_objects = list(adjacency)
+    num_nodes = len(node_objects)
+    node_index = {node_object: idx for idx, node_object in enumerate(node_objects)}
+    node_ids = [str(node_object) for node_object in node_objects]
+    node_key_orders = {}
+    node_columns = _internal.dicts_to_columns(
+        map(node_dicts.__getitem__, node_objects), num_nodes, node_key_orders)
+    columns.add_nodes(node_ids, node_columns, node_key_orders)
 
     # 3) Edges and their properties
-    for edge_object in graph.edges:
-        edge_source_id = str(edge_object[0])
-        edge_target_id = str(edge_object[1])
-        edge_metadata_dict = {key: val for key, val in graph.edges[edge_object].items()}
-        _internal.insert_edge_data(data_edges, edge_source_id, edge_target_id, edge_metadata_dict)
-    return data
+    values = _methodcaller('values')
+    if graph.is_multigraph():
+        # One entry per edge key: repeat the neighbor for each of its parallel edges
+        degrees = [sum(map(len, neighbors.values())) for neighbors in adjacency.values()]
+        neighbors = _chain.from_iterable(
+            _chain.from_iterable(map(_repeat, neighbors, map(len, neighbors.values())))
+            for neighbors in adjacency.values())
+
+        def iter_edge_dicts():
+            key_dicts = _chain.from_iterable(map(values, adjacency.values()))
+            return _chain.from_iterable(map(values, key_dicts))
+    else:
+        degrees = list(map(len, adjacency.values()))
+        neighbors = _chain.from_iterable(adjacency.values())
+
+        def iter_edge_dicts():
+            return _chain.from_iterable(map(values, adjacency.values()))
+    num_edges = sum(degrees)
+    if not all(map(_eq, node_objects, range(num_nodes))):
+        neighbors = map(node_index.__getitem__, neighbors)
+    # else: nodes are labeled 0, ..., n-1 so that they are their own index
+    has_edge_data = any(iter_edge_dicts())
+    edge_dicts = iter_edge_dicts() if has_edge_data else ()
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is not None:
+        edge_sources = np.repeat(np.arange(num_nodes, dtype=np.int64), degrees)
+        edge_targets = np.fromiter(neighbors, dtype=np.int64, count=num_edges)
+    else:
+        edge_sources = list(_chain.from_iterable(map(_repeat, range(num_nodes), degrees)))
+        edge_targets = list(neighbors)
+    if not graph_directed:
+        # Each undirected edge is stored in the adjacency of both of its nodes, but
+        # graph.edges yields it only once, namely when visiting the node that comes first
+        if np is not None:
+            keep = edge_sources <= edge_targets
+            edge_sources = edge_sources[keep]
+            edge_targets = edge_targets[keep]
+            keep = keep.tolist()
+        else:
+            keep = list(map(_le, edge_sources, edge_targets))
+            edge_sources = list(_compress(edge_sources, keep))
+            edge_targets = list(_compress(edge_targets, keep))
+        edge_dicts = _compress(edge_dicts, keep)
+    edge_key_orders = {}
+    edge_columns = _internal.dicts_to_columns(edge_dicts, len(edge_sources), edge_key_orders)
+    columns.add_edges(edge_sources, edge_targets, edge_columns, edge_key_orders)
+    return columns
 
 
 def pyntacle_to_gjgf(graph):
@@ -293,71 +513,65 @@ def snap_to_gjgf(graph):
         :doc:`gravis JSON Graph Format (gJGF) <../../format_specification>`
 
     """
-    import snap
+    return _snap_to_columns(graph).to_gjgf()
 
-    data, data_graph, data_nodes, data_edges = _internal.prepare_gjgf_dict()
-
-    def get_node_attributes_empty(graph, node_id):
-        return {}
-
-    def get_node_attributes_filled(graph, node_id):
-        node_attr_dict = {}
-        int_attribute_vec = snap.TStrV()
-        flt_attribute_vec = snap.TStrV()
-        str_attribute_vec = snap.TStrV()
-        graph.IntAttrNameNI(node_id, int_attribute_vec)
-        graph.FltAttrNameNI(node_id, flt_attribute_vec)
-        graph.StrAttrNameNI(node_id, str_attribute_vec)
-        for int_attr in int_attribute_vec:
-            node_attr_dict[int_attr] = graph.GetIntAttrDatN(node_id, int_attr)
-        for flt_attr in flt_attribute_vec:
-            node_attr_dict[flt_attr] = graph.GetFltAttrDatN(node_id, flt_attr)
-        for str_attr in str_attribute_vec:
-            node_attr_dict[str_attr] = graph.GetStrAttrDatN(node_id, str_attr)
-        return node_attr_dict
-
-    def get_edge_attributes_empty(graph, edge_id):
-        return {}
-
-    def get_edge_attributes_filled(graph, edge_id):
-        edge_attr_dict = {}
-        int_attribute_vec = snap.TStrV()
-        flt_attribute_vec = snap.TStrV()
-        str_attribute_vec = snap.TStrV()
-        graph.IntAttrNameEI(edge_id, int_attribute_vec)
-        graph.FltAttrNameEI(edge_id, flt_attribute_vec)
-        graph.StrAttrNameEI(edge_id, str_attribute_vec)
-        for int_attr in int_attribute_vec:
-            edge_attr_dict[int_attr] = graph.GetIntAttrDatE(edge_id, int_attr)
-        for flt_attr in flt_attribute_vec:
-            edge_attr_dict[flt_attr] = graph.GetFltAttrDatE(edge_id, flt_attr)
-        for str_attr in str_attribute_vec:
-            edge_attr_dict[str_attr] = graph.GetStrAttrDatE(edge_id, str_attr)
-        return edge_attr_dict
-
-    if 'snap.PNEANet' in str(type(graph)):
-        get_node_attributes = get_node_attributes_filled
-        get_edge_attributes = get_edge_attributes_filled
-    else:
-        get_node_attributes = get_node_attributes_empty
-        get_edge_attributes = get_edge_attributes_empty
+
+def _snap_to_columns(graph):
+    """Convert a SNAP graph object to a columnar graph.
+
+    For a PNEANet, the attribute names are discovered once per graph with
+    ``GetAttrNNames`` and ``GetAttrENames``. Each attribute is then read as one column
+    over all nodes or edges, where a deleted value, i.e. the default, marks a missing one.
+
+    """
+    import snap
 
     # 1) Graph properties
     _gt = str(type(graph))
     graph_directed = 'snap.PNGraph' in _gt or 'snap.PDirNet' in _gt or 'snap.PNEANet' in _gt
+    has_attributes = 'snap.PNEANet' in _gt
     graph_metadata_dict = {}  # Note: Seems to not be available in SNAP
-    _internal.insert_graph_data(data_graph, graph_directed, graph_metadata_dict)
+    columns = _internal.ColumnarGraph(graph_directed, graph_metadata_dict)
 
     # 2) Nodes and their properties
-    for node_object in graph.Nodes():
-        node_id = str(node_object.GetId())
-        node_metadata_dict = get_node_attributes(graph, node_object.GetId())
-        _internal.insert_node_data(data_nodes, node_id, node_metadata_dict)
+    node_objects = [node_object.GetId() for node_object in graph.Nodes()]
+    node_ids = list(map(str, node_objects))
+    node_columns = {}
+    if has_attributes:
+        node_columns = _snap_attribute_columns(
+            snap, node_objects, graph.GetAttrNNames,
+            (graph.GetIntAttrDatN, graph.IsIntAttrDeletedN),
+            (graph.GetFltAttrDatN, graph.IsFltAttrDeletedN),
+            (graph.GetStrAttrDatN, graph.IsStrAttrDeletedN))
+    columns.add_nodes(node_ids, node_columns)
 
     # 3) Edges and their properties
-    for edge_object in graph.Edges():
-        edge_source_id = str(edge_object.GetSrcNId())
-        edge_target_id = str(edge_object.GetDstNId())
-        edge_metadata_dict = get_edge_attributes(graph, edge_object.GetId())
-        _internal.insert_edge_data(data_edges, edge_source_id, edge_target_id, edge_metadata_dict)
-    return data
+    edge_objects = [(edge_object.GetSrcNId(), edge_object.GetDstNId(), edge_object.GetId())
+                    for edge_object in graph.Edges()]
+    node_index = dict(zip(node_objects, range(len(node_objects))))
+    edge_sources = [node_index[edge_object[0]] for edge_object in edge_objects]
+    edge_targets = [node_index[edge_object[1]] for edge_object in edge_objects]
+    edge_columns = {}
+    if has_attributes:
+        edge_columns = _snap_attribute_columns(
+            snap, list(map(_itemgetter(2), edge_objects)), graph.GetAttrENames,
+            (graph.GetIntAttrDatE, graph.IsIntAttrDeletedE),
+            (graph.GetFltAttrDatE, graph.IsFltAttrDeletedE),
+            (graph.GetStrAttrDatE, graph.IsStrAttrDeletedE))
+    columns.add_edges(edge_sources, edge_targets, edge_columns)
+    return columns
+
+
+def _snap_attribute_columns(snap, element_ids, get_names, int_access, flt_access, str_access):
+    """Read all int, float and str attributes of SNAP nodes or edges as value columns."""
+    int_names, flt_names, str_names = snap.TStrV(), snap.TStrV(), snap.TStrV()
+    get_names(int_names, flt_names, str_names)
+    columns = {}
+    for names, (get_value, is_deleted) in [
+            (int_names, int_access), (flt_names, flt_access), (str_names, str_access)]:
+        for name in names:
+            column = [_internal.MISSING if is_deleted(element_id, name)
+                      else get_value(element_id, name) for element_id in element_ids]
+            if any(map(_is_not, column, _repeat(_internal.MISSING))):
+                columns[name] = column
+    return columns
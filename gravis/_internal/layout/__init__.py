@@ -0,0 +1 @@
+"""A subpackage containing layout functions."""
@@ -0,0 +1,339 @@
+"""Force-directed layout with NumPy that mirrors the d3-force simulation of the d3 template.
+
+The simulation follows d3-force: velocity Verlet steps with a decaying temperature alpha,
+velocity decay and the same forces and parameters that :func:`~gravis.d3` passes to
+``d3.forceSimulation``. Instead of visiting one node after the other, each force is
+computed for all nodes at once with array operations. The many-body force uses the
+Barnes-Hut approximation on a quadtree whose levels are built from Morton codes, and the
+tree is traversed level by level for all nodes together.
+
+"""
+
+import numpy as _np
+
+
+# Defaults of d3.forceSimulation
+ALPHA_MIN = 0.001
+VELOCITY_DECAY = 0.4
+# Deepest quadtree level, so that Morton codes of both coordinates fit into 64 bits
+_MAX_DEPTH = 20
+# Number of nodes whose quadtree traversal is done at once, which bounds the memory use
+_CHUNK_SIZE = 2048
+
+
+def initial_positions(num_nodes, dim=2):
+    """Place nodes on a phyllotaxis spiral or sphere like d3-force and 3d-force-graph do."""
+    idx = _np.arange(num_nodes, dtype=float)
+    if dim == 2:
+        radius = 10.0 * _np.sqrt(0.5 + idx)
+        angle = idx * _np.pi * (3.0 - _np.sqrt(5.0))
+        return _np.column_stack([radius * _np.cos(angle), radius * _np.sin(angle)])
+    radius = 10.0 * _np.cbrt(0.5 + idx)
+    angle_xy = idx * _np.pi * (3.0 - _np.sqrt(5.0))
+    angle_z = idx * _np.pi * 20.0 / (9.0 + _np.sqrt(221.0))
+    return _np.column_stack([
+        radius * _np.sin(angle_z) * _np.cos(angle_xy),
+        radius * _np.cos(angle_z),
+        radius * _np.sin(angle_z) * _np.sin(angle_xy),
+    ])
+
+
+def simulate(positions, fixed, sources, targets, iterations=300,
+             many_body_strength=-70.0, theta=0.9, min_distance=0.0, max_distance=_np.inf,
+             links_distance=50.0, links_strength=0.5,
+             collision_radius=None, collision_strength=0.7,
+             positioning_strengths=None, centering=True, masses=None, alpha=1.0, seed=None):
+    """Run a force simulation and return the final node positions.
+
+    Parameters
+    ----------
+    positions : numpy.ndarray
+        Start positions with one row per node and one column per dimension (2 or 3).
+    fixed : numpy.ndarray
+        Boolean mask of nodes that keep their start position.
+    sources, targets : numpy.ndarray
+        Node indices of the edges.
+    iterations : int
+        Number of simulation steps, after which alpha reaches ``ALPHA_MIN``.
+    many_body_strength : float or None
+        Strength of the many-body force, negative for repulsion. None disables it.
+    theta : float
+        Barnes-Hut accuracy criterion.
+    min_distance, max_distance : float
+        Distance bounds of the many-body force.
+    links_distance, links_strength : float or None
+        Parameters of the links force, where the strength is scaled like in the template.
+        The distance can also be an array with one value per edge. A strength of None
+        disables it.
+    collision_radius, collision_strength : float or None
+        Parameters of the collision force. The radius can also be an array with one value
+        per node. A radius of None disables it.
+    positioning_strengths : list of float or None, optional
+        Strength of the force towards 0.0 for each dimension, or None to disable it.
+    centering : bool
+        If True, the mean position is moved to the origin in every step.
+    masses : numpy.ndarray, optional
+        Weight of each node in the many-body force, by default 1.0 for all nodes.
+    alpha : float
+        Start value of alpha. A lower value continues the simulation of a layout that is
+        already close to its final state.
+    seed : int, optional
+        Seed for the tiny random displacement of coincident nodes.
+
+    Returns
+    -------
+    positions : numpy.ndarray
+
+    """
+    rng = _np.random.default_rng(seed)
+    pos = _np.array(positions, dtype=float)
+    num_nodes, dim = pos.shape
+    vel = _np.zeros_like(pos)
+    fixed = _np.asarray(fixed, dtype=bool)
+    fixed_pos = pos[fixed]
+    free = ~fixed
+    sources = _np.asarray(sources, dtype=_np.int64)
+    targets = _np.asarray(targets, dtype=_np.int64)
+    if len(sources):
+        # Self-loops exert no force in d3-force either, since source and target coincide
+        keep = sources != targets
+        sources, targets = sources[keep], targets[keep]
+        if _np.ndim(links_distance):
+            links_distance = _np.asarray(links_distance)[keep]
+    if positioning_strengths is None:
+        positioning_strengths = [None] * dim
+    if num_nodes == 0 or iterations < 1:
+        return pos
+
+    # Link strength and bias as in setLinksForce of the d3 template
+    if links_strength is not None and len(sources):
+        counts = _np.bincount(sources, minlength=num_nodes) + _np.bincount(
+            targets, minlength=num_nodes)
+        link_strengths = 2.0 * links_strength / _np.minimum(counts[sources], counts[targets])
+        link_bias = counts[sources] / (counts[sources] + counts[targets])
+    else:
+        links_strength = None
+
+    alpha_decay = 1.0 - min(ALPHA_MIN / alpha, 1.0) ** (1.0 / iterations)
+    for _ in range(iterations):
+        alpha += -alpha * alpha_decay
+        if links_strength is not None:
+            _apply_links(pos, vel, sources, targets, links_distance, link_strengths,
+                         link_bias, alpha, rng)
+        if many_body_strength is not None:
+            vel += _many_body(pos, many_body_strength, theta, min_distance, max_distance,
+                              rng, masses) * alpha
+        if collision_radius is not None:
+            _apply_collision(pos, vel, collision_radius, collision_strength)
+        for axis, strength in enumerate(positioning_strengths[:dim]):
+            if strength is not None:
+                vel[:, axis] -= pos[:, axis] * strength * alpha
+        if centering:
+            pos -= pos.mean(axis=0)
+        vel *= 1.0 - VELOCITY_DECAY
+        pos[free] += vel[free]
+        pos[fixed] = fixed_pos
+        vel[fixed] = 0.0
+    return pos
+
+
+def _apply_links(pos, vel, sources, targets, distance, strengths, bias, alpha, rng):
+    """Pull or push the nodes of each edge towards the desired distance."""
+    num_nodes = len(pos)
+    delta = pos[targets] + vel[targets] - pos[sources] - vel[sources]
+    _jiggle_zeros(delta, rng)
+    length = _np.sqrt((delta ** 2).sum(axis=1))
+    scale = (length - distance) / length * alpha * strengths
+    delta *= scale[:, None]
+    for axis in range(pos.shape[1]):
+        vel[:, axis] -= _np.bincount(targets, delta[:, axis] * bias, num_nodes)
+        vel[:, axis] += _np.bincount(sources, delta[:, axis] * (1.0 - bias), num_nodes)
+
+
+def _apply_collision(pos, vel, radius, strength):
+    """Push overlapping nodes apart, treating them as circles or spheres."""
+    from scipy.spatial import cKDTree
+
+    num_nodes = len(pos)
+    radii = _np.broadcast_to(_np.asarray(radius, dtype=float), (num_nodes, ))
+    predicted = pos + vel
+    pairs = cKDTree(predicted).query_pairs(2.0 * radii.max(), output_type='ndarray')
+    if len(pairs) == 0:
+        return
+    first, second = pairs[:, 0], pairs[:, 1]
+    delta = predicted[first] - predicted[second]
+    length = _np.sqrt((delta ** 2).sum(axis=1))
+    length[length == 0.0] = 1e-6
+    overlap = radii[first] + radii[second] - length
+    inside = overlap > 0.0
+    first, second, delta = first[inside], second[inside], delta[inside]
+    scale = overlap[inside] / length[inside] * strength
+    delta *= scale[:, None]
+    # The overlap is split by the squared radii of the nodes, as in d3.forceCollide
+    share = radii[second] ** 2 / (radii[first] ** 2 + radii[second] ** 2)
+    for axis in range(pos.shape[1]):
+        vel[:, axis] += _np.bincount(first, delta[:, axis] * share, num_nodes)
+        vel[:, axis] -= _np.bincount(second, delta[:, axis] * (1.0 - share), num_nodes)
+
+
+def _jiggle_zeros(delta, rng):
+    """Replace zero components by tiny random values, like jiggle() in d3-force."""
+    zeros = delta == 0.0
+    if zeros.any():
+        delta[zeros] = (rng.random(int(zeros.sum())) - 0.5) * 1e-6
+
+
+def _many_body(pos, strength, theta, min_distance, max_distance, rng, masses=None):
+    """Calculate the many-body force on every node with the Barnes-Hut approximation.
+
+    Returns the velocity change per unit of alpha.
+
+    """
+    tree = _Tree(pos, masses)
+    result = _np.zeros_like(pos)
+    theta2 = theta * theta
+    min_distance2 = min_distance * min_distance
+    max_distance2 = max_distance * max_distance
+    # Chunks of nodes that are close in Morton order share most cells of their traversal
+    for start in range(0, len(pos), _CHUNK_SIZE):
+        nodes = tree.order[start:start + _CHUNK_SIZE]
+        result[nodes] = tree.force(nodes, strength, theta2, min_distance2, max_distance2, rng)
+    return result
+
+
+class _Tree:
+    """Quadtree or octree stored as one array of occupied cells per level.
+
+    All points are sorted by their Morton code on the deepest level. The code of a cell on
+    a coarser level is a prefix of the codes of all points it contains, so that each level
+    is obtained by shifting the codes and merging equal neighbours in the sorted order.
+
+    """
+
+    def __init__(self, pos, masses=None):
+        num_nodes, dim = pos.shape
+        self.pos = pos
+        self.masses = masses
+        self.dim = dim
+        lower = pos.min(axis=0)
+        size = float((pos.max(axis=0) - lower).max())
+        size = size * (1.0 + 1e-9) if size > 0.0 else 1.0
+        # Depth with a few points per leaf on average, limited for coincident points
+        self.depth = depth = int(min(_MAX_DEPTH, max(
+            1, _np.ceil(_np.log(max(num_nodes, 2) / 2.0) / _np.log(2 ** dim)) + 1)))
+        cells_per_axis = 2 ** depth
+        grid = _np.floor((pos - lower) / size * cells_per_axis).astype(_np.int64)
+        grid = _np.clip(grid, 0, cells_per_axis - 1)
+        codes = _morton(grid, depth)
+        self.order = order = _np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        sorted_masses = _np.ones(num_nodes) if masses is None else masses[order]
+        sorted_weighted_pos = pos[order] * sorted_masses[:, None]
+
+        # Cells of each level with their width, count, mass, center of mass and children
+        self.widths = [size / 2 ** level for level in range(depth + 1)]
+        self.node_codes = []
+        self.cell_codes = []
+        self.cell_counts = []
+        self.cell_masses = []
+        self.cell_centers = []
+        self.cell_starts = []
+        for level in range(depth + 1):
+            shift = dim * (depth - level)
+            level_codes = sorted_codes >> shift
+            is_first = _np.empty(num_nodes, dtype=bool)
+            is_first[0] = True
+            _np.not_equal(level_codes[1:], level_codes[:-1], out=is_first[1:])
+            starts = _np.flatnonzero(is_first)
+            counts = _np.diff(_np.append(starts, num_nodes))
+            cell_masses = _np.add.reduceat(sorted_masses, starts)
+            centers = _np.add.reduceat(sorted_weighted_pos, starts, axis=0) / cell_masses[:, None]
+            self.node_codes.append(codes >> shift)
+            self.cell_codes.append(level_codes[starts])
+            self.cell_counts.append(counts)
+            self.cell_masses.append(cell_masses)
+            self.cell_centers.append(centers)
+            self.cell_starts.append(starts)
+        self.child_starts = []
+        self.child_counts = []
+        for level in range(depth):
+            parent_codes = self.cell_codes[level + 1] >> dim
+            first = _np.searchsorted(parent_codes, self.cell_codes[level], 'left')
+            last = _np.searchsorted(parent_codes, self.cell_codes[level], 'right')
+            self.child_starts.append(first)
+            self.child_counts.append(last - first)
+
+    def force(self, nodes, strength, theta2, min_distance2, max_distance2, rng):
+        """Traverse the tree for the given nodes and sum up the forces acting on them."""
+        node_pos = self.pos[nodes]
+        result = _np.zeros((len(nodes), self.dim))
+        # Pairs of (position in nodes, cell index) that still need to be inspected
+        pair_nodes = _np.arange(len(nodes))
+        pair_cells = _np.zeros(len(nodes), dtype=_np.int64)
+        for level in range(self.depth + 1):
+            if len(pair_nodes) == 0:
+                break
+            delta = self.cell_centers[level][pair_cells] - node_pos[pair_nodes]
+            dist2 = _np.einsum('ij,ij->i', delta, delta)
+            # Barnes-Hut criterion of d3-force, excluding cells that contain the node itself
+            far = self.widths[level] ** 2 / theta2 < dist2
+            far &= self.node_codes[level][nodes][pair_nodes] != self.cell_codes[level][
+                pair_cells]
+            if far.any():
+                charge = strength * self.cell_masses[level][pair_cells[far]]
+                self._accumulate(result, pair_nodes[far], delta[far], dist2[far], charge,
+                                 min_distance2, max_distance2)
+                near = ~far
+                pair_nodes = pair_nodes[near]
+                pair_cells = pair_cells[near]
+            if level < self.depth:
+                counts = self.child_counts[level][pair_cells]
+                pair_nodes = _np.repeat(pair_nodes, counts)
+                pair_cells = _np.repeat(self.child_starts[level][pair_cells], counts) + \
+                    _ranges(counts)
+        # Points of the leaves that were not approximated are processed directly
+        counts = self.cell_counts[self.depth][pair_cells]
+        pair_nodes = _np.repeat(pair_nodes, counts)
+        others = self.order[_np.repeat(self.cell_starts[self.depth][pair_cells], counts) +
+                            _ranges(counts)]
+        not_self = others != nodes[pair_nodes]
+        pair_nodes, others = pair_nodes[not_self], others[not_self]
+        delta = self.pos[others] - node_pos[pair_nodes]
+        _jiggle_zeros(delta, rng)
+        dist2 = _np.einsum('ij,ij->i', delta, delta)
+        charge = strength if self.masses is None else strength * self.masses[others]
+        self._accumulate(result, pair_nodes, delta, dist2, charge, min_distance2,
+                         max_distance2)
+        return result
+
+    @staticmethod
+    def _accumulate(result, pair_nodes, delta, dist2, charge, min_distance2, max_distance2):
+        if max_distance2 != _np.inf:
+            inside = dist2 < max_distance2
+            pair_nodes, delta, dist2 = pair_nodes[inside], delta[inside], dist2[inside]
+            charge = charge[inside] if _np.ndim(charge) else charge
+        if min_distance2 > 0.0:
+            dist2 = _np.where(dist2 < min_distance2, _np.sqrt(min_distance2 * dist2), dist2)
+        weight = charge / _np.maximum(dist2, 1e-12)
+        for axis in range(result.shape[1]):
+            result[:, axis] += _np.bincount(
+                pair_nodes, delta[:, axis] * weight, len(result))
+
+
+def _ranges(counts):
+    """Concatenate the ranges 0..count-1 for each count."""
+    total = int(counts.sum())
+    if total == 0:
+        return _np.zeros(0, dtype=_np.int64)
+    offsets = _np.repeat(_np.cumsum(counts) - counts, counts)
+    return _np.arange(total, dtype=_np.int64) - offsets
+
+
+def _morton(grid, depth):
+    """Interleave the bits of integer grid coordinates to Morton codes."""
+    num_nodes, dim = grid.shape
+    codes = _np.zeros(num_nodes, dtype=_np.int64)
+    for bit in range(depth):
+        for axis in range(dim):
+            codes |= ((grid[:, axis] >> bit) & 1) << (bit * dim + axis)
+    return codes
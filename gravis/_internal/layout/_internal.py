@@ -0,0 +1,227 @@
+"""Internal functions used by the public layout functions."""
+
+import hashlib as _hashlib
+import json as _json
+from math import isfinite as _isfinite
+
+from ..conversion import _internal as _conversion
+
+
+POSITION_KEYS = ('x', 'y', 'z')
+# Decimal places of the stored coordinates, which are given in pixels
+_NUM_DECIMALS = 2
+# Part of every cache key, to be changed if layouts of the same parameters change
+_CACHE_KEY_VERSION = b'gravis-layout-1'
+
+
+def apply_layout(data, layout_function, dim=2):
+    """Calculate node positions for each graph and store them in the node metadata.
+
+    Parameters
+    ----------
+    data : str, dict, graph object, list
+        Graph data in any form accepted by :func:`~gravis.d3`.
+    layout_function : callable
+        Function that is called with a :class:`Topology` and returns an array of
+        positions with one row per node and ``dim`` columns.
+    dim : int
+        Number of coordinates per node, 2 for "x" and "y" or 3 for "x", "y" and "z".
+
+    Returns
+    -------
+    data : dict
+        A dict adhering to gJGF with "graph" as top level key if a single graph was given,
+        otherwise with "graphs" as top level key.
+
+    """
+    graphs = _conversion.normalize_graph_data(data)
+    results = layout_graphs(graphs, layout_function, dim)
+    if len(results) == 1:
+        return {'graph': results[0]}
+    return {'graphs': results}
+
+
+def layout_graphs(graphs, layout_function, dim=2, cache=None, cache_parameters=None):
+    """Calculate node positions for normalized graphs, optionally with a layout cache.
+
+    Parameters
+    ----------
+    graphs : list
+        Graphs as returned by :func:`~gravis._internal.conversion._internal.normalize_graph_data`.
+    layout_function : callable
+        Function that is called with a :class:`Topology` and returns an array of
+        positions with one row per node and ``dim`` columns.
+    dim : int
+        Number of coordinates per node.
+    cache : :class:`~gravis.layout.LayoutCache`, optional
+        Cache in which positions are looked up before the layout function is called and
+        stored afterwards.
+    cache_parameters : dict, optional
+        Parameters of the layout function, which are part of the cache key.
+
+    Returns
+    -------
+    graphs : list
+        Graphs with the positions in their node metadata. Columnar graphs stay columnar if
+        a cache is used, so that they can still be embedded as binary data.
+
+    """
+    results = []
+    for graph in graphs:
+        topology = Topology(graph, dim)
+        if cache is None:
+            results.append(topology.with_positions(layout_function(topology)))
+            continue
+        key, order = topology.cache_key(cache_parameters)
+        positions = cache.get(key)
+        if positions is None or positions.shape != (topology.num_nodes, dim):
+            positions = layout_function(topology)
+            # Stored in the order of sorted node ids, which is independent of the input
+            cache.put(key, positions[order])
+        else:
+            stored, positions = positions, positions.copy()
+            positions[order] = stored
+        results.append(topology.with_positions(positions, keep_columnar=True))
+    return results
+
+
+class Topology:
+    """Nodes and edges of a normalized graph as arrays of indices, plus given positions."""
+
+    def __init__(self, graph, dim=2):
+        """Extract the structure of a gJGF graph dict or a columnar graph.
+
+        Edges with a source or target that is no known node are ignored, as in the
+        templates.
+
+        """
+        import numpy as np
+
+        self.graph = graph
+        self.dim = dim
+        keys = POSITION_KEYS[:dim]
+        if isinstance(graph, _conversion.ColumnarGraph):
+            self.num_nodes = graph.num_nodes
+            self.node_ids = [_to_js_string(node_id)
+                             for node_id in _conversion.to_list(graph.node_ids)]
+            self.sources = np.asarray(_conversion.to_list(graph.edge_sources), dtype=np.int64)
+            self.targets = np.asarray(_conversion.to_list(graph.edge_targets), dtype=np.int64)
+            columns = dict(graph.iter_node_columns())
+            given = [columns.get(key, [_conversion.MISSING] * self.num_nodes) for key in keys]
+        else:
+            nodes = graph.get('nodes') or {}
+            if isinstance(nodes, list):
+                nodes = {str(idx): node for idx, node in enumerate(nodes)}
+            self.num_nodes = len(nodes)
+            self.node_ids = [_to_js_string(node_id) for node_id in nodes]
+            node_index = {node_id: idx for idx, node_id in enumerate(self.node_ids)}
+            sources, targets = [], []
+            for edge in graph.get('edges') or []:
+                try:
+                    source = node_index[_to_js_string(edge['source'])]
+                    target = node_index[_to_js_string(edge['target'])]
+                except (KeyError, TypeError):
+                    continue
+                sources.append(source)
+                targets.append(target)
+            self.sources = np.asarray(sources, dtype=np.int64)
+            self.targets = np.asarray(targets, dtype=np.int64)
+            metadata = [_get_metadata(node) for node in nodes.values()]
+            given = [[node_metadata.get(key) for node_metadata in metadata] for key in keys]
+        self.given_positions = np.array(
+            [[_to_number(value) for value in column] for column in given],
+            dtype=float).reshape(dim, self.num_nodes).T
+        self.fixed = ~np.isnan(self.given_positions).any(axis=1)
+
+    def cache_key(self, parameters=None):
+        """Create a key that identifies the layout of this graph with the given parameters.
+
+        The key is a SHA-256 hash of the node ids, the edges, the given positions and the
+        parameters. It does not depend on the order of nodes and edges, on the direction
+        of edges or on any other metadata, because none of them changes the layout.
+
+        Returns
+        -------
+        key : str
+        order : numpy.ndarray
+            Indices of the nodes sorted by id, which is the order of stored positions.
+
+        """
+        import numpy as np
+
+        order = np.argsort(np.array(self.node_ids, dtype=str), kind='stable')
+        rank = np.empty(self.num_nodes, dtype=np.int64)
+        rank[order] = np.arange(self.num_nodes)
+        edges = np.sort(np.column_stack([rank[self.sources], rank[self.targets]]), axis=1)
+        edges = edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+        digest = _hashlib.sha256(_CACHE_KEY_VERSION)
+        digest.update(_json.dumps([self.dim, parameters], sort_keys=True).encode())
+        digest.update(_json.dumps([self.node_ids[idx] for idx in order]).encode())
+        digest.update(np.ascontiguousarray(edges, dtype='<i8').tobytes())
+        digest.update(np.ascontiguousarray(self.given_positions[order], dtype='<f8').tobytes())
+        return digest.hexdigest(), order
+
+    def with_positions(self, positions, keep_columnar=False):
+        """Create a gJGF graph dict with the positions stored as node metadata.
+
+        The given graph is not modified. If ``keep_columnar`` is True, a columnar graph
+        is returned as a new columnar graph instead of a dict.
+
+        """
+        positions = [[round(float(value), _NUM_DECIMALS) for value in column]
+                     for column in positions.T]
+        keys = POSITION_KEYS[:self.dim]
+        graph = self.graph
+        if isinstance(graph, _conversion.ColumnarGraph):
+            columnar = _conversion.ColumnarGraph(graph.directed, graph.graph_metadata)
+            columnar.node_ids = graph.node_ids
+            columnar.node_columns = dict(graph.node_columns)
+            columnar.node_columns.update(zip(keys, positions))
+            columnar.edge_sources = graph.edge_sources
+            columnar.edge_targets = graph.edge_targets
+            columnar.edge_columns = graph.edge_columns
+            columnar.node_key_orders = graph.node_key_orders
+            columnar.edge_key_orders = graph.edge_key_orders
+            if keep_columnar:
+                return columnar
+            return columnar.to_gjgf()['graph']
+        nodes = graph.get('nodes') or {}
+        new_nodes = []
+        for idx, node in enumerate(nodes.values() if isinstance(nodes, dict) else nodes):
+            new_node = dict(node) if isinstance(node, dict) else {}
+            node_metadata = dict(_get_metadata(node))
+            for key, column in zip(keys, positions):
+                node_metadata[key] = column[idx]
+            new_node['metadata'] = node_metadata
+            new_nodes.append(new_node)
+        if isinstance(nodes, dict):
+            new_nodes = dict(zip(nodes, new_nodes))
+        new_graph = dict(graph)
+        new_graph['nodes'] = new_nodes
+        return new_graph
+
+
+def _get_metadata(node):
+    if isinstance(node, dict) and isinstance(node.get('metadata'), dict):
+        return node['metadata']
+    return {}
+
+
+def _to_number(value):
+    """Get a finite number or NaN, like getFiniteNumberOrNull in the templates."""
+    if isinstance(value, bool) or value is None or value is _conversion.MISSING:
+        return float('nan')
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+    return number if _isfinite(number) else float('nan')
+
+
+def _to_js_string(value):
+    """Convert a node id to the string that String() gives in the templates."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return _json.dumps(value)
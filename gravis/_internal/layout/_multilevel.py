@@ -0,0 +1,220 @@
+"""Multilevel force-directed layout that coarsens the graph and refines it level by level.
+
+The graph is repeatedly coarsened by merging matched pairs of neighbouring nodes into
+one node whose mass is the sum of both masses. The coarsest graph is small enough to be
+laid out with a full force simulation. Its positions are then carried back through the
+levels: every node starts at the position of the node it was merged into and a short
+simulation at low temperature resolves the local structure. Each level has at most a
+constant fraction of the nodes of the finer one, so that the total work is dominated by
+the few refinement steps on the original graph instead of a full simulation on it.
+
+"""
+
+import numpy as _np
+
+from . import _force
+
+
+# Number of matching rounds per coarsening step
+_MATCHING_ROUNDS = 3
+# Coarsening stops when a step removes less than this fraction of the nodes
+_MIN_REDUCTION = 0.1
+# Unmatched nodes only join groups up to this multiple of the mean mass
+_MAX_JOIN_MASS_FACTOR = 4.0
+# Start value of alpha in the refinement of each finer level
+_REFINEMENT_ALPHA = 0.6
+
+
+def coarsen(num_nodes, sources, targets, masses, fixed, rng):
+    """Merge matched pairs of neighbouring nodes and attach unmatched nodes to them.
+
+    Nodes propose to the neighbour with the smallest combined mass, with ties broken at
+    random, and mutual proposals are merged, which keeps the masses of the coarse nodes
+    balanced. Isolated nodes are paired among each other. Nodes that remain unmatched are
+    attached to a matched neighbour as long as its group stays light enough. Fixed nodes
+    are never merged.
+
+    Returns
+    -------
+    parents : numpy.ndarray
+        Index of the coarse node of each node.
+    coarse : tuple
+        Number of nodes, sources, targets, masses and fixed mask of the coarse graph.
+
+    """
+    keep = sources != targets
+    sources, targets = sources[keep], targets[keep]
+    first = _np.concatenate([sources, targets])
+    second = _np.concatenate([targets, sources])
+    partner = _np.full(num_nodes, -1, dtype=_np.int64)
+    for _ in range(_MATCHING_ROUNDS):
+        free = (partner < 0) & ~fixed
+        usable = free[first] & free[second]
+        cand_first, cand_second = first[usable], second[usable]
+        if len(cand_first) == 0:
+            break
+        key = masses[cand_first] + masses[cand_second] + rng.random(len(cand_first)) * 1e-3
+        order = _np.lexsort((key, cand_first))
+        cand_first, cand_second = cand_first[order], cand_second[order]
+        is_start = _np.ones(len(cand_first), dtype=bool)
+        is_start[1:] = cand_first[1:] != cand_first[:-1]
+        proposal = _np.full(num_nodes, -1, dtype=_np.int64)
+        proposal[cand_first[is_start]] = cand_second[is_start]
+        proposers = _np.flatnonzero(proposal >= 0)
+        mutual = proposers[proposal[proposal[proposers]] == proposers]
+        partner[mutual] = proposal[mutual]
+
+    # Each matched pair is represented by its smaller index
+    representative = _np.arange(num_nodes, dtype=_np.int64)
+    matched = partner >= 0
+    representative[matched] = _np.minimum(_np.flatnonzero(matched), partner[matched])
+
+    # Isolated nodes have no neighbour to be matched with, so they would remain until the
+    # coarsening stalls. They are paired among each other in the order of their masses.
+    degrees = _np.bincount(first, minlength=num_nodes)
+    isolated = _np.flatnonzero((degrees == 0) & ~fixed)
+    isolated = isolated[_np.argsort(masses[isolated], kind='stable')]
+    isolated_pairs = isolated[:len(isolated) // 2 * 2].reshape(-1, 2)
+    representative[isolated_pairs.max(axis=1)] = isolated_pairs.min(axis=1)
+
+    # Unmatched nodes join the lightest group of a matched neighbour, which collapses
+    # stars and hubs that matching alone reduces by one node per step. A group only takes
+    # new members until its mass reaches a multiple of the mean mass, except for leaves.
+    pair_masses = _np.where(matched, masses + masses[partner], masses)
+    max_mass = _MAX_JOIN_MASS_FACTOR * masses.sum() / num_nodes
+    joins = ~matched[first] & ~fixed[first] & matched[second]
+    joiners, neighbours = first[joins], second[joins]
+    if len(joiners):
+        order = _np.lexsort((pair_masses[neighbours], joiners))
+        joiners, neighbours = joiners[order], neighbours[order]
+        is_start = _np.ones(len(joiners), dtype=bool)
+        is_start[1:] = joiners[1:] != joiners[:-1]
+        joiners, groups = joiners[is_start], representative[neighbours[is_start]]
+        order = _np.argsort(groups, kind='stable')
+        joiners, groups = joiners[order], groups[order]
+        cumulative = _np.cumsum(masses[joiners])
+        group_starts = _np.flatnonzero(_np.r_[True, groups[1:] != groups[:-1]])
+        offsets = _np.repeat(cumulative[group_starts] - masses[joiners[group_starts]],
+                             _np.diff(_np.r_[group_starts, len(groups)]))
+        accepted = (pair_masses[groups] + cumulative - offsets <= max_mass) | (
+            degrees[joiners] == 1)
+        representative[joiners[accepted]] = groups[accepted]
+
+    unique, parents = _np.unique(representative, return_inverse=True)
+    parents = parents.reshape(-1)
+    num_coarse = len(unique)
+    coarse_masses = _np.bincount(parents, masses, minlength=num_coarse)
+    coarse_fixed = _np.zeros(num_coarse, dtype=bool)
+    coarse_fixed[parents[fixed]] = True
+
+    # Edges between different coarse nodes, each pair only once
+    coarse_sources, coarse_targets = parents[sources], parents[targets]
+    between = coarse_sources != coarse_targets
+    low = _np.minimum(coarse_sources[between], coarse_targets[between])
+    high = _np.maximum(coarse_sources[between], coarse_targets[between])
+    pairs = _np.unique(low * num_coarse + high)
+    coarse_sources, coarse_targets = pairs // num_coarse, pairs % num_coarse
+    coarse = (num_coarse, coarse_sources, coarse_targets, coarse_masses, coarse_fixed)
+    return parents, coarse
+
+
+def simulate(positions, fixed, sources, targets, iterations=300, refinement_iterations=50,
+             coarsest_size=50, links_distance=50.0, collision_radius=None, seed=None,
+             **force_kwargs):
+    """Run the multilevel layout and return the final node positions.
+
+    Parameters
+    ----------
+    positions : numpy.ndarray
+        Start positions, of which only the rows of fixed nodes are used.
+    fixed : numpy.ndarray
+        Boolean mask of nodes that keep their start position.
+    sources, targets : numpy.ndarray
+        Node indices of the edges.
+    iterations : int
+        Number of simulation steps for the coarsest graph.
+    refinement_iterations : int
+        Number of simulation steps for each finer level.
+    coarsest_size : int
+        Coarsening stops once a graph has at most this many nodes.
+    links_distance, collision_radius : float or None
+        Parameters for the original graph, which are scaled with the mass of the nodes
+        of coarser levels.
+    seed : int, optional
+        Seed for the matching and the displacement of nodes that are separated.
+    **force_kwargs
+        Further arguments of :func:`gravis._internal.layout._force.simulate`.
+
+    Returns
+    -------
+    positions : numpy.ndarray
+
+    """
+    rng = _np.random.default_rng(seed)
+    positions = _np.array(positions, dtype=float)
+    num_nodes, dim = positions.shape
+    fixed = _np.asarray(fixed, dtype=bool)
+    sources = _np.asarray(sources, dtype=_np.int64)
+    targets = _np.asarray(targets, dtype=_np.int64)
+
+    # Coarsening
+    levels = [(num_nodes, sources, targets, _np.ones(num_nodes), fixed)]
+    parents_per_level = []
+    fixed_positions = [positions]
+    while levels[-1][0] > coarsest_size:
+        level_num_nodes, level_sources, level_targets, level_masses, level_fixed = levels[-1]
+        parents, coarse = coarsen(level_num_nodes, level_sources, level_targets,
+                                  level_masses, level_fixed, rng)
+        if coarse[0] > (1.0 - _MIN_REDUCTION) * level_num_nodes:
+            break
+        coarse_positions = _np.zeros((coarse[0], dim))
+        coarse_positions[parents[level_fixed]] = fixed_positions[-1][level_fixed]
+        levels.append(coarse)
+        parents_per_level.append(parents)
+        fixed_positions.append(coarse_positions)
+
+    # Layout of the coarsest graph, whose size resembles the one of the original graph
+    level_num_nodes, level_sources, level_targets, level_masses, level_fixed = levels[-1]
+    level_positions = _force.initial_positions(level_num_nodes, dim)
+    level_positions *= _np.sqrt(num_nodes / max(level_num_nodes, 1)) if dim == 2 else (
+        _np.cbrt(num_nodes / max(level_num_nodes, 1)))
+    level_positions[level_fixed] = fixed_positions[-1][level_fixed]
+    level_positions = _force.simulate(
+        level_positions, level_fixed, level_sources, level_targets, iterations,
+        **_level_kwargs(level_masses, level_sources, level_targets, links_distance,
+                        collision_radius, dim, force_kwargs, rng))
+
+    # Refinement
+    for level in range(len(levels) - 2, -1, -1):
+        level_num_nodes, level_sources, level_targets, level_masses, level_fixed = levels[level]
+        coarse_masses = levels[level + 1][3]
+        parents = parents_per_level[level]
+        # Nodes start near their coarse node, spread by the size it stands for
+        spread = 0.5 * links_distance * coarse_masses[parents] ** (1.0 / dim)
+        jitter = rng.uniform(-1.0, 1.0, (level_num_nodes, dim)) * spread[:, None]
+        level_positions = level_positions[parents] + jitter
+        level_positions[level_fixed] = fixed_positions[level][level_fixed]
+        level_positions = _force.simulate(
+            level_positions, level_fixed, level_sources, level_targets,
+            refinement_iterations, alpha=_REFINEMENT_ALPHA,
+            **_level_kwargs(level_masses, level_sources, level_targets, links_distance,
+                            collision_radius, dim, force_kwargs, rng))
+    return level_positions
+
+
+def _level_kwargs(masses, sources, targets, links_distance, collision_radius, dim,
+                  force_kwargs, rng):
+    """Scale the parameters that depend on the size of a node to the masses of a level."""
+    kwargs = dict(force_kwargs)
+    if _np.all(masses == 1.0):
+        kwargs.update(links_distance=links_distance, collision_radius=collision_radius)
+    else:
+        # A node of mass m covers about the area or volume of m nodes of the original graph
+        size = masses ** (1.0 / dim)
+        kwargs.update(
+            masses=masses,
+            links_distance=links_distance * 0.5 * (size[sources] + size[targets]),
+            collision_radius=None if collision_radius is None else collision_radius * size,
+        )
+    kwargs['seed'] = int(rng.integers(2 ** 31))
+    return kwargs
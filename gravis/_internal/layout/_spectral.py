@@ -0,0 +1,170 @@
+"""Spectral layout from eigenvectors of the sparse normalized graph Laplacian with SciPy.
+
+The coordinates are the eigenvectors of the generalized problem ``L x = lambda D x``
+for the smallest nonzero eigenvalues, where ``L`` is the Laplacian and ``D`` the degree
+matrix. They are computed as the largest eigenvectors of ``D^-1/2 A D^-1/2``, whose
+eigenvalues lie between -1 and 1, so that ARPACK and LOBPCG converge without a shift and
+invert step. Each iteration costs one sparse matrix product, i.e. O(E) per vector. The
+adjacency matrix ``A`` is regularized with a weak complete graph, which is applied
+without storing it, because eigenvectors of sparse graphs otherwise tend to concentrate
+on a few nodes and leave the rest of the graph in a small cluster.
+
+The eigenvectors of a disconnected graph do not separate its components, therefore each
+connected component is laid out on its own and the components are packed in rows.
+
+"""
+
+import warnings as _warnings
+
+import numpy as _np
+
+
+# Components up to this size are solved with a dense eigendecomposition
+_DENSE_MAX_NODES = 500
+# Accuracy and iteration limit of the iterative eigensolvers
+_TOLERANCE = 1e-4
+_MAX_ITERATIONS = 2000
+# Weight of the regularization per node relative to the mean degree
+_TAU_FACTOR = 0.25
+
+
+def spectral_positions(num_nodes, sources, targets, dim=2, node_distance=50.0,
+                       method='auto', seed=None):
+    """Calculate a spectral layout whose size resembles the one of a force layout.
+
+    Parameters
+    ----------
+    num_nodes : int
+        Number of nodes.
+    sources, targets : numpy.ndarray
+        Node indices of the edges. Self-loops and repeated edges are ignored.
+    dim : int
+        Number of dimensions, i.e. eigenvectors used as coordinates.
+    node_distance : float
+        Typical distance between neighbouring nodes. Each component covers an area or
+        volume of about ``node_distance ** dim`` per node.
+    method : str
+        Eigensolver, either "auto", "dense", "arpack" or "lobpcg".
+    seed : int, optional
+        Seed for the start vectors of the iterative eigensolvers.
+
+    Returns
+    -------
+    positions : numpy.ndarray
+
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    rng = _np.random.default_rng(seed)
+    if num_nodes == 0:
+        return _np.zeros((0, dim))
+    sources = _np.asarray(sources, dtype=_np.int64)
+    targets = _np.asarray(targets, dtype=_np.int64)
+    keep = sources != targets
+    sources, targets = sources[keep], targets[keep]
+    adjacency = coo_matrix(
+        (_np.ones(2 * len(sources)), (_np.concatenate([sources, targets]),
+                                      _np.concatenate([targets, sources]))),
+        shape=(num_nodes, num_nodes)).tocsr()
+    # Repeated edges count once
+    adjacency.data[:] = 1.0
+
+    # Nodes sorted by component, so that each component is a block on the diagonal
+    _, labels = connected_components(adjacency, directed=False)
+    order = _np.argsort(labels, kind='stable')
+    adjacency = adjacency[order][:, order]
+    bounds = _np.flatnonzero(_np.diff(labels[order])) + 1
+    blocks = list(zip(_np.r_[0, bounds], _np.r_[bounds, num_nodes]))
+    # Largest components first, so that the packing places them at the top left
+    blocks.sort(key=lambda block: block[0] - block[1])
+    layouts = []
+    for start, stop in blocks:
+        if stop - start == 1:
+            layout = _np.zeros((1, dim))
+        else:
+            layout = _component_layout(adjacency[start:stop, start:stop], dim, method, rng)
+            layout *= node_distance * (stop - start) ** (1.0 / dim) / _rms_radius(layout)
+        layouts.append(layout)
+    positions = _np.zeros((num_nodes, dim))
+    for (start, stop), layout in zip(blocks, _pack(layouts, node_distance)):
+        positions[order[start:stop]] = layout
+    return positions - positions.mean(axis=0)
+
+
+def _component_layout(adjacency, dim, method, rng):
+    """Lay out a connected graph with the eigenvectors of its regularized adjacency."""
+    from scipy.sparse.linalg import ArpackNoConvergence, LinearOperator, eigsh, lobpcg
+
+    num_nodes = adjacency.shape[0]
+    degrees = _np.asarray(adjacency.sum(axis=1)).ravel()
+    # Regularization with a complete graph of total weight tau per node, which keeps
+    # eigenvectors of sparse graphs from concentrating on a few dangling trees
+    tau = _TAU_FACTOR * degrees.mean()
+    scaling = 1.0 / _np.sqrt(degrees + tau)
+
+    def matvec(vectors):
+        vectors = vectors.reshape(num_nodes, -1) * scaling[:, None]
+        result = adjacency @ vectors + tau / num_nodes * vectors.sum(axis=0)
+        return result * scaling[:, None]
+
+    # The first eigenvector belongs to the eigenvalue 1 and is proportional to 1 / scaling
+    num_vectors = min(dim + 1, num_nodes)
+    if method == 'auto':
+        method = 'dense' if num_nodes <= _DENSE_MAX_NODES else 'arpack'
+    # The iterative eigensolvers require clearly more nodes than eigenvectors
+    if method == 'dense' or num_nodes <= 5 * num_vectors:
+        values, vectors = _np.linalg.eigh(matvec(_np.eye(num_nodes)))
+    else:
+        operator = LinearOperator((num_nodes, num_nodes), matvec=matvec, matmat=matvec,
+                                  dtype=float)
+        values = None
+        if method == 'arpack':
+            try:
+                values, vectors = eigsh(operator, k=num_vectors, which='LA', tol=_TOLERANCE,
+                                        maxiter=_MAX_ITERATIONS * num_vectors,
+                                        v0=rng.uniform(-1.0, 1.0, num_nodes))
+            except ArpackNoConvergence:
+                pass
+        if values is None:
+            # The known first eigenvector is a good part of the start block
+            start = rng.uniform(-1.0, 1.0, (num_nodes, num_vectors))
+            start[:, 0] = 1.0 / scaling
+            # Eigenvectors that miss the tolerance after all iterations still give a
+            # usable layout, therefore the warning about it is not shown
+            with _warnings.catch_warnings():
+                _warnings.simplefilter('ignore', UserWarning)
+                values, vectors = lobpcg(operator, start, largest=True, tol=_TOLERANCE,
+                                         maxiter=_MAX_ITERATIONS)
+    vectors = vectors[:, _np.argsort(values)[::-1][:num_vectors]]
+    layout = vectors[:, 1:] * scaling[:, None]
+    # Too small components lack eigenvectors for all dimensions
+    layout = _np.column_stack([layout, _np.zeros((num_nodes, dim - layout.shape[1]))])
+    # Identical nodes, e.g. the leaves of a star, get a small random displacement
+    layout += rng.uniform(-1e-3, 1e-3, layout.shape) * _rms_radius(layout)
+    return layout
+
+
+def _rms_radius(layout):
+    radius = _np.sqrt(((layout - layout.mean(axis=0)) ** 2).sum(axis=1).mean())
+    return radius if radius > 0.0 else 1.0
+
+
+def _pack(layouts, node_distance):
+    """Place component layouts next to each other in rows of about equal width."""
+    dim = layouts[0].shape[1] if layouts else 2
+    extents = [_np.ptp(layout, axis=0) + node_distance for layout in layouts]
+    row_width = max(
+        _np.sqrt(sum(extent[0] * extent[1] for extent in extents)), max(
+            (extent[0] for extent in extents), default=0.0))
+    placed = []
+    x_offset, y_offset, row_height = 0.0, 0.0, 0.0
+    for layout, extent in zip(layouts, extents):
+        if x_offset > 0.0 and x_offset + extent[0] > row_width:
+            x_offset, y_offset, row_height = 0.0, y_offset + row_height, 0.0
+        offset = _np.zeros(dim)
+        offset[:2] = x_offset, y_offset
+        placed.append(layout - layout.min(axis=0) + offset)
+        x_offset += extent[0]
+        row_height = max(row_height, extent[1])
+    return placed
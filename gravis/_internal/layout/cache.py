@@ -0,0 +1,122 @@
+"""On-disk cache of node positions, addressed by graph structure and layout parameters."""
+
+import os as _os
+import uuid as _uuid
+
+from ..utils.args import check_arg as _ca
+
+
+class LayoutCache:
+    """A directory that stores calculated node positions for reuse.
+
+    Each entry holds the positions of one graph in a NumPy file whose name is a hash of
+    the node ids, the edges, the given node positions and the layout parameters. Any
+    other data of the graph, like colors or labels, can change without invalidating the
+    entry. When the total size of all entries exceeds ``max_size``, the entries that
+    were least recently used are removed.
+
+    The cache can be passed to :func:`~gravis.d3` or :func:`~gravis.three` with the
+    argument ``layout_cache``. Several processes may use the same directory at once,
+    since entries are written atomically.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the cache files. It is created if it does not exist.
+    max_size : int
+        Maximum total size of all entries in bytes. A graph with n nodes needs about
+        16 * n bytes.
+
+    Examples
+    --------
+    >>> cache = gv.layout.LayoutCache('layouts', max_size=500 * 2 ** 20)
+    >>> fig = gv.d3(graph, layout_cache=cache)
+
+    """
+
+    _SUFFIX = '.npy'
+
+    def __init__(self, directory, max_size=100 * 2 ** 20):
+        _ca(directory, 'directory', str)
+        _ca(max_size, 'max_size', int)
+        self.directory = directory
+        self.max_size = max_size
+        _os.makedirs(directory, exist_ok=True)
+
+    def __repr__(self):
+        return '{}({!r}, max_size={})'.format(
+            self.__class__.__name__, self.directory, self.max_size)
+
+    def __len__(self):
+        return len(self._entries())
+
+    def get(self, key):
+        """Load the positions stored for a key and mark them as recently used.
+
+        Returns
+        -------
+        positions : numpy.ndarray or None
+            None if there is no entry for the key or it can not be read.
+
+        """
+        import numpy as np
+
+        filepath = self._filepath(key)
+        try:
+            positions = np.load(filepath, allow_pickle=False)
+            _os.utime(filepath)
+        except (OSError, ValueError):
+            return None
+        return positions
+
+    def put(self, key, positions):
+        """Store the positions for a key and remove old entries if the cache is too large."""
+        import numpy as np
+
+        filepath = self._filepath(key)
+        # A file is written under a temporary name and renamed, so that readers never see
+        # a partial file
+        tmp_filepath = '{}.{}.tmp'.format(filepath, _uuid.uuid4().hex)
+        try:
+            with open(tmp_filepath, 'wb') as file_handle:
+                np.save(file_handle, np.asarray(positions, dtype=float), allow_pickle=False)
+            _os.replace(tmp_filepath, filepath)
+        finally:
+            if _os.path.exists(tmp_filepath):
+                _os.remove(tmp_filepath)
+        self._evict()
+
+    def clear(self):
+        """Remove all entries."""
+        for filepath, _, _ in self._entries():
+            try:
+                _os.remove(filepath)
+            except FileNotFoundError:
+                pass
+
+    def _filepath(self, key):
+        return _os.path.join(self.directory, key + self._SUFFIX)
+
+    def _entries(self):
+        """List path, size and time of last use of every entry."""
+        entries = []
+        for entry in _os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(self._SUFFIX):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total_size = sum(size for _, size, _ in entries)
+        for filepath, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total_size <= self.max_size:
+                break
+            try:
+                _os.remove(filepath)
+            except FileNotFoundError:
+                pass
+            total_size -= size
@@ -0,0 +1,340 @@
+"""This is the module :py:mod:`gravis.layout`.
+
+It provides functions that calculate node positions in Python instead of the browser.
+The positions are stored as "x" and "y" in the node metadata of gJGF, which the
+plotting functions :func:`~gravis.d3`, :func:`~gravis.vis` and :func:`~gravis.three`
+use as fixed node positions. The browser then only renders the graph, so that large
+graphs are shown without a long running simulation and exported images show a fully
+converged layout. With ``dim=3`` a layout also has "z" coordinates, and
+:func:`~gravis.three` turns its simulation off if all nodes have them.
+
+All layout functions accept graph data in the same forms as the plotting functions and
+return a gJGF dict that can be passed to them. Nodes that already have "x" and "y"
+(and "z" in 3D) in their metadata keep their positions.
+
+A :class:`LayoutCache` stores calculated positions on disk. Passed to :func:`~gravis.d3`
+or :func:`~gravis.three` as ``layout_cache``, it lets repeated plots of the same graph
+skip the layout.
+
+"""
+
+from ..utils.args import check_arg as _ca
+from . import _internal
+from .cache import LayoutCache
+
+
+def force_directed(data, iterations=300, dim=2, initial_layout='phyllotaxis',
+                   use_many_body_force=True, many_body_force_strength=-70.0,
+                   many_body_force_theta=0.9,
+                   use_many_body_force_min_distance=False, many_body_force_min_distance=10.0,
+                   use_many_body_force_max_distance=False,
+                   many_body_force_max_distance=1000.0,
+                   use_links_force=True, links_force_distance=50.0, links_force_strength=0.5,
+                   use_collision_force=False, collision_force_radius=25.0,
+                   collision_force_strength=0.7,
+                   use_x_positioning_force=False, x_positioning_force_strength=0.2,
+                   use_y_positioning_force=False, y_positioning_force_strength=0.2,
+                   use_z_positioning_force=False, z_positioning_force_strength=0.2,
+                   use_centering_force=True, seed=None):
+    """Calculate a force-directed layout with the same forces as the simulation of d3().
+
+    The simulation mirrors d3-force with the parameters of :func:`~gravis.d3`, so that
+    the result resembles the layout the browser would calculate. The many-body force is
+    approximated with a Barnes-Hut quadtree and all forces are computed with NumPy for
+    all nodes at once.
+
+    Parameters
+    ----------
+    data : str, dict, graph object, list
+        Graph data in any form accepted by :func:`~gravis.d3`.
+    iterations : int
+        Number of simulation steps. d3-force uses 300 steps until it cools down.
+    dim : int
+        Number of dimensions, 2 for "x" and "y" or 3 for "x", "y" and "z".
+    initial_layout : str
+        Start positions of the simulation.
+
+        - "phyllotaxis": Nodes start on a spiral as in d3-force.
+        - "spectral": Nodes start at the positions of :func:`spectral`, which already
+          shows the large-scale structure of the graph. The simulation then needs far
+          fewer iterations, e.g. 50 to 100. Requires SciPy.
+    use_many_body_force, many_body_force_strength, many_body_force_theta,
+    use_many_body_force_min_distance, many_body_force_min_distance,
+    use_many_body_force_max_distance, many_body_force_max_distance,
+    use_links_force, links_force_distance, links_force_strength,
+    use_collision_force, collision_force_radius, collision_force_strength,
+    use_x_positioning_force, x_positioning_force_strength,
+    use_y_positioning_force, y_positioning_force_strength,
+    use_z_positioning_force, z_positioning_force_strength, use_centering_force :
+        Forces of the simulation with the same meaning as in :func:`~gravis.d3` and
+        :func:`~gravis.three`. The z positioning force is only used in 3D.
+        The collision force requires SciPy.
+    seed : int, optional
+        Seed for the random displacement of nodes that share the same position.
+
+    Returns
+    -------
+    data : dict
+        A dict adhering to gJGF with "x" and "y", and "z" in 3D, in the metadata of each
+        node.
+
+    """
+    from . import _force
+
+    # Argument processing
+    _ca(iterations, 'iterations', int)
+    _ca(dim, 'dim', int, (2, 3))
+    _ca(initial_layout, 'initial_layout', str, ('phyllotaxis', 'spectral'))
+    force_kwargs = _force_kwargs(
+        use_many_body_force, many_body_force_strength, many_body_force_theta,
+        use_many_body_force_min_distance, many_body_force_min_distance,
+        use_many_body_force_max_distance, many_body_force_max_distance,
+        use_links_force, links_force_distance, links_force_strength,
+        use_collision_force, collision_force_radius, collision_force_strength,
+        use_x_positioning_force, x_positioning_force_strength,
+        use_y_positioning_force, y_positioning_force_strength,
+        use_z_positioning_force, z_positioning_force_strength, use_centering_force, seed)
+
+    # Transformation
+    def layout_function(topology):
+        if initial_layout == 'spectral':
+            from . import _spectral
+
+            positions = _spectral.spectral_positions(
+                topology.num_nodes, topology.sources, topology.targets, dim,
+                links_force_distance, seed=seed)
+        else:
+            positions = _force.initial_positions(topology.num_nodes, dim)
+        positions[topology.fixed] = topology.given_positions[topology.fixed]
+        return _force.simulate(positions, topology.fixed, topology.sources, topology.targets,
+                               iterations, **force_kwargs)
+
+    return _internal.apply_layout(data, layout_function, dim)
+
+
+def multilevel(data, iterations=300, refinement_iterations=50, coarsest_size=50, dim=2,
+               use_many_body_force=True, many_body_force_strength=-70.0,
+               many_body_force_theta=0.9,
+               use_many_body_force_min_distance=False, many_body_force_min_distance=10.0,
+               use_many_body_force_max_distance=False, many_body_force_max_distance=1000.0,
+               use_links_force=True, links_force_distance=50.0, links_force_strength=0.5,
+               use_collision_force=False, collision_force_radius=25.0,
+               collision_force_strength=0.7,
+               use_x_positioning_force=False, x_positioning_force_strength=0.2,
+               use_y_positioning_force=False, y_positioning_force_strength=0.2,
+               use_z_positioning_force=False, z_positioning_force_strength=0.2,
+               use_centering_force=True, seed=None):
+    """Calculate a force-directed layout by coarsening the graph and refining it again.
+
+    The graph is coarsened step by step, where each step merges pairs of neighbouring
+    nodes into one heavier node, until it has at most ``coarsest_size`` nodes. Only this
+    small graph is laid out with a full simulation of ``iterations`` steps. Then each
+    finer graph starts from the positions of the coarser one and is refined with a short
+    simulation of ``refinement_iterations`` steps. Since every level has only a fraction
+    of the nodes of the previous one, the run time grows nearly linearly with the size
+    of the graph. Large graphs get a considerably better global structure than with
+    :func:`force_directed` in less time, because the simulation of d3-force untangles
+    them only slowly.
+
+    Parameters
+    ----------
+    data : str, dict, graph object, list
+        Graph data in any form accepted by :func:`~gravis.d3`.
+    iterations : int
+        Number of simulation steps for the coarsest graph.
+    refinement_iterations : int
+        Number of simulation steps for each finer graph.
+    coarsest_size : int
+        Coarsening stops once the graph has at most this many nodes. It also stops
+        earlier if a step hardly reduces the graph anymore.
+    dim : int
+        Number of dimensions, 2 for "x" and "y" or 3 for "x", "y" and "z".
+    use_many_body_force, many_body_force_strength, many_body_force_theta,
+    use_many_body_force_min_distance, many_body_force_min_distance,
+    use_many_body_force_max_distance, many_body_force_max_distance,
+    use_links_force, links_force_distance, links_force_strength,
+    use_collision_force, collision_force_radius, collision_force_strength,
+    use_x_positioning_force, x_positioning_force_strength,
+    use_y_positioning_force, y_positioning_force_strength,
+    use_z_positioning_force, z_positioning_force_strength, use_centering_force :
+        Forces of the simulation with the same meaning as in :func:`~gravis.d3` and
+        :func:`~gravis.three`. The z positioning force is only used in 3D.
+        On coarser levels, the many-body force of a node grows with its number of
+        merged nodes and link distances and collision radii grow with their extent.
+        The collision force requires SciPy.
+    seed : int, optional
+        Seed for the random choices of the coarsening and the refinement.
+
+    Returns
+    -------
+    data : dict
+        A dict adhering to gJGF with "x" and "y", and "z" in 3D, in the metadata of each
+        node.
+
+    """
+    from . import _multilevel
+
+    # Argument processing
+    _ca(iterations, 'iterations', int)
+    _ca(refinement_iterations, 'refinement_iterations', int)
+    _ca(coarsest_size, 'coarsest_size', int)
+    _ca(dim, 'dim', int, (2, 3))
+    force_kwargs = _force_kwargs(
+        use_many_body_force, many_body_force_strength, many_body_force_theta,
+        use_many_body_force_min_distance, many_body_force_min_distance,
+        use_many_body_force_max_distance, many_body_force_max_distance,
+        use_links_force, links_force_distance, links_force_strength,
+        use_collision_force, collision_force_radius, collision_force_strength,
+        use_x_positioning_force, x_positioning_force_strength,
+        use_y_positioning_force, y_positioning_force_strength,
+        use_z_positioning_force, z_positioning_force_strength, use_centering_force, seed)
+
+    # Transformation
+    def layout_function(topology):
+        return _multilevel.simulate(
+            topology.given_positions, topology.fixed, topology.sources, topology.targets,
+            iterations, refinement_iterations, coarsest_size, **force_kwargs)
+
+    return _internal.apply_layout(data, layout_function, dim)
+
+
+def spectral(data, dim=2, node_distance=50.0, method='auto', seed=None):
+    """Calculate a spectral layout from eigenvectors of the graph Laplacian.
+
+    The coordinates of the nodes are the eigenvectors of the normalized Laplacian for the
+    smallest nonzero eigenvalues. Neighbouring nodes get similar coordinates, which
+    shows the large-scale structure of the graph, e.g. an untangled grid. The Laplacian
+    is a SciPy sparse matrix and the eigenvectors are found by iterative eigensolvers
+    that need one sparse matrix product per step, so that the run time grows with the
+    number of edges. Each connected component is laid out separately and the components
+    are placed next to each other.
+
+    The result can be used as it is or as start positions of a force-directed layout,
+    see the argument ``initial_layout`` of :func:`force_directed`. Directions of edges
+    are ignored and nodes with given positions are moved to them afterwards.
+
+    Parameters
+    ----------
+    data : str, dict, graph object, list
+        Graph data in any form accepted by :func:`~gravis.d3`.
+    dim : int
+        Number of dimensions, 2 for "x" and "y" or 3 for "x", "y" and "z".
+    node_distance : int, float
+        Typical distance between neighbouring nodes, which determines the size of the
+        layout. The default is the default link distance of :func:`~gravis.d3`.
+    method : str
+        Eigensolver for the connected components of the graph.
+
+        - "auto": "dense" for components with up to 500 nodes, otherwise "arpack".
+        - "arpack": Implicitly restarted Lanczos method of ARPACK. If it does not
+          converge, LOBPCG is used instead.
+        - "lobpcg": Locally optimal block preconditioned conjugate gradient method.
+        - "dense": Full eigendecomposition with NumPy, only sensible for small graphs.
+    seed : int, optional
+        Seed for the start vectors of the eigensolvers.
+
+    Returns
+    -------
+    data : dict
+        A dict adhering to gJGF with "x" and "y", and "z" in 3D, in the metadata of each
+        node.
+
+    """
+    from . import _spectral
+
+    # Argument processing
+    _ca(dim, 'dim', int, (2, 3))
+    _ca(node_distance, 'node_distance', (int, float))
+    _ca(method, 'method', str, ('auto', 'arpack', 'lobpcg', 'dense'))
+    _ca(seed, 'seed', int, allow_none=True)
+
+    # Transformation
+    def layout_function(topology):
+        positions = _spectral.spectral_positions(
+            topology.num_nodes, topology.sources, topology.targets, dim, node_distance,
+            method, seed)
+        positions[topology.fixed] = topology.given_positions[topology.fixed]
+        return positions
+
+    return _internal.apply_layout(data, layout_function, dim)
+
+
+def _cached_force_directed(graphs, cache, dim=2, **force_arguments):
+    """Lay out normalized graphs like :func:`force_directed`, reusing cached positions.
+
+    This is used by :func:`~gravis.d3` and :func:`~gravis.three` for their argument
+    ``layout_cache``, with the force arguments of the plot, so that the result resembles
+    the layout the browser would calculate. Forces that a plot does not offer, e.g. the
+    collision force in :func:`~gravis.three`, are not used.
+
+    """
+    from . import _force
+
+    if isinstance(cache, str):
+        cache = LayoutCache(cache)
+    iterations = 300
+    arguments = dict(
+        use_collision_force=False, collision_force_radius=25.0, collision_force_strength=0.7,
+        use_z_positioning_force=False, z_positioning_force_strength=0.2)
+    arguments.update(force_arguments)
+    force_kwargs = _force_kwargs(seed=0, **arguments)
+    cache_parameters = dict(force_arguments, function='force_directed', iterations=iterations,
+                            dim=dim)
+
+    def layout_function(topology):
+        positions = _force.initial_positions(topology.num_nodes, dim)
+        positions[topology.fixed] = topology.given_positions[topology.fixed]
+        return _force.simulate(positions, topology.fixed, topology.sources, topology.targets,
+                               iterations, **force_kwargs)
+
+    return _internal.layout_graphs(graphs, layout_function, dim, cache, cache_parameters)
+
+
+def _force_kwargs(use_many_body_force, many_body_force_strength, many_body_force_theta,
+                  use_many_body_force_min_distance, many_body_force_min_distance,
+                  use_many_body_force_max_distance, many_body_force_max_distance,
+                  use_links_force, links_force_distance, links_force_strength,
+                  use_collision_force, collision_force_radius, collision_force_strength,
+                  use_x_positioning_force, x_positioning_force_strength,
+                  use_y_positioning_force, y_positioning_force_strength,
+                  use_z_positioning_force, z_positioning_force_strength,
+                  use_centering_force, seed):
+    """Check the force arguments of a layout function and convert them for the simulation."""
+    _ca(use_many_body_force, 'use_many_body_force', bool)
+    _ca(many_body_force_strength, 'many_body_force_strength', (int, float))
+    _ca(many_body_force_theta, 'many_body_force_theta', (int, float))
+    _ca(use_many_body_force_min_distance, 'use_many_body_force_min_distance', bool)
+    _ca(many_body_force_min_distance, 'many_body_force_min_distance', (int, float))
+    _ca(use_many_body_force_max_distance, 'use_many_body_force_max_distance', bool)
+    _ca(many_body_force_max_distance, 'many_body_force_max_distance', (int, float))
+    _ca(use_links_force, 'use_links_force', bool)
+    _ca(links_force_distance, 'links_force_distance', (int, float))
+    _ca(links_force_strength, 'links_force_strength', (int, float))
+    _ca(use_collision_force, 'use_collision_force', bool)
+    _ca(collision_force_radius, 'collision_force_radius', (int, float))
+    _ca(collision_force_strength, 'collision_force_strength', (int, float))
+    _ca(use_x_positioning_force, 'use_x_positioning_force', bool)
+    _ca(x_positioning_force_strength, 'x_positioning_force_strength', (int, float))
+    _ca(use_y_positioning_force, 'use_y_positioning_force', bool)
+    _ca(y_positioning_force_strength, 'y_positioning_force_strength', (int, float))
+    _ca(use_z_positioning_force, 'use_z_positioning_force', bool)
+    _ca(z_positioning_force_strength, 'z_positioning_force_strength', (int, float))
+    _ca(use_centering_force, 'use_centering_force', bool)
+    _ca(seed, 'seed', int, allow_none=True)
+    return dict(
+        many_body_strength=many_body_force_strength if use_many_body_force else None,
+        theta=many_body_force_theta,
+        min_distance=many_body_force_min_distance if use_many_body_force_min_distance else 0.0,
+        max_distance=(many_body_force_max_distance if use_many_body_force_max_distance
+                      else float('inf')),
+        links_distance=links_force_distance,
+        links_strength=links_force_strength if use_links_force else None,
+        collision_radius=collision_force_radius if use_collision_force else None,
+        collision_strength=collision_force_strength,
+        positioning_strengths=[
+            x_positioning_force_strength if use_x_positioning_force else None,
+            y_positioning_force_strength if use_y_positioning_force else None,
+            z_positioning_force_strength if use_z_positioning_force else None],
+        centering=use_centering_force,
+        seed=seed,
+    )
@@ -1,11 +1,18 @@
 """A subpackage containing plotting functions."""
 
 __all__ = [
+    'RenderPool',
     'd3',
+    'export_html_many',
+    'export_many',
+    'init_notebook_mode',
     'three',
     'vis',
 ]
 
 from .d3 import d3
+from .export import export_html_many, export_many
+from .notebook import init_notebook_mode
+from .rendering import RenderPool
 from .three import three
 from .vis import vis
@@ -34,7 +34,8 @@ def d3(data,
        collision_force_strength=0.7,
        use_x_positioning_force=False, x_positioning_force_strength=0.2,
        use_y_positioning_force=False, y_positioning_force_strength=0.2,
-       use_centering_force=True):
+       use_centering_force=True,
+       workers=None, binary_data=False, layout_cache=None):
     """Create an interactive graph visualization with HTML/CSS/JS based on d3.v7.js.
 
     Parameters
@@ -46,7 +47,8 @@ def d3(data,
         It can be provided in following ways:
 
         - *str*: A string in gJGF, or a filepath to a text file in gJGF.
-        - *dict*: A dict adhering to gJGF.
+        - *dict*: A dict adhering to gJGF. It is not copied but serialized each time the
+          figure is exported, so changes made to it afterwards are visible in the export.
         - *graph object*: An object from a
           :ref:`supported graph library <supported-graph-libraries>`,
           which internally gets converted to gJGF.
@@ -200,6 +202,24 @@ def d3(data,
         This force attracts each node towards the center of the coordinate system at (0, 0)
         to keep the graph in the display area. It may lead to unexpected repulsion effects
         if all nodes are fixed and then a single one is released by dragging it.
+    workers : int, optional
+        If greater than 1 and ``data`` is a list, the graph objects in it are converted
+        to gJGF concurrently by a pool of this many worker processes.
+    binary_data : bool
+        If True, graphs converted from graph objects of external libraries are embedded in
+        the HTML as base64-encoded typed arrays instead of JSON text, with repeated strings
+        stored once in a table. This reduces the size of the HTML and the time the browser
+        needs to parse large graphs. The same holds for graphs from gJGF files of 16 MB or
+        more, which are read incrementally into the same columnar form where possible.
+        Other graphs given in gJGF are still embedded as JSON.
+    layout_cache : :class:`~gravis.layout.LayoutCache` or str, optional
+        A layout cache or the directory of one. If provided, node positions are calculated
+        in Python by the force simulation of :func:`gravis.layout.force_directed` with the
+        force arguments above and embedded as fixed "x" and "y" values, so that the
+        browser shows the final layout right away. A graph with the same node ids, edges
+        and force arguments as an earlier plot gets its positions from the cache instead
+        of calculating them again, even if other data such as colors or labels changed.
+        Requires NumPy.
 
     Returns
     -------
@@ -270,14 +290,39 @@ def d3(data,
     _ca(use_y_positioning_force, 'use_y_positioning_force', bool)
     _ca(y_positioning_force_strength, 'y_positioning_force_strength', (int, float))
     _ca(use_centering_force, 'use_centering_force', bool)
-    data = _internal.normalize_graph_data(data)
+    _ca(workers, 'workers', int, allow_none=True)
+    _ca(binary_data, 'binary_data', bool)
+    data = _internal.normalize_graph_data(data, workers)
+    if layout_cache is not None:
+        from ..layout import layout as _layout
+
+        _ca(layout_cache, 'layout_cache', (str, _layout.LayoutCache))
+        data = _layout._cached_force_directed(
+            data, layout_cache,
+            use_many_body_force=use_many_body_force,
+            many_body_force_strength=many_body_force_strength,
+            many_body_force_theta=many_body_force_theta,
+            use_many_body_force_min_distance=use_many_body_force_min_distance,
+            many_body_force_min_distance=many_body_force_min_distance,
+            use_many_body_force_max_distance=use_many_body_force_max_distance,
+            many_body_force_max_distance=many_body_force_max_distance,
+            use_links_force=use_links_force,
+            links_force_distance=links_force_distance,
+            links_force_strength=links_force_strength,
+            use_collision_force=use_collision_force,
+            collision_force_radius=collision_force_radius,
+            collision_force_strength=collision_force_strength,
+            use_x_positioning_force=use_x_positioning_force,
+            x_positioning_force_strength=x_positioning_force_strength,
+            use_y_positioning_force=use_y_positioning_force,
+            y_positioning_force_strength=y_positioning_force_strength,
+            use_centering_force=use_centering_force)
 
     # Transformation
-    site_template = _ts.load('templates/d3.html')
+    site_template = _ts.load_template('templates/d3.html')
     insert_data = {
-        'DEFINE_D3': _ts.load('third_party/d3/d3.v7.min.def.js'),
-
-        'DATA': _ts.to_json(data),
+        'BINARY_DECODER': _ts.load(_ts.BINARY_DECODER_RESOURCE).strip(),
+        'DATA': _internal.GraphDataJSON(data, binary=binary_data),
         'GRAPH_HEIGHT': _ts.to_json(graph_height),
         'DETAILS_HEIGHT': _ts.to_json(details_height),
         'SHOW_DETAILS': _ts.to_json(show_details),
@@ -346,6 +391,9 @@ def d3(data,
         'Y_POSITIONING_FORCE_STRENGTH': _ts.to_json(y_positioning_force_strength),
         'USE_CENTERING_FORCE': _ts.to_json(use_centering_force),
     }
-    html = _ts.insert(site_template, insert_data)
-    fig = _ds.Figure(html)
+    libraries = {
+        'DEFINE_D3': _ts.LIBRARY_RESOURCES['DEFINE_D3'],
+    }
+    html_template = site_template.fill(insert_data)
+    fig = _ds.Figure(html_template, libraries)
     return fig
@@ -1,18 +1,32 @@
 """Data structures for representing JavaScript plots."""
 
+import os as _os
 import random as _random
 import string as _string
 
 from ..utils import operating_system as _operating_system
-from . import rendering, template_system
+from . import notebook, rendering, template_system
 
 
 class Figure:
     """Data structure for wrapping, displaying and exporting a JavaScript figure."""
 
-    def __init__(self, html_template):
-        """Initialize a figure with a partly filled HTML template containing a visualization."""
+    def __init__(self, html_template, libraries=None):
+        """Initialize a figure with a partly filled HTML template containing a visualization.
+
+        Parameters
+        ----------
+        html_template : str or Template
+        libraries : dict, optional
+            Mapping of placeholder keys to resource paths of javascript libraries. They are
+            inserted when the figure is rendered, either inline or as references to shared
+            asset files.
+
+        """
+        if not isinstance(html_template, template_system.Template):
+            html_template = template_system.Template(html_template)
         self._html_template = html_template
+        self._libraries = libraries if libraries is not None else {}
 
     # IPython integration
     def _repr_html_(self):
@@ -51,54 +65,176 @@ class Figure:
         """Create a HTML text representation."""
         return self.to_html_standalone()
 
-    def to_html_standalone(self):
-        """Create a standalone HTML text representation that has all javascript code embedded."""
+    def to_html_standalone(self, compress=False, asset_url=None):
+        """Create a standalone HTML text representation that has all javascript code embedded.
+
+        Parameters
+        ----------
+        compress : bool
+            If True, the javascript code including the graph data is embedded in
+            gzip-compressed form and inflated by the browser with ``DecompressionStream``,
+            which requires a browser released in 2023 or later.
+        asset_url : str, optional
+            If given, javascript libraries are not embedded but loaded from files whose
+            names are appended to this URL prefix, e.g. "assets/" or
+            "https://example.org/assets/". The files can be created with
+            :meth:`export_assets`.
+
+        """
+        data = self._get_standalone_data(asset_url)
+        if compress:
+            chunks = self._html_template.iter_chunks(data)
+            return ''.join(template_system.iter_compressed_scripts(chunks))
+        html_text = self._html_template.render(data)
+        return html_text
+
+    def to_html_partial(self):
+        """Create a dependent HTML text representation that loads javascript with require.js.
+
+        Libraries that were loaded into a Jupyter notebook by
+        :func:`~gravis.init_notebook_mode` in the current kernel session are not included.
+
+        """
+        html_text = self._html_template.render(self._get_partial_data())
+        return html_text
+
+    def write_html(self, file_handle, compress=False, asset_url=None):
+        """Write the standalone HTML text representation chunk by chunk to a file handle.
+
+        The text is the same as the one of :meth:`to_html_standalone`, but it is never
+        fully held in memory. Graph data is serialized in parts while it is written.
+
+        Parameters
+        ----------
+        file_handle : file-like object
+            A text stream opened for writing, e.g. by ``open(filepath, 'w')``.
+        compress : bool
+            If True, the javascript code is embedded in compressed form, see
+            :meth:`to_html_standalone`.
+        asset_url : str, optional
+            If given, javascript libraries are loaded from files with this URL prefix, see
+            :meth:`to_html_standalone`.
+
+        """
+        chunks = self._html_template.iter_chunks(self._get_standalone_data(asset_url))
+        if compress:
+            chunks = template_system.iter_compressed_scripts(chunks)
+        for chunk in chunks:
+            file_handle.write(chunk)
+
+    def _get_standalone_data(self, asset_url=None):
+        if asset_url is None:
+            script_tags = ''
+        else:
+            script_tags = ''.join(
+                '  <script src="{}{}" charset="utf-8"></script>\n'.format(
+                    asset_url, template_system.asset_filename(resource_path))
+                for resource_path in self._get_resource_paths())
         data = {
             'RANDOM_ID': self._generate_random_id(),
             'PREFIX': """<!DOCTYPE html>
 <html>
 <head>
   <meta charset="utf-8">
-</head>
-<body style="margin:0;">""",
-            'LOAD_REQUIRE': template_system.load('third_party/require/require.min.js'),
+{}</head>
+<body style="margin:0;">""".format(script_tags),
             'SUFFIX': """</body>
 </html>""",
         }
-        html_text = template_system.insert(self._html_template, data)
-        return html_text
+        data.update(self._get_library_data(inline=asset_url is None))
+        return data
 
-    def to_html_partial(self):
-        """Create a dependent HTML text representation that loads javascript with require.js."""
+    def _get_partial_data(self):
         data = {
             'RANDOM_ID': self._generate_random_id(),
             'PREFIX': '',
-            'LOAD_REQUIRE': template_system.load('third_party/require/require.min.js'),
             'SUFFIX': '',
         }
-        html_text = template_system.insert(self._html_template, data)
-        return html_text
+        data.update(self._get_library_data(inline=True, skip_notebook_libraries=True))
+        return data
 
-    def to_jpg(self, webdriver='chrome', capture_delay=3.5):
-        """Create a JPEG text representation with base64 text encoding the binary data."""
-        html_text = self.to_html()
-        jpg_data = rendering.render_and_capture(html_text, 'jpg', webdriver, capture_delay)
+    def _get_library_data(self, inline, skip_notebook_libraries=False):
+        """Get the code of require.js and all libraries, or empty text if loaded otherwise."""
+        data = {'LOAD_REQUIRE': template_system.REQUIRE_RESOURCE}
+        data.update(self._libraries)
+        for key, resource_path in data.items():
+            if inline and not (skip_notebook_libraries and notebook.is_loaded(resource_path)):
+                data[key] = template_system.load(resource_path)
+            else:
+                data[key] = ''
+        return data
+
+    def _get_resource_paths(self):
+        return [template_system.REQUIRE_RESOURCE] + list(self._libraries.values())
+
+    def export_assets(self, directory):
+        """Write the javascript libraries of the plot as files to a directory.
+
+        The filenames contain a hash of the content. Files that already exist are not
+        written again, so that many figures can share the same directory.
+
+        Parameters
+        ----------
+        directory : str
+            Directory for the library files. It is created if it does not exist.
+
+        Returns
+        -------
+        filepaths : list of str
+
+        """
+        _os.makedirs(directory, exist_ok=True)
+        filepaths = []
+        for resource_path in self._get_resource_paths():
+            filepath = _os.path.join(directory, template_system.asset_filename(resource_path))
+            if not _operating_system.is_nonempty_file(filepath):
+                # Written under a temporary name first, so that no partial file is visible
+                temp_filepath = '{}.{}.tmp'.format(filepath, _os.getpid())
+                with open(temp_filepath, 'w', encoding='utf-8') as file_handle:
+                    file_handle.write(template_system.load(resource_path))
+                _os.replace(temp_filepath, filepath)
+            filepaths.append(filepath)
+        return filepaths
+
+    def to_jpg(self, webdriver='chrome', capture_delay=3.5, render_pool=None):
+        """Create a JPEG text representation with base64 text encoding the binary data.
+
+        If a :class:`~gravis.RenderPool` is given, one of its browsers is used instead of
+        starting a new one, and ``webdriver`` is ignored.
+
+        """
+        jpg_data = self._render('jpg', webdriver, capture_delay, render_pool)
         return jpg_data
 
-    def to_png(self, webdriver='chrome', capture_delay=3.5):
-        """Create a PNG text representation with base64 text encoding the binary data."""
-        html_text = self.to_html()
-        png_data = rendering.render_and_capture(html_text, 'png', webdriver, capture_delay)
+    def to_png(self, webdriver='chrome', capture_delay=3.5, render_pool=None):
+        """Create a PNG text representation with base64 text encoding the binary data.
+
+        If a :class:`~gravis.RenderPool` is given, one of its browsers is used instead of
+        starting a new one, and ``webdriver`` is ignored.
+
+        """
+        png_data = self._render('png', webdriver, capture_delay, render_pool)
         return png_data
 
-    def to_svg(self, webdriver='chrome', capture_delay=3.5):
-        """Create a SVG text representation."""
-        html_text = self.to_html()
-        svg_text = rendering.render_and_capture(html_text, 'svg', webdriver, capture_delay)
+    def to_svg(self, webdriver='chrome', capture_delay=3.5, render_pool=None):
+        """Create a SVG text representation.
+
+        If a :class:`~gravis.RenderPool` is given, one of its browsers is used instead of
+        starting a new one, and ``webdriver`` is ignored.
+
+        """
+        svg_text = self._render('svg', webdriver, capture_delay, render_pool)
         return svg_text
 
+    def _render(self, data_format, webdriver, capture_delay, render_pool):
+        html_text = self.to_html()
+        if render_pool is None:
+            return rendering.render_and_capture(html_text, data_format, webdriver, capture_delay)
+        return render_pool.render(html_text, data_format, capture_delay)
+
     # Export as HTML file
-    def export_html(self, filepath, overwrite=False):
+    def export_html(self, filepath, overwrite=False, compress=False, asset_dir=None,
+                    asset_url=None):
         """Export the plot as HTML file.
 
         Parameters
@@ -107,6 +243,19 @@ class Figure:
             Filepath for the generated HTML file.
         overwrite : bool
             If True, overwrite the file if it already exists.
+        compress : bool
+            If True, the javascript code including the graph data is embedded in
+            gzip-compressed form, which makes the file several times smaller. It is
+            inflated by the browser with ``DecompressionStream``.
+        asset_dir : str, optional
+            If given, the javascript libraries are written once as separate files to this
+            directory, see :meth:`export_assets`, and the HTML file loads them by their
+            path relative to it. This avoids duplicated library code when many figures
+            are exported to the same place.
+        asset_url : str, optional
+            If given, the HTML file loads the javascript libraries from files with this URL
+            prefix instead of embedding them. Combined with ``asset_dir``, the files are
+            written to the directory but referenced by the URL prefix.
 
         Raises
         ------
@@ -119,11 +268,17 @@ class Figure:
             _operating_system.is_file(filepath, raise_exception=True)
 
         # Transformation
+        if asset_dir is not None:
+            self.export_assets(asset_dir)
+            if asset_url is None:
+                html_dir = _os.path.dirname(_os.path.abspath(filepath))
+                relative_path = _os.path.relpath(_os.path.abspath(asset_dir), html_dir)
+                asset_url = relative_path.replace(_os.sep, '/') + '/'
         with open(filepath, 'w') as file_handle:
-            html_text = self.to_html()
-            file_handle.write(html_text)
+            self.write_html(file_handle, compress, asset_url)
 
-    def export_svg(self, filepath, overwrite=False, webdriver='chrome', capture_delay=3.5):
+    def export_svg(self, filepath, overwrite=False, webdriver='chrome', capture_delay=3.5,
+                   render_pool=None):
         """Export the plot as SVG file.
 
         Parameters
@@ -132,6 +287,16 @@ class Figure:
             Filepath for the generated SVG file.
         overwrite : bool
             If True, overwrite the file if it already exists.
+        webdriver : str
+            Available options: "chrome", "firefox"
+        capture_delay : float
+            Maximum time in seconds between loading the plot in the browser and capturing
+            it. The image is captured earlier if the plot signals that its layout is
+            finished, so that small graphs are exported quickly. Without that signal,
+            e.g. if the plot failed, the image is captured after the full time.
+        render_pool : :class:`~gravis.RenderPool`, optional
+            If given, one of its already running browsers is used and ``webdriver`` is
+            ignored, which saves the startup time of a browser when exporting many plots.
 
         Raises
         ------
@@ -145,10 +310,11 @@ class Figure:
 
         # Transformation
         with open(filepath, 'w') as file_handle:
-            svg_text = self.to_svg(webdriver, capture_delay)
+            svg_text = self.to_svg(webdriver, capture_delay, render_pool)
             file_handle.write(svg_text)
 
-    def export_png(self, filepath, overwrite=False, webdriver='chrome', capture_delay=3.5):
+    def export_png(self, filepath, overwrite=False, webdriver='chrome', capture_delay=3.5,
+                   render_pool=None):
         """Export the plot as PNG file.
 
         Parameters
@@ -157,6 +323,16 @@ class Figure:
             Filepath for the generated PNG file.
         overwrite : bool
             If True, overwrite the file if it already exists.
+        webdriver : str
+            Available options: "chrome", "firefox"
+        capture_delay : float
+            Maximum time in seconds between loading the plot in the browser and capturing
+            it. The image is captured earlier if the plot signals that its layout is
+            finished, so that small graphs are exported quickly. Without that signal,
+            e.g. if the plot failed, the image is captured after the full time.
+        render_pool : :class:`~gravis.RenderPool`, optional
+            If given, one of its already running browsers is used and ``webdriver`` is
+            ignored, which saves the startup time of a browser when exporting many plots.
 
         Raises
         ------
@@ -170,10 +346,11 @@ class Figure:
 
         # Transformation
         with open(filepath, 'wb') as file_handle:
-            png_text = self.to_png(webdriver, capture_delay)
+            png_text = self.to_png(webdriver, capture_delay, render_pool)
             file_handle.write(png_text)
 
-    def export_jpg(self, filepath, overwrite=False, webdriver='chrome', capture_delay=3.5):
+    def export_jpg(self, filepath, overwrite=False, webdriver='chrome', capture_delay=3.5,
+                   render_pool=None):
         """Export the plot as JPEG file.
 
         Parameters
@@ -182,6 +359,16 @@ class Figure:
             Filepath for the generated JPEG file.
         overwrite : bool
             If True, overwrite the file if it already exists.
+        webdriver : str
+            Available options: "chrome", "firefox"
+        capture_delay : float
+            Maximum time in seconds between loading the plot in the browser and capturing
+            it. The image is captured earlier if the plot signals that its layout is
+            finished, so that small graphs are exported quickly. Without that signal,
+            e.g. if the plot failed, the image is captured after the full time.
+        render_pool : :class:`~gravis.RenderPool`, optional
+            If given, one of its already running browsers is used and ``webdriver`` is
+            ignored, which saves the startup time of a browser when exporting many plots.
 
         Raises
         ------
@@ -195,7 +382,7 @@ class Figure:
 
         # Transformation
         with open(filepath, 'wb') as file_handle:
-            jpg_text = self.to_jpg(webdriver, capture_delay)
+            jpg_text = self.to_jpg(webdriver, capture_delay, render_pool)
             file_handle.write(jpg_text)
 
     @staticmethod
@@ -0,0 +1,196 @@
+"""Export of many figures at once."""
+
+import os as _os
+import time as _time
+
+from ..utils.args import check_arg as _ca
+from . import data_structures as _ds
+from . import rendering as _rendering
+
+
+def export_html_many(figures, directory, overwrite=False, compress=False, asset_dir='assets',
+                     asset_url=None):
+    """Export many figures as HTML files that share a single copy of the javascript libraries.
+
+    Each library is written only once to an asset directory and all HTML files load it
+    from there, instead of every file embedding its own copy of it.
+
+    Parameters
+    ----------
+    figures : list or dict
+        Figures created by :func:`~gravis.d3`, :func:`~gravis.vis` or :func:`~gravis.three`.
+        A dict maps filenames to figures. A list leads to the filenames "figure_1.html",
+        "figure_2.html" and so on, with zero-padded numbers if there are more than nine.
+    directory : str
+        Directory for the HTML files. It is created if it does not exist.
+    overwrite : bool
+        If True, overwrite HTML files that already exist.
+    compress : bool
+        If True, the code and data of each figure are embedded in compressed form, see
+        ``to_html_standalone`` of :ref:`Figure <figure>`.
+    asset_dir : str
+        Directory for the library files, relative to ``directory`` or absolute.
+    asset_url : str, optional
+        If given, the HTML files load the libraries from this URL prefix instead of a path
+        relative to them, e.g. if the asset directory is published on another server.
+
+    Returns
+    -------
+    filepaths : list of str
+        Filepaths of the generated HTML files in the order of the given figures.
+
+    Raises
+    ------
+    FileExistsError
+        If overwrite=False and there is already a file at one of the filepaths.
+
+    """
+    # Argument processing
+    _ca(figures, 'figures', (list, tuple, dict))
+    _ca(directory, 'directory', str)
+    _ca(overwrite, 'overwrite', bool)
+    _ca(compress, 'compress', bool)
+    _ca(asset_dir, 'asset_dir', str)
+    _ca(asset_url, 'asset_url', str, allow_none=True)
+    if isinstance(figures, dict):
+        named_figures = list(figures.items())
+    else:
+        num_digits = len(str(len(figures)))
+        named_figures = [('figure_{}.html'.format(str(idx).zfill(num_digits)), fig)
+                         for idx, fig in enumerate(figures, 1)]
+    for filename, fig in named_figures:
+        _ca(fig, 'figures', _ds.Figure)
+        _ca(filename, 'filename', str)
+
+    # Transformation
+    _os.makedirs(directory, exist_ok=True)
+    asset_dir = _os.path.join(directory, asset_dir)
+    filepaths = []
+    for filename, fig in named_figures:
+        filepath = _os.path.join(directory, filename)
+        fig.export_html(filepath, overwrite, compress, asset_dir, asset_url)
+        filepaths.append(filepath)
+    return filepaths
+
+
+def export_many(figures, fmt='png', out_dir='.', workers=1, overwrite=False,
+                plot_function=None, webdriver='chrome', capture_delay=3.5, max_renders=100,
+                callback=None):
+    """Export many figures or graphs as static images with several browsers in parallel.
+
+    The jobs are distributed over a :class:`~gravis.RenderPool` of ``workers`` headless
+    browsers that stay alive between jobs. Each image is written to disk as soon as it is
+    rendered, first under a temporary name and then renamed, so that an interrupted run
+    leaves no partial files. Running the same export again skips all images that already
+    exist, which makes a batch export resumable.
+
+    Parameters
+    ----------
+    figures : list or dict
+        Figures created by :func:`~gravis.d3`, :func:`~gravis.vis` or :func:`~gravis.three`,
+        or graph data in any format accepted by them, e.g. gJGF dicts. Graph data is
+        turned into a figure only when its job runs. A dict maps filenames to figures.
+        A list leads to the filenames "figure_1.png", "figure_2.png" and so on, with
+        zero-padded numbers if there are more than nine.
+    fmt : str
+        Available options: "png", "jpg", "svg"
+    out_dir : str
+        Directory for the image files. It is created if it does not exist.
+    workers : int
+        Number of browsers that render images at the same time.
+    overwrite : bool
+        If True, render all images again, otherwise skip those that already exist.
+    plot_function : callable, optional
+        Function that creates a figure from graph data, by default :func:`~gravis.d3`.
+        Arguments can be bound with :func:`functools.partial`.
+    webdriver : str
+        Available options: "chrome", "firefox"
+    capture_delay : float
+        Maximum time in seconds between loading a plot and capturing it, see
+        ``export_png`` of :ref:`Figure <figure>`.
+    max_renders : int
+        Number of images after which a browser is replaced by a new one.
+    callback : callable, optional
+        Function that is called with the report of each job as soon as it is finished,
+        e.g. to show progress.
+
+    Returns
+    -------
+    reports : list of dict
+        One report per job in the order of the given figures. It contains the keys
+        "filepath", "status" with the value "done", "skipped" or "failed", "seconds"
+        with the time spent on the job and "error" with a message if it failed.
+
+    """
+    import concurrent.futures
+
+    # Argument processing
+    _ca(figures, 'figures', (list, tuple, dict))
+    _ca(fmt, 'fmt', str, ['png', 'jpg', 'svg'])
+    _ca(out_dir, 'out_dir', str)
+    _ca(workers, 'workers', int)
+    _ca(overwrite, 'overwrite', bool)
+    _ca(max_renders, 'max_renders', int)
+    if workers < 1:
+        raise ValueError('Argument "workers" needs to be at least 1.')
+    if plot_function is None:
+        from .d3 import d3 as plot_function
+    if isinstance(figures, dict):
+        named_figures = list(figures.items())
+    else:
+        num_digits = len(str(len(figures)))
+        named_figures = [('figure_{}.{}'.format(str(idx).zfill(num_digits), fmt), fig)
+                         for idx, fig in enumerate(figures, 1)]
+    for filename, _ in named_figures:
+        _ca(filename, 'filename', str)
+
+    # Functions
+    def export(pool, filepath, fig):
+        start = _time.perf_counter()
+        report = {'filepath': filepath, 'status': 'done', 'seconds': 0.0, 'error': None}
+        try:
+            if not isinstance(fig, _ds.Figure):
+                fig = plot_function(fig)
+            image = pool.render(fig.to_html(), fmt, capture_delay)
+            # Written under a temporary name first, so that no partial file is visible
+            temp_filepath = '{}.{}.tmp'.format(filepath, _os.getpid())
+            try:
+                if fmt == 'svg':
+                    with open(temp_filepath, 'w', encoding='utf-8') as file_handle:
+                        file_handle.write(image)
+                else:
+                    with open(temp_filepath, 'wb') as file_handle:
+                        file_handle.write(image)
+                _os.replace(temp_filepath, filepath)
+            finally:
+                if _os.path.exists(temp_filepath):
+                    _os.remove(temp_filepath)
+        except Exception as exc:
+            report['status'] = 'failed'
+            report['error'] = '{}: {}'.format(exc.__class__.__name__, exc)
+        report['seconds'] = _time.perf_counter() - start
+        return report
+
+    # Transformation
+    _os.makedirs(out_dir, exist_ok=True)
+    reports = [None] * len(named_figures)
+    with _rendering.RenderPool(workers, webdriver, max_renders) as pool:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            future_to_index = {}
+            for idx, (filename, fig) in enumerate(named_figures):
+                filepath = _os.path.join(out_dir, filename)
+                if not overwrite and _os.path.isfile(filepath):
+                    reports[idx] = {
+                        'filepath': filepath, 'status': 'skipped', 'seconds': 0.0,
+                        'error': None}
+                    if callback is not None:
+                        callback(reports[idx])
+                else:
+                    future = executor.submit(export, pool, filepath, fig)
+                    future_to_index[future] = idx
+            for future in concurrent.futures.as_completed(future_to_index):
+                report = future.result()
+                reports[future_to_index[future]] = report
+                if callback is not None:
+                    callback(report)
+    return reports
@@ -0,0 +1,51 @@
+"""Loading of javascript libraries into a Jupyter notebook once per kernel session."""
+
+from . import template_system as _ts
+
+
+# Content hashes of the libraries that were loaded into the notebook of this kernel session
+_LOADED_HASHES = set()
+
+
+def init_notebook_mode():
+    """Load all javascript libraries of gravis once into the current Jupyter notebook.
+
+    The libraries are shown as output of the cell in which this function is called.
+    Afterwards, figures displayed in the notebook no longer carry their own copy of the
+    libraries, which keeps notebooks with many figures small and fast to open and save.
+    Each library is identified by a hash of its content, so that a figure still embeds
+    a library if it differs from the loaded version.
+
+    Figures wait for the libraries, so that the order of the cell outputs is irrelevant
+    when a saved notebook is opened again. If the output of this function was cleared,
+    figures show a note instead and the function needs to be called again.
+
+    """
+    import IPython
+
+    html_text = get_bootstrap_html()
+    IPython.display.display(IPython.display.HTML(html_text))
+    for resource_path in [_ts.REQUIRE_RESOURCE] + list(_ts.LIBRARY_RESOURCES.values()):
+        _LOADED_HASHES.add(_ts.resource_hash(resource_path))
+
+
+def get_bootstrap_html():
+    """Get an HTML script element that defines require.js and all libraries."""
+    library_code = '\n'.join(
+        _ts.load(resource_path) for resource_path in _ts.LIBRARY_RESOURCES.values())
+    return """<script charset="utf-8" type="text/javascript">
+  if(typeof(require) === "undefined"){{
+    {}
+  }}
+  {}
+</script>""".format(_ts.load(_ts.REQUIRE_RESOURCE), library_code)
+
+
+def is_loaded(resource_path):
+    """Check if a library was loaded by :func:`init_notebook_mode` in this kernel session."""
+    return _ts.resource_hash(resource_path) in _LOADED_HASHES
+
+
+def reset():
+    """Forget which libraries were loaded, so that figures embed all of them again."""
+    _LOADED_HASHES.clear()
@@ -1,7 +1,6 @@
 """Rendering the HTML visualization to get static images."""
 
 import os
-import time
 
 from ..utils.args import check_arg
 
@@ -9,10 +8,14 @@ from ..utils.args import check_arg
 def render_and_capture(html_text, data_format='png', webdriver='chrome',
                        capture_delay=1.0, start_delay=0.1, stop_delay_fast=0.25,
                        stop_delay_slow=10.0):
-    """Open a HTML visualization with Selenium and export the drawing area as SVG, PNG or JPG."""
+    """Open a HTML visualization with Selenium and export the drawing area as SVG, PNG or JPG.
+
+    The image is captured as soon as the plot signals that its layout is finished, or after
+    ``capture_delay`` seconds if that happens earlier, see :func:`wait_until_ready`.
+
+    """
     import http.server
     import random
-    import tempfile
     import threading
 
     # Argument processing
@@ -27,13 +30,16 @@ def render_and_capture(html_text, data_format='png', webdriver='chrome',
 
     # Functions
     def open_browser_and_stop_server(results):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            driver = create_driver(tmpdir)
+        driver = create_driver()
+        try:
             driver.get(url)
-            time.sleep(capture_delay)
-            image = capture_image_by_click(data_format, driver, tmpdir)
+            wait_until_ready(driver, capture_delay)
+            image = capture_image(data_format, driver)
             results.append(image)
-            driver.close()
+        except Exception as exc:
+            results.append(exc)
+        finally:
+            driver.quit()
         # Start thread 2: Stop the server slowly, even if no GET request is ever received
         timer_stop_slow.start()
 
@@ -89,30 +95,256 @@ def render_and_capture(html_text, data_format='png', webdriver='chrome',
     timer_run.join()
     try:
         image = results[0]
-        assert image is not None
+        assert image is not None and not isinstance(image, Exception)
     except Exception:
         msg = (
             'An error occurred while rendering the HTML text with Selenium and '
             'trying to capture an image in {} format. This can have various reasons '
             'that are not easy to detect and report, sorry!'.format(data_format))
+        if results and isinstance(results[0], Exception):
+            msg += ' Cause: {}: {}'.format(results[0].__class__.__name__, results[0])
         raise ValueError(msg)
     return image
 
 
-def create_chrome_driver(directory, headless=True):
-    """Create a Chrome driver instance suitable for downloading files and headless by default."""
+class RenderPool:
+    """Pool of headless browsers that are kept alive for rendering many static images.
+
+    Starting a browser takes a few seconds, which usually dominates the time needed for
+    exporting a figure as image. A pool starts up to ``size`` browsers when they are first
+    needed and reuses them for later jobs. Each browser is replaced by a fresh one after
+    ``max_renders`` images or as soon as a job fails with it. All jobs share a single
+    local webserver that serves their HTML texts.
+
+    A pool can be used from several threads at once, each job occupying one browser.
+
+    Examples
+    --------
+    >>> with gv.RenderPool(size=2) as pool:
+    ...     for idx, fig in enumerate(figures):
+    ...         fig.export_png('figure_{}.png'.format(idx), render_pool=pool)
+
+    """
+
+    def __init__(self, size=1, webdriver='chrome', max_renders=100):
+        """Initialize a pool without starting any browser yet.
+
+        Parameters
+        ----------
+        size : int
+            Maximum number of browsers that are alive at the same time.
+        webdriver : str
+            Available options: "chrome", "firefox"
+        max_renders : int
+            Number of images after which a browser is closed and replaced by a new one,
+            which limits the effect of memory leaks in long-running browsers.
+
+        """
+        import queue
+        import threading
+
+        check_arg(size, 'size', int)
+        check_arg(webdriver, 'webdriver', str, ['chrome', 'firefox'])
+        check_arg(max_renders, 'max_renders', int)
+        if size < 1 or max_renders < 1:
+            raise ValueError('Arguments "size" and "max_renders" need to be at least 1.')
+        self.size = size
+        self.webdriver = webdriver
+        self.max_renders = max_renders
+        self._browsers = queue.Queue()
+        for _ in range(size):
+            self._browsers.put(None)  # Free slot without a running browser
+        self._pages = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._url = None
+        self._closed = False
+
+    def __enter__(self):
+        """Enter a context in which the pool is used, closing all browsers at its end."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close all browsers and stop the webserver."""
+        self.close()
+
+    def render(self, html_text, data_format='png', capture_delay=1.0):
+        """Render a HTML visualization in a browser of the pool and capture it as image.
+
+        Parameters
+        ----------
+        html_text : str
+        data_format : str
+            Available options: "png", "jpg", "svg"
+        capture_delay : float
+            Maximum time in seconds between loading the page and capturing the image,
+            see :func:`wait_until_ready`.
+
+        Returns
+        -------
+        image : bytes or str
+            Binary data for PNG and JPG, text for SVG.
+
+        """
+        import uuid
+
+        check_arg(html_text, 'html_text', str)
+        check_arg(data_format, 'data_format', str, ['png', 'jpg', 'svg'])
+        check_arg(capture_delay, 'capture_delay', (int, float))
+        if self._closed:
+            raise ValueError('The render pool was already closed.')
+        self._start_server()
+        page_id = uuid.uuid4().hex
+        with self._lock:
+            self._pages[page_id] = html_text
+        browser = self._browsers.get()
+        try:
+            if browser is None:
+                browser = _Browser(self.webdriver)
+            image = browser.render('{}/{}'.format(self._url, page_id), data_format,
+                                   capture_delay)
+            if image is None:
+                raise ValueError('No image was captured.')
+            if browser.num_renders >= self.max_renders:
+                browser.close()
+                browser = None
+        except Exception as exc:
+            # A browser that failed is not trusted to be in a usable state anymore
+            if browser is not None:
+                browser.close()
+                browser = None
+            msg = (
+                'An error occurred while rendering the HTML text with Selenium and '
+                'trying to capture an image in {} format. This can have various reasons '
+                'that are not easy to detect and report, sorry! Cause: {}: {}'.format(
+                    data_format, exc.__class__.__name__, exc))
+            raise ValueError(msg) from exc
+        finally:
+            self._browsers.put(browser)
+            with self._lock:
+                self._pages.pop(page_id, None)
+        return image
+
+    def close(self):
+        """Close all browsers and stop the webserver. Waits for running jobs to finish."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in range(self.size):
+            browser = self._browsers.get()
+            if browser is not None:
+                browser.close()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def _start_server(self):
+        import http.server
+        import socketserver
+        import threading
+
+        with self._lock:
+            if self._server is not None:
+                return
+            pages = self._pages
+            lock = self._lock
+
+            class PageHandler(http.server.BaseHTTPRequestHandler):
+                def do_GET(self):
+                    """Serve the HTML text of a job to a GET request from a browser."""
+                    with lock:
+                        html_text = pages.get(self.path.strip('/'))
+                    if html_text is None:
+                        self.send_error(404)
+                        return
+                    self.send_response(200, 'OK')
+                    self.send_header('Content-type', 'text/html')
+                    self.end_headers()
+                    self.wfile.write(bytes(html_text, 'utf-8'))
+
+                def log_message(self, format, *args):
+                    """Show no log messages."""
+
+            # Same as http.server.ThreadingHTTPServer, which requires Python 3.7
+            class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+                daemon_threads = True
+
+            # Port 0 lets the operating system choose a free port
+            self._server = Server(('127.0.0.1', 0), PageHandler)
+            self._url = 'http://127.0.0.1:{}'.format(self._server.server_address[1])
+            thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            thread.start()
+
+
+class _Browser:
+    """A browser of a render pool that counts the images it rendered."""
+
+    def __init__(self, webdriver):
+        create_driver = create_chrome_driver if webdriver == 'chrome' else create_firefox_driver
+        self._driver = create_driver()
+        self.num_renders = 0
+
+    def render(self, url, data_format, capture_delay):
+        self.num_renders += 1
+        self._driver.get(url)
+        wait_until_ready(self._driver, capture_delay)
+        return capture_image(data_format, self._driver)
+
+    def close(self):
+        try:
+            self._driver.quit()
+        except Exception:
+            pass
+
+
+def wait_until_ready(driver, timeout):
+    """Wait until a plot signals that its layout is finished and drawn.
+
+    The wait takes at most ``timeout`` seconds.
+
+    The templates set the attribute ``data-gravis-ready`` on the graph container when the
+    force simulation has cooled down, or right after drawing if it is inactive. The browser
+    reports the change of the attribute with a ``MutationObserver``, so that no polling
+    interval adds to the waiting time.
+
+    Returns
+    -------
+    ready : bool
+        False if the timeout was reached without a signal.
+
+    """
+    script = """
+      const timeout = arguments[0], callback = arguments[arguments.length - 1],
+        selector = "[data-gravis-ready]";
+      if(document.querySelector(selector) !== null){
+        callback(true);
+        return;
+      }
+      const observer = new MutationObserver(function(){
+        if(document.querySelector(selector) !== null){
+          observer.disconnect();
+          clearTimeout(timer);
+          callback(true);
+        }
+      });
+      const timer = setTimeout(function(){
+        observer.disconnect();
+        callback(false);
+      }, timeout * 1000.0);
+      observer.observe(document.documentElement, {
+        attributes: true, attributeFilter: ["data-gravis-ready"], subtree: true});
+    """
+    driver.set_script_timeout(timeout + 5.0)
+    return bool(driver.execute_async_script(script, timeout))
+
+
+def create_chrome_driver(headless=True):
+    """Create a Chrome driver instance that is headless by default."""
     from selenium import webdriver
     from selenium.webdriver.chrome.options import Options
 
-    # Automatically download images to a chosen directory
-    options = Options()
-    options.add_experimental_option('prefs', {
-        'download.default_directory': directory,
-        'download.prompt_for_download': False,
-        'download.directory_upgrade': True,
-        'safebrowsing.enabled': True})
-
     # Headless: Work without opening a browser window
+    options = Options()
     if headless:
         options.add_argument('--headless')
 
@@ -121,8 +353,8 @@ def create_chrome_driver(directory, headless=True):
     return driver
 
 
-def create_firefox_driver(directory, headless=True):
-    """Create a Firefox driver instance suitable for downloading files and headless by default."""
+def create_firefox_driver(headless=True):
+    """Create a Firefox driver instance that is headless by default."""
     from selenium import webdriver
     from selenium.webdriver.firefox.options import Options
     from selenium.webdriver.firefox.service import Service
@@ -130,17 +362,8 @@ def create_firefox_driver(directory, headless=True):
     # Create no geckodriver.log file in working directory
     service = Service(log_path=os.devnull)
 
-    # Automatically download images to a chosen directory
-    mime_types = 'image/png,image/jpeg,image/svg+xml'
-    options = Options()
-    options.set_preference('browser.download.folderList', 2)
-    options.set_preference('browser.download.manager.showWhenStarting', False)
-    options.set_preference('browser.download.dir', directory)
-    options.set_preference("browser.helperApps.alwaysAsk.force", False)
-    options.set_preference('browser.helperApps.neverAsk.saveToDisk', mime_types)
-    options.set_preference("browser.download.viewableInternally.enabledTypes", "")  # dirty hack
-
     # Headless: Work without opening a browser window
+    options = Options()
     if headless:
         options.headless = True
 
@@ -149,26 +372,49 @@ def create_firefox_driver(directory, headless=True):
     return driver
 
 
-def capture_image_by_click(data_format, driver, directory):
-    """Capture an image of the rendered graph visualization by clicking an export button."""
-    data = None
+def capture_image(data_format, driver, timeout=60.0):
+    """Capture an image of the rendered graph visualization by calling its export routine.
 
-    # Toggle menu
-    menu_button = driver.find_element('css selector', '[id$=-menu-toggle-button]')
-    menu_button.click()
+    The image is created in the page with the same code as the export buttons of the menu,
+    but instead of being downloaded it is returned as data URL over the WebDriver
+    connection, so no download directory needs to be watched.
 
-    # JPG, PNG or SVG button
-    img_button = driver.find_element('css selector', '[id$=-{}]'.format(data_format))
-    img_button.click()
-    filename = 'graph.{}'.format(data_format)
-    filepath = os.path.join(directory, filename)
-    read_mode = 'r' if data_format == 'svg' else 'rb'
-    for i in range(20):
-        time.sleep(0.25)
-        try:
-            with open(filepath, read_mode) as file_handle:
-                data = file_handle.read()
-            break
-        except FileNotFoundError:
-            pass
+    Returns
+    -------
+    image : bytes or str or None
+        Binary data for PNG and JPG, text for SVG, None if the plot could not create the
+        image in the requested format.
+
+    Raises
+    ------
+    ValueError
+        If the plot did not start in the page, e.g. because its libraries were not loaded.
+
+    """
+    import base64
+
+    script = """
+      const format = arguments[0], callback = arguments[arguments.length - 1],
+        container = document.querySelector('[id$="-graph-div"]');
+      if(container === null || typeof(container.gravisToDataUrl) !== "function"){
+        callback("not started");
+        return;
+      }
+      container.gravisToDataUrl(format, callback);
+    """
+    mime_format = 'jpeg' if data_format == 'jpg' else data_format
+    driver.set_script_timeout(timeout)
+    data_url = driver.execute_async_script(script, mime_format)
+    if data_url == 'not started':
+        raise ValueError(
+            'The plot did not start in the browser, therefore its image export is not '
+            'available.')
+    if not data_url:
+        return None
+    header, encoded_data = data_url.split(',', 1)
+    if not header.startswith('data:image/{}'.format(mime_format)):
+        return None
+    data = base64.b64decode(encoded_data)
+    if data_format == 'svg':
+        data = data.decode('utf-8')
     return data
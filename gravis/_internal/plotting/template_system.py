@@ -1,26 +1,371 @@
 """Template system for using HTML template files and inserting data into them."""
 
-import json as _json
+import functools as _functools
+import hashlib as _hashlib
+import os as _os
+import re as _re
+import threading as _threading
+import zlib as _zlib
+from base64 import b64encode as _b64encode
+from collections import OrderedDict as _OrderedDict
 
-import pkg_resources as _pkg_resources
+from ..utils import serialization as _serialization
+
+try:
+    from importlib.resources import files as _files
+except ImportError:
+    _files = None
+
+
+_PLACEHOLDER_PATTERN = _re.compile('§([A-Za-z0-9_]+)§')
+
+# Javascript libraries used by the templates, listed in the order of their dependencies
+REQUIRE_RESOURCE = 'third_party/require/require.min.js'
+LIBRARY_RESOURCES = _OrderedDict([
+    ('DEFINE_D3', 'third_party/d3/d3.v7.min.def.js'),
+    ('DEFINE_VIS', 'third_party/vis-network/vis-network.min.def.js'),
+    ('DEFINE_THREE', 'third_party/three/three.min.def.js'),
+    ('DEFINE_3D_FORCE_GRAPH', 'third_party/3d-force-graph/3d-force-graph.min.def.js'),
+])
+
+# Decoder of graphs in binary form, which all templates share via the placeholder
+# BINARY_DECODER
+BINARY_DECODER_RESOURCE = 'templates/binary_decoder.js'
+
+_SCRIPT_START = '<script charset="utf-8" type="text/javascript">'
+_SCRIPT_END = '</script>'
+_INFLATE_START = _SCRIPT_START + """
+    (function(){
+      const compressed = \""""
+_INFLATE_END = """\",
+        currentScript = document.currentScript,
+        binary = atob(compressed),
+        bytes = new Uint8Array(binary.length);
+      for(let i=0; i<binary.length; i++){
+        bytes[i] = binary.charCodeAt(i);
+      }
+      const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"));
+      new Response(stream).text().then(function(code){
+        const script = document.createElement("script");
+        script.charset = "utf-8";
+        script.type = "text/javascript";
+        script.text = code;
+        currentScript.parentNode.insertBefore(script, currentScript.nextSibling);
+      });
+    })();
+  """ + _SCRIPT_END
+
+
+class Template:
+    """Precompiled template that consists of literal text segments and placeholder keys.
+
+    The template text is tokenized only once. Inserting data then requires a single join
+    over all segments, so that its cost grows with the size of the output and not with
+    the size of the output times the number of placeholder keys.
+
+    A value can be a str or any other iterable of str chunks that can be iterated
+    repeatedly. Such a value is kept as it is by :meth:`fill` and is only iterated when
+    the template is rendered or written, e.g. by :meth:`write` directly to a file.
+
+    """
+
+    def __init__(self, text):
+        """Tokenize a template text into literal segments and placeholder keys."""
+        # Even positions hold literal text, odd positions hold placeholder keys
+        self._segments = _PLACEHOLDER_PATTERN.split(text)
+
+    @classmethod
+    def _from_segments(cls, segments):
+        template = cls.__new__(cls)
+        template._segments = segments
+        return template
+
+    @property
+    def keys(self):
+        """Get the set of placeholder keys that are not filled yet."""
+        return {key for key in self._segments[1::2] if isinstance(key, str)}
+
+    def fill(self, data):
+        """Insert data for some placeholders and get a new template with the remaining ones.
+
+        Parameters
+        ----------
+        data : dict
+            Mapping of placeholder keys to text or to iterables of text chunks. Keys that
+            do not occur in the template are ignored.
+
+        Returns
+        -------
+        template : Template
+
+        """
+        segments = self._segments
+        new_segments = []
+        buffer = [segments[0]]
+        for idx in range(1, len(segments), 2):
+            key = segments[idx]
+            # Odd positions hold either a placeholder key or a chunked value filled earlier
+            val = data.get(key) if isinstance(key, str) else key
+            if isinstance(val, str):
+                buffer.append(val)
+            else:
+                new_segments.append(''.join(buffer))
+                new_segments.append(key if val is None else val)
+                buffer = []
+            buffer.append(segments[idx + 1])
+        new_segments.append(''.join(buffer))
+        return self._from_segments(new_segments)
+
+    def render(self, data=None):
+        """Insert data for all placeholders and get the resulting text.
+
+        Placeholders without a value in ``data`` remain in the text in their tagged form.
+
+        """
+        if data is None:
+            data = {}
+        parts = self._segments[:]
+        for idx in range(1, len(parts), 2):
+            val = self._lookup(parts[idx], data)
+            parts[idx] = val if isinstance(val, str) else ''.join(val)
+        return ''.join(parts)
+
+    def iter_chunks(self, data=None):
+        """Insert data for all placeholders and iterate over chunks of the resulting text.
+
+        Joining all chunks gives the same text as :meth:`render`.
+
+        """
+        if data is None:
+            data = {}
+        segments = self._segments
+        for idx, segment in enumerate(segments):
+            if idx % 2 == 0:
+                if segment:
+                    yield segment
+                continue
+            val = self._lookup(segment, data)
+            if isinstance(val, str):
+                yield val
+            else:
+                yield from val
+
+    def write(self, file_handle, data=None):
+        """Insert data for all placeholders and write the resulting text chunk by chunk."""
+        for chunk in self.iter_chunks(data):
+            file_handle.write(chunk)
+
+    @staticmethod
+    def _lookup(segment, data):
+        if not isinstance(segment, str):
+            return segment
+        try:
+            return data[segment]
+        except KeyError:
+            return '§' + segment + '§'
+
+    def __str__(self):
+        """Get the template text with all unfilled placeholders in their tagged form."""
+        return self.render()
+
+
+class ResourceCache:
+    """Process-wide, size-bounded cache of decoded resource files.
+
+    Vendor bundles and templates are read from disk and decoded only once. When the
+    total size of cached strings exceeds ``max_size`` characters, the least recently
+    used entries are evicted. A single resource larger than ``max_size`` is not cached.
+
+    """
+
+    def __init__(self, max_size=32 * 1024 * 1024, use_mmap=False):
+        """Initialize an empty cache.
+
+        Parameters
+        ----------
+        max_size : int
+            Upper bound for the total number of characters held in the cache.
+        use_mmap : bool
+            If True, files are read via memory-mapping instead of a regular read call.
+
+        """
+        self.max_size = max_size
+        self.use_mmap = use_mmap
+        self._entries = _OrderedDict()
+        self._size = 0
+        self._lock = _threading.Lock()
+
+    def get(self, resource_path):
+        """Get the decoded content of a resource, reading it from disk on a cache miss."""
+        with self._lock:
+            try:
+                string = self._entries[resource_path]
+                self._entries.move_to_end(resource_path)
+                return string
+            except KeyError:
+                pass
+        string = read_resource(resource_path, self.use_mmap)
+        with self._lock:
+            if resource_path not in self._entries and len(string) <= self.max_size:
+                self._entries[resource_path] = string
+                self._size += len(string)
+                self._evict()
+        return string
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _evict(self):
+        while self._size > self.max_size:
+            _, string = self._entries.popitem(last=False)
+            self._size -= len(string)
+
+    def __len__(self):
+        """Get the number of cached resources."""
+        return len(self._entries)
+
+
+_RESOURCE_CACHE = ResourceCache()
+
+
+def configure_resource_cache(max_size=None, use_mmap=None):
+    """Change the size limit or the reading mode of the process-wide resource cache."""
+    with _RESOURCE_CACHE._lock:
+        if max_size is not None:
+            _RESOURCE_CACHE.max_size = max_size
+            _RESOURCE_CACHE._evict()
+        if use_mmap is not None:
+            _RESOURCE_CACHE.use_mmap = use_mmap
+
+
+def clear_resource_cache():
+    """Remove all entries from the process-wide resource cache."""
+    _RESOURCE_CACHE.clear()
+
+
+def read_resource(resource_path, use_mmap=False):
+    """Read and decode a file in the same directory as the template system module."""
+    if _files is not None:
+        resource = _files(__package__).joinpath(resource_path)
+        if not use_mmap:
+            return resource.read_bytes().decode('utf-8')
+        from importlib.resources import as_file
+
+        with as_file(resource) as filepath:
+            return _read_file(filepath, use_mmap)
+    filepath = _os.path.join(_os.path.dirname(__file__), resource_path)
+    return _read_file(filepath, use_mmap)
+
+
+def _read_file(filepath, use_mmap):
+    with open(filepath, 'rb') as file_handle:
+        # An empty file can not be memory-mapped
+        if use_mmap and _os.fstat(file_handle.fileno()).st_size > 0:
+            import mmap
+
+            with mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                # Decoded directly from the mapped pages, without an intermediate bytes copy
+                with memoryview(mapped_file) as view:
+                    return str(view, 'utf-8')
+        return file_handle.read().decode('utf-8')
 
 
 def load(resource_path):
     """Load a file in the same directory as the template system module."""
-    resource_package = __name__
-    binary_data = _pkg_resources.resource_string(resource_package, resource_path)
-    string = binary_data.decode('utf-8')
-    return string
+    return _RESOURCE_CACHE.get(resource_path)
+
+
+@_functools.lru_cache(maxsize=None)
+def resource_hash(resource_path):
+    """Get a short hash of the content of a resource file, which identifies its version."""
+    return _hashlib.sha256(load(resource_path).encode('utf-8')).hexdigest()[:16]
+
+
+def asset_filename(resource_path):
+    """Get a filename for a resource that changes whenever its content changes.
+
+    The content hash is inserted before the extension, e.g. "d3.v7.min.def.js" becomes
+    "d3.v7.min.def.<hash>.js", so that files of different versions can be placed in the
+    same directory and browsers never use an outdated cached copy.
+
+    """
+    stem, extension = _os.path.splitext(_os.path.basename(resource_path))
+    return '{}.{}{}'.format(stem, resource_hash(resource_path), extension)
+
+
+@_functools.lru_cache(maxsize=None)
+def load_template(resource_path):
+    """Load a template file and compile it once, so repeated calls share the same object."""
+    return Template(load(resource_path))
+
+
+def iter_compressed_scripts(chunks, level=6):
+    """Replace the code of inline scripts in HTML text by its gzip-compressed form.
+
+    The compressed code is embedded as base64 text together with a small script that
+    inflates it with the browser's ``DecompressionStream`` and then runs it in place of
+    the original script. Text outside of scripts is passed through unchanged.
+
+    Parameters
+    ----------
+    chunks : iterable of str
+        Chunks of HTML text, e.g. from :meth:`Template.iter_chunks`.
+    level : int
+        Compression level of zlib between 1 (fastest) and 9 (smallest).
+
+    Yields
+    ------
+    chunk : str
+
+    """
+    pending = ''
+    compressor = None
+    remainder = b''
+    for chunk in chunks:
+        pending += chunk
+        while pending:
+            if compressor is None:
+                pos = pending.find(_SCRIPT_START)
+                if pos < 0:
+                    # Keep the end in case a start tag is split over two chunks
+                    split = max(len(pending) - len(_SCRIPT_START) + 1, 0)
+                    yield pending[:split]
+                    pending = pending[split:]
+                    break
+                yield pending[:pos] + _INFLATE_START
+                pending = pending[pos + len(_SCRIPT_START):]
+                compressor = _zlib.compressobj(level, wbits=31)
+            else:
+                pos = pending.find(_SCRIPT_END)
+                split = max(len(pending) - len(_SCRIPT_END) + 1, 0) if pos < 0 else pos
+                data = remainder + compressor.compress(pending[:split].encode('utf-8'))
+                pending = pending[split:]
+                if pos >= 0:
+                    data += compressor.flush()
+                    compressor = None
+                # Base64 text can be split only after each full group of three bytes
+                usable = len(data) if compressor is None else len(data) // 3 * 3
+                yield _b64encode(data[:usable]).decode('ascii')
+                remainder = data[usable:]
+                if pos < 0:
+                    break
+                yield _INFLATE_END
+                pending = pending[len(_SCRIPT_END):]
+    if compressor is not None:
+        raise ValueError('HTML text with a script that is not closed.')
+    yield pending
 
 
 def insert(template, data):
     """Insert data into a template."""
-    for key, val in data.items():
-        tag = '§' + key + '§'
-        template = template.replace(tag, val)
-    return template
+    if not isinstance(template, Template):
+        template = Template(template)
+    return template.render(data)
 
 
 def to_json(data):
-    """Convert data to JSON."""
-    return _json.dumps(data)
+    """Convert data to JSON with the process-wide serializer, which may use a fast backend."""
+    return _serialization.to_json(data)
@@ -0,0 +1,98 @@
+{
+            // Graphs that were embedded as base64 typed arrays are not turned back into gJGF.
+            // Their nodes and edges stay columns, which the parsers read row by row through a
+            // single reused row object that has the same form as a gJGF node or edge.
+            decodeGraphs(graphs){
+              return graphs.map(graph => (graph !== null && graph.gravis_binary === 1) ? this.decodeGraph(graph) : graph);
+            },
+
+            decodeGraph(graph){
+              const nodes = graph.nodes,
+                edges = graph.edges,
+                nodeIds = nodes.ids,
+                getNodeId = nodeIds !== null ? i => nodeIds[i] : i => String(i),
+                nodeColumns = this.createColumns(nodes.count, nodes),
+                edgeColumns = this.createColumns(edges.count, edges),
+                sources = this.decodeArray(edges.sources, "u32"),
+                targets = this.decodeArray(edges.targets, "u32"),
+                givenData = Object.assign({}, graph.graph);
+              nodeColumns.getId = getNodeId;
+              Object.defineProperty(edgeColumns.row, "source", {get: () => getNodeId(sources[edgeColumns.index]), enumerable: true});
+              Object.defineProperty(edgeColumns.row, "target", {get: () => getNodeId(targets[edgeColumns.index]), enumerable: true});
+              givenData.nodes = nodeColumns;
+              givenData.edges = edgeColumns;
+              return givenData;
+            },
+
+            createColumns(count, container){
+              const columns = {gravis_columns: true, length: count, index: 0, row: {metadata: {}}},
+                define = (target, key, column) => {
+                  const values = this.decodeValues(column),
+                    present = typeof(column.present) === "undefined" ? null : this.decodeArray(column.present, "u8");
+                  Object.defineProperty(target, key, {
+                    get(){
+                      const i = columns.index;
+                      return (present === null ? values[i] !== null : present[i] === 1) ? values[i] : undefined;
+                    },
+                    enumerable: true,
+                  });
+                };
+              for(const [key, column] of Object.entries(container.data)){
+                define(columns.row, key, column);
+              }
+              for(const [key, column] of Object.entries(container.metadata)){
+                define(columns.row.metadata, key, column);
+              }
+              return columns;
+            },
+
+            isColumns(items){
+              return typeof(items) === "object" && items !== null && items.gravis_columns === true;
+            },
+
+            // Iterate over [id, node] pairs of gJGF nodes or of node columns
+            *iterNodes(nodes){
+              if(!this.isColumns(nodes)){
+                yield* Object.entries(nodes);
+                return;
+              }
+              for(let i=0; i<nodes.length; i++){
+                nodes.index = i;
+                yield [nodes.getId(i), nodes.row];
+              }
+            },
+
+            // Get the i-th gJGF edge or the row of edge columns moved to position i
+            getEdge(edges, i){
+              if(!this.isColumns(edges)){
+                return edges[i];
+              }
+              edges.index = i;
+              return edges.row;
+            },
+
+            decodeValues(column){
+              if(column.type === "json"){
+                return column.data;
+              } else if(column.type === "str"){
+                const table = column.table;
+                return Array.from(this.decodeArray(column.data, column.index_type), index => table[index]);
+              } else if(column.type === "bool"){
+                return Array.from(this.decodeArray(column.data, "u8"), value => value === 1);
+              }
+              return this.decodeArray(column.data, column.type);
+            },
+
+            decodeArray(text, type){
+              const binary = atob(text),
+                bytes = new Uint8Array(binary.length),
+                arrayTypes = {
+                  u8: Uint8Array, u16: Uint16Array, u32: Uint32Array,
+                  i32: Int32Array, f32: Float32Array, f64: Float64Array,
+                };
+              for(let i=0; i<binary.length; i++){
+                bytes[i] = binary.charCodeAt(i);
+              }
+              return new arrayTypes[type](bytes.buffer);
+            },
+          }
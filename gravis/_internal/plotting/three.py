@@ -33,7 +33,8 @@ def three(data,
           use_x_positioning_force=False, x_positioning_force_strength=0.2,
           use_y_positioning_force=False, y_positioning_force_strength=0.2,
           use_z_positioning_force=False, z_positioning_force_strength=0.2,
-          use_centering_force=True):
+          use_centering_force=True,
+          workers=None, binary_data=False, layout_cache=None):
     """Create an interactive graph visualization with HTML/CSS/JS based on 3d-force-graph.js.
 
     The library 3d-force-graph.js uses three.js to create a 3d visualization in WebGL,
@@ -70,7 +71,8 @@ def three(data,
         It can be provided in following ways:
 
         - *str*: A string in gJGF, or a filepath to a text file in gJGF.
-        - *dict*: A dict adhering to gJGF.
+        - *dict*: A dict adhering to gJGF. It is not copied but serialized each time the
+          figure is exported, so changes made to it afterwards are visible in the export.
         - *graph object*: An object from a
           :ref:`supported graph library <supported-graph-libraries>`,
           which internally gets converted to gJGF.
@@ -238,6 +240,24 @@ def three(data,
         This force attracts each node towards the center of the coordinate system at (0, 0, 0)
         to keep the graph in the display area. It may lead to unexpected repulsion effects
         if all nodes are fixed and then a single one is released by dragging it.
+    workers : int, optional
+        If greater than 1 and ``data`` is a list, the graph objects in it are converted
+        to gJGF concurrently by a pool of this many worker processes.
+    binary_data : bool
+        If True, graphs converted from graph objects of external libraries are embedded in
+        the HTML as base64-encoded typed arrays instead of JSON text, with repeated strings
+        stored once in a table. This reduces the size of the HTML and the time the browser
+        needs to parse large graphs. The same holds for graphs from gJGF files of 16 MB or
+        more, which are read incrementally into the same columnar form where possible.
+        Other graphs given in gJGF are still embedded as JSON.
+    layout_cache : :class:`~gravis.layout.LayoutCache` or str, optional
+        A layout cache or the directory of one. If provided, node positions are calculated
+        in Python by the force simulation of :func:`gravis.layout.force_directed` with
+        ``dim=3`` and the force arguments above and embedded as fixed "x", "y" and "z"
+        values, so that the browser shows the final layout right away. A graph with the
+        same node ids, edges and force arguments as an earlier plot gets its positions
+        from the cache instead of calculating them again, even if other data such as
+        colors or labels changed. Requires NumPy.
 
     Returns
     -------
@@ -306,15 +326,38 @@ def three(data,
     _ca(use_z_positioning_force, 'use_z_positioning_force', bool)
     _ca(z_positioning_force_strength, 'z_positioning_force_strength', (int, float))
     _ca(use_centering_force, 'use_centering_force', bool)
-    data = _internal.normalize_graph_data(data)
+    _ca(workers, 'workers', int, allow_none=True)
+    _ca(binary_data, 'binary_data', bool)
+    data = _internal.normalize_graph_data(data, workers)
+    if layout_cache is not None:
+        from ..layout import layout as _layout
+
+        _ca(layout_cache, 'layout_cache', (str, _layout.LayoutCache))
+        data = _layout._cached_force_directed(
+            data, layout_cache, dim=3,
+            use_many_body_force=use_many_body_force,
+            many_body_force_strength=many_body_force_strength,
+            many_body_force_theta=many_body_force_theta,
+            use_many_body_force_min_distance=use_many_body_force_min_distance,
+            many_body_force_min_distance=many_body_force_min_distance,
+            use_many_body_force_max_distance=use_many_body_force_max_distance,
+            many_body_force_max_distance=many_body_force_max_distance,
+            use_links_force=use_links_force,
+            links_force_distance=links_force_distance,
+            links_force_strength=links_force_strength,
+            use_x_positioning_force=use_x_positioning_force,
+            x_positioning_force_strength=x_positioning_force_strength,
+            use_y_positioning_force=use_y_positioning_force,
+            y_positioning_force_strength=y_positioning_force_strength,
+            use_z_positioning_force=use_z_positioning_force,
+            z_positioning_force_strength=z_positioning_force_strength,
+            use_centering_force=use_centering_force)
 
     # Transformation
-    site_template = _ts.load('templates/three.html')
+    site_template = _ts.load_template('templates/three.html')
     insert_data = {
-        'DEFINE_THREE': _ts.load('third_party/three/three.min.def.js'),
-        'DEFINE_3D_FORCE_GRAPH': _ts.load('third_party/3d-force-graph/3d-force-graph.min.def.js'),
-
-        'DATA': _ts.to_json(data),
+        'BINARY_DECODER': _ts.load(_ts.BINARY_DECODER_RESOURCE).strip(),
+        'DATA': _internal.GraphDataJSON(data, binary=binary_data),
         'GRAPH_HEIGHT': _ts.to_json(graph_height),
         'DETAILS_HEIGHT': _ts.to_json(details_height),
         'SHOW_DETAILS': _ts.to_json(show_details),
@@ -382,6 +425,10 @@ def three(data,
         'Z_POSITIONING_FORCE_STRENGTH': _ts.to_json(z_positioning_force_strength),
         'USE_CENTERING_FORCE': _ts.to_json(use_centering_force),
     }
-    site_template = _ts.insert(site_template, insert_data)
-    fig = _ds.Figure(site_template)
+    libraries = {
+        'DEFINE_THREE': _ts.LIBRARY_RESOURCES['DEFINE_THREE'],
+        'DEFINE_3D_FORCE_GRAPH': _ts.LIBRARY_RESOURCES['DEFINE_3D_FORCE_GRAPH'],
+    }
+    html_template = site_template.fill(insert_data)
+    fig = _ds.Figure(html_template, libraries)
     return fig
@@ -26,7 +26,8 @@ def vis(data,
         zoom_factor=0.75, large_graph_threshold=500,
         layout_algorithm_active=True, layout_algorithm='barnesHut',
         gravitational_constant=-2000.0, central_gravity=0.1, spring_length=70.0,
-        spring_constant=0.1, avoid_overlap=0.0):
+        spring_constant=0.1, avoid_overlap=0.0,
+        workers=None, binary_data=False):
     """Create an interactive graph visualization with HTML/CSS/JS based on vis.js.
 
     Note
@@ -66,7 +67,8 @@ def vis(data,
         It can be provided in following ways:
 
         - *str*: A string in gJGF, or a filepath to a text file in gJGF.
-        - *dict*: A dict adhering to gJGF.
+        - *dict*: A dict adhering to gJGF. It is not copied but serialized each time the
+          figure is exported, so changes made to it afterwards are visible in the export.
         - *graph object*: An object from a
           :ref:`supported graph library <supported-graph-libraries>`,
           which internally gets converted to gJGF.
@@ -189,6 +191,16 @@ def vis(data,
         if they come too close together.
         Only active if layout_algorithm is "barnesHut", "forceAtlas2Based" or
         "hierarchicalRepulsion".
+    workers : int, optional
+        If greater than 1 and ``data`` is a list, the graph objects in it are converted
+        to gJGF concurrently by a pool of this many worker processes.
+    binary_data : bool
+        If True, graphs converted from graph objects of external libraries are embedded in
+        the HTML as base64-encoded typed arrays instead of JSON text, with repeated strings
+        stored once in a table. This reduces the size of the HTML and the time the browser
+        needs to parse large graphs. The same holds for graphs from gJGF files of 16 MB or
+        more, which are read incrementally into the same columnar form where possible.
+        Other graphs given in gJGF are still embedded as JSON.
 
     Returns
     -------
@@ -248,14 +260,15 @@ def vis(data,
     _ca(spring_length, 'spring_length', (int, float))
     _ca(spring_constant, 'spring_constant', (int, float))
     _ca(avoid_overlap, 'avoid_overlap', (int, float))
-    data = _internal.normalize_graph_data(data)
+    _ca(workers, 'workers', int, allow_none=True)
+    _ca(binary_data, 'binary_data', bool)
+    data = _internal.normalize_graph_data(data, workers)
 
     # Transformation
-    site_template = _ts.load('templates/vis.html')
+    site_template = _ts.load_template('templates/vis.html')
     insert_data = {
-        'DEFINE_VIS': _ts.load('third_party/vis-network/vis-network.min.def.js'),
-
-        'DATA': _ts.to_json(data),
+        'BINARY_DECODER': _ts.load(_ts.BINARY_DECODER_RESOURCE).strip(),
+        'DATA': _internal.GraphDataJSON(data, binary=binary_data),
         'GRAPH_HEIGHT': _ts.to_json(graph_height),
         'DETAILS_HEIGHT': _ts.to_json(details_height),
         'SHOW_DETAILS': _ts.to_json(show_details),
@@ -310,6 +323,9 @@ def vis(data,
         'SPRING_CONSTANT': _ts.to_json(spring_constant),
         'AVOID_OVERLAP': _ts.to_json(avoid_overlap),
     }
-    site_template = _ts.insert(site_template, insert_data)
-    fig = _ds.Figure(site_template)
+    libraries = {
+        'DEFINE_VIS': _ts.LIBRARY_RESOURCES['DEFINE_VIS'],
+    }
+    html_template = site_template.fill(insert_data)
+    fig = _ds.Figure(html_template, libraries)
     return fig
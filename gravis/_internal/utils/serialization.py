@@ -0,0 +1,182 @@
+"""Conversion of Python and NumPy values to JSON text with an exchangeable backend."""
+
+import json as _json
+from json.encoder import encode_basestring as _encode_str
+from json.encoder import encode_basestring_ascii as _encode_str_ascii
+from math import isfinite as _isfinite
+
+from .args import check_arg as _check_arg
+
+
+BACKENDS = ('orjson', 'ujson', 'rapidjson', 'json')
+
+
+class JsonSerializer:
+    """Serializer that uses json or a fast JSON library such as orjson.
+
+    All backends produce JSON text that a browser parses to the same values. The text
+    itself differs in whitespace and in the escaping of non-ASCII characters: The json
+    backend creates exactly the output of ``json.dumps``, while the other backends
+    create compact output without spaces after separators. NumPy float32 values are
+    written by orjson with their shortest float32 form, e.g. 0.1, and by the other
+    backends with their float64 form, e.g. 0.10000000149011612.
+
+    Values that a fast backend can not represent, e.g. integers beyond 64 bit, are
+    serialized with json in the same compact style instead. One exception is accepted
+    for speed: orjson writes NaN and infinity as null, while the other backends keep
+    them. NumPy scalars and arrays are accepted by every backend.
+
+    """
+
+    def __init__(self, backend=None):
+        """Initialize a serializer with a chosen backend.
+
+        Parameters
+        ----------
+        backend : str, optional
+            Name of a JSON library. Available options: "orjson", "ujson", "rapidjson",
+            "json". If None, the first one of them that is installed is used.
+
+        Raises
+        ------
+        ImportError
+            If the chosen backend is not installed.
+
+        """
+        _check_arg(backend, 'backend', str, BACKENDS, allow_none=True)
+        if backend is None:
+            for name in BACKENDS:
+                try:
+                    self._dumps_fast = _load_backend(name)
+                    backend = name
+                    break
+                except ImportError:
+                    pass
+        else:
+            self._dumps_fast = _load_backend(backend)
+        self.backend = backend
+        if backend == 'json':
+            self.separators = (', ', ': ')
+        else:
+            self.separators = (',', ':')
+
+    def __call__(self, data):
+        """Serialize data to JSON text."""
+        return self.dumps(data)
+
+    def dumps(self, data):
+        """Serialize data to JSON text."""
+        if self._dumps_fast is None:
+            return _json.dumps(data, default=_to_builtin)
+        try:
+            return self._dumps_fast(data)
+        except (TypeError, ValueError, OverflowError):
+            return self._dumps_compact(data)
+
+    def encode_values(self, values, missing=None):
+        """Serialize each value of a list on its own, keeping markers of missing values.
+
+        Each value that is the object ``missing`` becomes None in the result. Lists whose
+        other values are all of type str, int, float or bool are encoded in bulk. The
+        result is the same as calling :meth:`dumps` on each value.
+
+        """
+        has_missing = any(val is missing for val in values)
+        present = [val for val in values if val is not missing] if has_missing else values
+        value_types = set(map(type, present))
+        if len(value_types) != 1:
+            return [None if val is missing else self.dumps(val) for val in values]
+        value_type = value_types.pop()
+        if value_type is str:
+            texts = map(_encode_str_ascii if self._dumps_fast is None else _encode_str, present)
+        elif value_type is int:
+            texts = map(int.__repr__, present)
+        elif value_type is bool:
+            texts = map({True: 'true', False: 'false'}.__getitem__, present)
+        elif value_type is float and all(map(_isfinite, present)):
+            if self._dumps_fast is None:
+                texts = map(float.__repr__, present)
+            else:
+                # Numbers contain no comma, so that the text of a list can be split
+                texts = self._dumps_fast(present)[1:-1].split(',') if present else []
+        else:
+            return [None if val is missing else self.dumps(val) for val in values]
+        if not has_missing:
+            return list(texts)
+        texts = iter(texts)
+        return [None if val is missing else next(texts) for val in values]
+
+    @staticmethod
+    def _dumps_compact(data):
+        return _json.dumps(data, default=_to_builtin, separators=(',', ':'), ensure_ascii=False)
+
+
+def _load_backend(name):
+    """Get a function that serializes data to a str with the named library."""
+    if name == 'orjson':
+        import orjson
+
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+        def dumps(data):
+            return orjson.dumps(data, default=_to_builtin, option=option).decode('utf-8')
+    elif name == 'ujson':
+        import ujson
+
+        def dumps(data):
+            return ujson.dumps(data, ensure_ascii=False, escape_forward_slashes=False,
+                               reject_bytes=True, default=_to_builtin)
+    elif name == 'rapidjson':
+        import rapidjson
+
+        def dumps(data):
+            return rapidjson.dumps(data, ensure_ascii=False, default=_to_builtin)
+    else:
+        dumps = None
+    return dumps
+
+
+def _to_builtin(obj):
+    """Convert NumPy scalars and arrays to Python objects, called for unsupported types."""
+    if hasattr(obj, 'tolist') and hasattr(obj, 'dtype'):
+        return obj.tolist()
+    message = 'Object of type {} is not JSON serializable'.format(obj.__class__.__name__)
+    raise TypeError(message)
+
+
+# json is the default, so that the text of a figure does not depend on installed packages
+_DEFAULT_SERIALIZER = JsonSerializer('json')
+
+
+def get_serializer():
+    """Get the process-wide serializer that is used for creating figures."""
+    return _DEFAULT_SERIALIZER
+
+
+def configure_serializer(backend='json'):
+    """Choose the JSON library that is used to embed graph data into figures.
+
+    By default, Python's built-in json module is used. A fast library like orjson can
+    serialize large graphs several times faster. The resulting figures show the same
+    graphs, but their HTML text differs in whitespace, in the escaping of non-ASCII
+    characters and in the digits of NumPy float32 values.
+
+    Parameters
+    ----------
+    backend : str or None
+        Name of a JSON library. Available options: "orjson", "ujson", "rapidjson",
+        "json". If None, the first one of them that is installed is used.
+
+    Raises
+    ------
+    ImportError
+        If the chosen backend is not installed.
+
+    """
+    global _DEFAULT_SERIALIZER
+    _DEFAULT_SERIALIZER = JsonSerializer(backend)
+
+
+def to_json(data):
+    """Serialize data to JSON text with the process-wide serializer."""
+    return _DEFAULT_SERIALIZER.dumps(data)
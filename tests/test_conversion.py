@@ -0,0 +1,521 @@
+from collections import OrderedDict
+import json
+import shutil
+import subprocess
+
+import pytest
+
+import gravis as gv
+
+
+ci = gv._internal.conversion._internal
+
+
+def test_columnar_graph_row_wise():
+    graph = ci.ColumnarGraph(True, {'label': 'g', 'type': 't', 'node_color': 'red'})
+    graph.add_node('a', {'label': 'first', 'size': 5})
+    graph.add_node('b')
+    graph.add_node('c', {'color': 'blue', 'size': None})
+    graph.add_edge('a', 'b', {'color': 'green', 'id': 'e1', 'weight': 2.5})
+    graph.add_edge('b', 'c', {})
+    graph.add_edge('c', 'd', {'label': 'e3'})  # unknown node d is added
+    assert graph.num_nodes == 4
+    assert graph.num_edges == 3
+
+    expected = {
+        'graph': {
+            'directed': True,
+            'label': 'g',
+            'type': 't',
+            'metadata': {'node_color': 'red'},
+            'nodes': {
+                'a': {'label': 'first', 'metadata': {'size': 5}},
+                'b': {},
+                'c': {'metadata': {'color': 'blue', 'size': None}},
+                'd': {},
+            },
+            'edges': [
+                {'source': 'a', 'target': 'b', 'id': 'e1',
+                 'metadata': {'color': 'green', 'weight': 2.5}},
+                {'source': 'b', 'target': 'c'},
+                {'source': 'c', 'target': 'd', 'label': 'e3'},
+            ],
+        }
+    }
+    gjgf = graph.to_gjgf()
+    assert gjgf == expected
+    assert graph.to_json() == json.dumps(gjgf['graph'])
+    assert graph.graph_metadata == {'label': 'g', 'type': 't', 'node_color': 'red'}
+
+
+def test_columnar_graph_column_wise():
+    missing = ci.MISSING
+    graph = ci.ColumnarGraph()
+    graph.add_nodes(['0', '1', '2'], {'size': [1, missing, 3], 'label': ('x', 'y', missing)})
+    graph.add_nodes(('3', '4'))
+    graph.add_node('5', {'size': 6})
+    graph.add_edges([0, 1], [1, 2], {'color': ['red', missing]})
+    graph.add_edges([2], [3])
+    graph.add_edge('4', '5', {'color': 'blue'})
+    assert graph.node_ids == ['0', '1', '2', '3', '4', '5']
+    gjgf = graph.to_gjgf()
+    assert gjgf['graph']['nodes']['0'] == {'label': 'x', 'metadata': {'size': 1}}
+    assert gjgf['graph']['nodes']['4'] == {}
+    assert gjgf['graph']['nodes']['5'] == {'metadata': {'size': 6}}
+    assert [edge.get('metadata') for edge in gjgf['graph']['edges']] == [
+        {'color': 'red'}, None, None, {'color': 'blue'}]
+    with pytest.raises(ValueError):
+        graph.add_edges([0], [])
+
+    empty = ci.ColumnarGraph()
+    assert empty.to_json() == json.dumps(empty.to_gjgf()['graph'])
+    assert ci.graph_data_to_json([empty, {'nodes': {}}], json.dumps) == json.dumps(
+        [empty.to_gjgf()['graph'], {'nodes': {}}])
+
+
+def test_columnar_graph_keeps_none_and_key_order():
+    # Same JSON text as a gJGF dict built node by node, including None and the key order
+    nodes = [('a', {'size': 1, 'color': None}), ('b', {}), ('c', {'color': 'red', 'size': 2}),
+             ('d', {'label': None, 'size': 3}), ('e', {'shape': 'circle', 'size': 4})]
+    edges = [('a', 'b', {'weight': None}), ('b', 'c', {'color': 'blue', 'weight': 1}),
+             ('c', 'd', {'weight': 2, 'color': None, 'label': 'x'})]
+
+    def dict_path_text(directed):
+        data, data_graph, data_nodes, data_edges = ci.prepare_gjgf_dict()
+        ci.insert_graph_data(data_graph, directed, {})
+        for node_id, node_dict in nodes:
+            ci.insert_node_data(data_nodes, node_id, dict(node_dict))
+        for source, target, edge_dict in edges:
+            ci.insert_edge_data(data_edges, source, target, dict(edge_dict))
+        return json.dumps(data['graph'])
+
+    expected_text = dict_path_text(False)
+
+    row_wise = ci.ColumnarGraph()
+    for node_id, node_dict in nodes:
+        row_wise.add_node(node_id, node_dict)
+    for source, target, edge_dict in edges:
+        row_wise.add_edge(source, target, edge_dict)
+
+    column_wise = ci.ColumnarGraph()
+    for start in range(0, len(nodes), 2):
+        key_orders = {}
+        batch = nodes[start:start + 2]
+        columns = ci.dicts_to_columns([node_dict for _, node_dict in batch], len(batch),
+                                      key_orders)
+        column_wise.add_nodes([node_id for node_id, _ in batch], columns, key_orders)
+    key_orders = {}
+    columns = ci.dicts_to_columns([edge_dict for _, _, edge_dict in edges], len(edges),
+                                  key_orders)
+    column_wise.add_edges([0, 1, 2], [1, 2, 3], columns, key_orders)
+
+    for graph in [row_wise, column_wise]:
+        assert graph.to_json() == expected_text
+        assert json.dumps(graph.to_gjgf()['graph']) == expected_text
+        assert ''.join(graph.iter_json(chunk_size=2)) == expected_text
+    assert column_wise.to_json(gv._internal.utils.serialization.JsonSerializer('json')) == \
+        expected_text
+
+    nx = pytest.importorskip('networkx')
+    graph = nx.DiGraph()
+    for node_id, node_dict in nodes:
+        graph.add_node(node_id, **node_dict)
+    for source, target, edge_dict in edges:
+        graph.add_edge(source, target, **edge_dict)
+    assert json.dumps(gv.convert.networkx_to_gjgf(graph)['graph']) == dict_path_text(True)
+
+
+@pytest.mark.parametrize('backend', gv._internal.utils.serialization.BACKENDS)
+def test_columnar_graph_with_non_str_keys(backend):
+    from gravis._internal.conversion import _binary
+
+    try:
+        serializer = gv._internal.utils.serialization.JsonSerializer(backend)
+    except ImportError:
+        pytest.skip('{} is not installed'.format(backend))
+
+    # Keys of type int, float and bool become str in the same way as with json.dumps
+    graph = ci.ColumnarGraph()
+    graph.add_node('a', {1: 'x', 2.5: 'y', False: 'z', 'color': 'red'})
+    graph.add_node('b', {'size': 3})
+    graph.add_edge('a', 'b', {7: 1, 0.5: 2, True: 3})
+    expected = json.loads(json.dumps(graph.to_gjgf()['graph']))
+    assert expected['nodes']['a']['metadata'] == {'1': 'x', '2.5': 'y', 'false': 'z',
+                                                  'color': 'red'}
+    assert json.loads(graph.to_json(serializer)) == expected
+    assert json.loads(''.join(graph.iter_json(serializer, chunk_size=1))) == expected
+    encoded = json.loads(_binary.encode_graph(graph, serializer))
+    assert sorted(encoded['nodes']['metadata']) == ['1', '2.5', 'color', 'false', 'size']
+    assert sorted(encoded['edges']['metadata']) == ['0.5', '7', 'true']
+
+
+@pytest.mark.parametrize('backend', gv._internal.utils.serialization.BACKENDS)
+def test_gjgf_dict_json_in_chunks(backend):
+    try:
+        serializer = gv._internal.utils.serialization.JsonSerializer(backend)
+    except ImportError:
+        pytest.skip('{} is not installed'.format(backend))
+
+    graphs = [
+        {'label': 'g', 'directed': True, 'metadata': {'color': 'red'},
+         'nodes': {'a': {'label': 'Ä'}, 1: {'metadata': {2.5: None}}, 'c': {}},
+         'edges': [{'source': 'a', 'target': 'c'}, {'source': 'c', 'target': 'a'}]},
+        {'nodes': [{'id': 'a'}, {'id': 'b'}], 'edges': [], 'extra': [1, 2]},
+        {'nodes': {}},
+    ]
+    for dumps in [json.dumps, serializer]:
+        for graph in graphs:
+            chunks = list(ci.iter_gjgf_json(graph, dumps, chunk_size=1))
+            assert ''.join(chunks) == dumps(graph)
+        assert len(list(ci.iter_gjgf_json(graphs[0], dumps, chunk_size=1))) > \
+            len(list(ci.iter_gjgf_json(graphs[0], dumps)))
+
+    # Dict graphs are serialized on iteration, so that no full text is kept
+    data_json = ci.GraphDataJSON(graphs, serializer)
+    assert all(item is graph for item, graph in zip(data_json._items, graphs))
+    assert str(data_json) == serializer(graphs)
+    graphs[2]['nodes']['new'] = {}
+    assert json.loads(str(data_json))[2] == {'nodes': {'new': {}}}
+
+
+def test_columnar_graph_with_numpy_columns():
+    np = pytest.importorskip('numpy')
+
+    graph = ci.ColumnarGraph()
+    graph.add_nodes(np.array(['a', 'b', 'c']), {'size': np.array([1.5, 2.0, 3.0])})
+    graph.add_edges(np.array([0, 1]), np.array([1, 2]), {'weight': np.array([7, 8])})
+    gjgf = graph.to_gjgf()
+    assert gjgf['graph']['nodes']['a'] == {'metadata': {'size': 1.5}}
+    assert gjgf['graph']['edges'][1] == {'source': 'b', 'target': 'c', 'metadata': {'weight': 8}}
+    assert graph.to_json() == json.dumps(gjgf['graph'])
+
+
+@pytest.mark.parametrize('directed', [False, True])
+@pytest.mark.parametrize('multigraph', [False, True])
+def test_networkx_bulk_conversion_edge_order(directed, multigraph):
+    nx = pytest.importorskip('networkx')
+
+    cls = {(False, False): nx.Graph, (True, False): nx.DiGraph,
+           (False, True): nx.MultiGraph, (True, True): nx.MultiDiGraph}[directed, multigraph]
+    graph = cls(nx.gnm_random_graph(30, 80, seed=1, directed=directed))
+    graph.add_edge(3, 3, weight=1)
+    graph.add_edge(7, 5, color='red')
+    graph.add_edge(7, 5, color='blue')
+    graph.add_node(99, size=2)
+    for node_mapping in [None, {node: 'n{}'.format(node) for node in graph}]:
+        if node_mapping:
+            graph = nx.relabel_nodes(graph, node_mapping)
+        gjgf = gv.convert.networkx_to_gjgf(graph)
+        expected_edges = []
+        for edge in graph.edges:
+            edge_dict = {'source': str(edge[0]), 'target': str(edge[1])}
+            if graph.edges[edge]:
+                edge_dict['metadata'] = dict(graph.edges[edge])
+            expected_edges.append(edge_dict)
+        assert gjgf['graph']['edges'] == expected_edges
+        assert list(gjgf['graph']['nodes']) == [str(node) for node in graph.nodes]
+        assert gjgf['graph']['nodes'][str(node_mapping[99] if node_mapping else 99)] == {
+            'metadata': {'size': 2}}
+
+
+def test_igraph_bulk_conversion_with_missing_values():
+    ig = pytest.importorskip('igraph')
+
+    graph = ig.Graph(n=3, edges=[(0, 1), (1, 2), (2, 0)], directed=True)
+    graph['name'] = 'g'
+    graph.vs[0]['label'] = 'a'
+    graph.vs[2]['size'] = 7
+    graph.es[1]['weight'] = 0.5
+    graph.es['unused'] = [None, None, None]
+    gjgf = gv.convert.igraph_to_gjgf(graph)
+    assert gjgf['graph']['nodes'] == {
+        '0': {'label': 'a'}, '1': {}, '2': {'metadata': {'size': 7}}}
+    assert gjgf['graph']['edges'] == [
+        {'source': '0', 'target': '1'},
+        {'source': '1', 'target': '2', 'metadata': {'weight': 0.5}},
+        {'source': '2', 'target': '0'},
+    ]
+    assert gjgf['graph']['metadata'] == {'name': 'g'}
+
+
+def test_networkit_bulk_conversion_with_edge_metadata_keys():
+    nk = pytest.importorskip('networkit')
+
+    graph = nk.Graph(4, directed=False)
+    graph.addEdge(0, 1)
+    graph.addEdge(1, 2)
+    graph.addEdge(2, 3)
+    graph.indexEdges()
+    graph.removeNode(3)
+    edge_metadata = {(1, 0): {'color': 'red'}, graph.edgeId(1, 2): {'size': 3},
+                     '(2, 3)': {'color': 'unused'}, 'invalid': {}}
+    gjgf = gv.convert.networkit_to_gjgf([graph, {}, {'1': {'label': 'b'}}, edge_metadata])
+    assert gjgf['graph']['nodes'] == {'0': {}, '1': {'label': 'b'}, '2': {}}
+    edges = {tuple(sorted([edge['source'], edge['target']])): edge.get('metadata')
+             for edge in gjgf['graph']['edges']}
+    assert edges == {('0', '1'): {'color': 'red'}, ('1', '2'): {'size': 3}}
+
+    # Undirected edges come in ascending order of their smaller node and point from the
+    # larger to the smaller node, with and without id-keyed metadata. As before, only keys
+    # in that direction and strings of the exact form '(u, v)' are used
+    graph = nk.Graph(4, directed=False)
+    for source, target in [(0, 1), (2, 1), (3, 3), (0, 3)]:
+        graph.addEdge(source, target)
+    graph.indexEdges()
+    by_tuple = {'(1, 0)': {'color': 'red'}, '(0, 1)': {'color': 'blue'},
+                (1, 2): {'color': 'blue'}, '(3,3)': {'color': 'blue'}}
+    by_id = dict(by_tuple)
+    by_id[graph.edgeId(3, 0)] = {'size': 2}
+    for edge_metadata in [by_tuple, by_id]:
+        gjgf = gv.convert.networkit_to_gjgf([graph, {}, {}, edge_metadata])
+        assert [(edge['source'], edge['target']) for edge in gjgf['graph']['edges']] == [
+            ('1', '0'), ('3', '0'), ('2', '1'), ('3', '3')]
+        assert gjgf['graph']['edges'][0]['metadata'] == {'color': 'red'}
+        assert 'metadata' not in gjgf['graph']['edges'][2]
+        assert 'metadata' not in gjgf['graph']['edges'][3]
+    assert gjgf['graph']['edges'][1]['metadata'] == {'size': 2}
+
+    # Same edges and metadata as a traversal with graph.forEdges(), apart from the order
+    graph = nk.Graph(6, directed=False)
+    for source, target in [(5, 0), (1, 4), (2, 2), (3, 1), (0, 4), (4, 5), (2, 3), (1, 0)]:
+        graph.addEdge(source, target)
+    traversed = []
+    graph.forEdges(lambda source, target, weight, edge_id: traversed.append(
+        {'source': str(source), 'target': str(target),
+         'metadata': {'size': source * 10 + target}}))
+    edge_metadata = {'({}, {})'.format(edge['source'], edge['target']): edge['metadata']
+                     for edge in traversed}
+    gjgf = gv.convert.networkit_to_gjgf([graph, {}, {}, edge_metadata])
+    assert sorted(gjgf['graph']['edges'], key=repr) == sorted(traversed, key=repr)
+
+    # Parallel edges keep their own id-keyed metadata
+    multigraph = nk.Graph(2, directed=False)
+    multigraph.addEdge(0, 1)
+    multigraph.addEdge(1, 0, checkMultiEdge=False)
+    multigraph.indexEdges()
+    gjgf = gv.convert.networkit_to_gjgf([multigraph, {}, {}, {0: {'size': 1}, 1: {'size': 2}}])
+    assert [edge['metadata'] for edge in gjgf['graph']['edges']] == [{'size': 1}, {'size': 2}]
+
+    directed_graph = nk.Graph(3, directed=True)
+    directed_graph.addEdge(0, 1)
+    directed_graph.addEdge(2, 1)
+    gjgf = gv.convert.networkit_to_gjgf([directed_graph, {}, {}, {'(0, 1)': {'size': 1},
+                                                                  (1, 2): {'size': 2}}])
+    assert gjgf['graph']['edges'] == [
+        {'source': '0', 'target': '1', 'metadata': {'size': 1}},
+        {'source': '2', 'target': '1'},
+    ]
+
+
+@pytest.mark.parametrize('workers', [None, 1, 2])
+def test_multiple_graphs_with_workers(workers):
+    nx = pytest.importorskip('networkx')
+
+    graphs = [nx.path_graph(num_nodes) for num_nodes in range(2, 7)]
+    gjgf = gv.convert.multiple_to_gjgf(graphs, workers=workers)
+    assert [len(graph['nodes']) for graph in gjgf['graphs']] == [2, 3, 4, 5, 6]
+
+    data = ci.normalize_graph_data([{'graph': {'nodes': {'a': {}}}}] + graphs, workers)
+    assert data[0] == {'nodes': {'a': {}}}
+    assert [item.to_gjgf()['graph'] for item in data[1:]] == gjgf['graphs']
+    html = gv.d3(graphs, workers=workers).to_html()
+    assert len(html) == len(gv.d3(gjgf).to_html())
+
+    with pytest.raises(ValueError, match='Graph 3 of 4 could not be converted to gJGF.') as info:
+        gv.convert.multiple_to_gjgf(graphs[:2] + ['no graph'] + graphs[:1], workers=workers)
+    assert info.value.__cause__ is not None
+
+    # A graph object that fails is reported with its position, also by worker processes
+    broken = nx.path_graph(3)
+    broken.graph = None
+    with pytest.raises(ValueError, match='Graph 3 of 4 could not be converted.') as info:
+        ci.normalize_graph_data([{'graph': {'nodes': {}}}] + graphs[:1] + [broken] + graphs[:1],
+                                workers)
+    assert isinstance(info.value.__cause__, AttributeError)
+
+
+@pytest.mark.parametrize('chunk_size', [7, 1024 * 1024])
+def test_streaming_gjgf_file(tmp_path, chunk_size):
+    from gravis._internal.conversion import _streaming as stream
+    graph = {
+        'label': 'g',
+        'metadata': {'color': 'red'},
+        'nodes': {'a': {'label': 'Ä', 'metadata': {'size': 10.5}},
+                  'b': {'label': None, 'metadata': {'color': None, 'size': 1}},
+                  'c': {'metadata': {'color': 'red', 'size': 2}}},
+        'edges': [
+            {'source': 'a', 'target': 'b', 'directed': False, 'metadata': {'w': [1, 2]}},
+            {'source': 'b', 'target': 'c', 'id': 'e2', 'label': 'x'},
+        ],
+    }
+    results = []
+    for data in [{'graph': dict(graph, directed=True)},
+                 {'graphs': [dict(graph, directed=False), graph]},
+                 {'graph': dict(graph, directed=True, extra=123)}]:
+        filepath = str(tmp_path / 'graph.json')
+        with open(filepath, 'w') as file_handle:
+            json.dump(data, file_handle, indent=2)
+        streamed = stream.load_gjgf_file(filepath, chunk_size=chunk_size, batch_size=2)
+        assert streamed.keys() == data.keys()
+        expected = data.get('graphs', [data.get('graph')])
+        result = streamed.get('graphs', [streamed.get('graph')])
+        assert json.loads(ci.graph_data_to_json(result)) == expected
+        # Null values and the order of keys in each node are kept
+        for item, expected_item in zip(result, expected):
+            if isinstance(item, ci.ColumnarGraph):
+                assert json.loads(item.to_json(), object_pairs_hook=OrderedDict)['nodes'] == \
+                    json.loads(json.dumps(expected_item['nodes']), object_pairs_hook=OrderedDict)
+        results.extend(result)
+    # Graphs without directed or with unknown keys are kept in a dict
+    assert [isinstance(item, ci.ColumnarGraph) for item in results] == [True, True, False, False]
+    assert 'directed' not in results[2]
+
+    for data in [{'graph': {'edges': [], 'nodes': {}}},
+                 {'graph': {'nodes': {'a': {'metadata': {'label': 'x'}}}}},
+                 {'graph': {'nodes': {'a': {}}, 'edges': [{'source': 'a', 'target': 'b'}]}},
+                 {'graph': {'nodes': {}}, 'other': 1}]:
+        with open(filepath, 'w') as file_handle:
+            json.dump(data, file_handle)
+        with pytest.raises(stream.NotStreamable):
+            stream.load_gjgf_file(filepath, chunk_size=chunk_size)
+    with open(filepath, 'w') as file_handle:
+        file_handle.write('{"graph": {"nodes": {"a": {}}')
+    with pytest.raises(stream.NotStreamable):
+        stream.load_gjgf_file(filepath, chunk_size=chunk_size)
+
+
+def test_normalize_large_gjgf_file(tmp_path, monkeypatch):
+    from gravis._internal.conversion import _streaming
+
+    monkeypatch.setattr(_streaming, 'MIN_FILE_SIZE', 0)
+    filepath = str(tmp_path / 'graph.json')
+    for data in [{'graph': {'directed': False, 'nodes': {'a': {}, 'b': {}},
+                            'edges': [{'source': 'a', 'target': 'b'}]}},
+                 {'graph': {'nodes': {'a': {'label': None}}}}]:
+        with open(filepath, 'w') as file_handle:
+            json.dump(data, file_handle)
+        normalized = ci.normalize_graph_data(filepath)
+        assert json.loads(ci.graph_data_to_json(normalized)) == [data['graph']]
+        assert len(gv.d3(filepath).to_html()) == len(gv.d3(data).to_html())
+
+    # Graphs from large files are embedded in binary form like converted graph objects
+    data = {'graph': {'directed': True, 'nodes': {'a': {}}, 'edges': []}}
+    with open(filepath, 'w') as file_handle:
+        json.dump(data, file_handle)
+    assert '"gravis_binary"' in gv.d3(filepath, binary_data=True).to_html()
+    assert '"gravis_binary"' not in gv.d3(data, binary_data=True).to_html()
+
+
+def test_binary_graph_encoding():
+    import array
+    import base64
+
+    from gravis._internal.conversion import _binary
+
+    def decode_array(text, index_type):
+        typecode = {'u8': 'B', 'u16': 'H', 'u32': 'I', 'i32': 'i', 'f32': 'f', 'f64': 'd'}
+        return array.array(typecode[index_type], base64.b64decode(text)).tolist()
+
+    def decode_column(column):
+        if column['type'] == 'json':
+            values = column['data']
+            if 'present' not in column:
+                return [ci.MISSING if val is None else val for val in values]
+        elif column['type'] == 'str':
+            values = [column['table'][idx]
+                      for idx in decode_array(column['data'], column['index_type'])]
+        elif column['type'] == 'bool':
+            values = [val == 1 for val in decode_array(column['data'], 'u8')]
+        else:
+            values = decode_array(column['data'], column['type'])
+        if 'present' in column:
+            present = decode_array(column['present'], 'u8')
+            values = [val if is_present else ci.MISSING
+                      for val, is_present in zip(values, present)]
+        return values
+
+    missing = ci.MISSING
+    graph = ci.ColumnarGraph(True, {'label': 'g'})
+    graph.add_nodes(['a', 'b', 'c', 'd'], {
+        'label': ['x', missing, 'y', 'z'], 'color': ['red', 'red', missing, 'blue'],
+        'x': [0.5, 1.5, 2.5, missing], 'y': [0.1, 0.2, 0.3, 0.4],
+        'flag': [True, False, True, True]})
+    graph.add_edges([0, 1, 2], [1, 2, 3], {
+        'weight': [1, -2, 2**40], 'count': [1, 2, missing], 'misc': [[1], 'a', missing],
+        'note': [None, 'a', missing]})
+    encoded = json.loads(_binary.encode_graph(graph))
+    assert encoded['gravis_binary'] == _binary.FORMAT_VERSION
+    assert encoded['graph'] == {'directed': True, 'label': 'g'}
+    assert encoded['nodes']['ids'] == ['a', 'b', 'c', 'd']
+    nodes, edges = encoded['nodes'], encoded['edges']
+    assert {key: col['type'] for key, col in nodes['metadata'].items()} == {
+        'color': 'str', 'x': 'f32', 'y': 'f64', 'flag': 'bool'}
+    assert {key: col['type'] for key, col in edges['metadata'].items()} == {
+        'weight': 'json', 'count': 'i32', 'misc': 'json', 'note': 'json'}
+    for encoded_columns, columns in [(nodes, graph.iter_node_columns()),
+                                     (edges, graph.iter_edge_columns())]:
+        for key, column in columns:
+            level = 'data' if key in ('label', 'id') else 'metadata'
+            assert decode_column(encoded_columns[level][key]) == column
+    assert decode_array(edges['sources'], 'u32') == [0, 1, 2]
+    assert decode_array(edges['targets'], 'u32') == [1, 2, 3]
+
+    positional = ci.ColumnarGraph()
+    positional.add_nodes([str(idx) for idx in range(3)])
+    assert json.loads(_binary.encode_graph(positional))['nodes']['ids'] is None
+    nx = pytest.importorskip('networkx')
+    html = gv.d3([nx.path_graph(3), {'graph': {'nodes': {'a': {}}}}], binary_data=True).to_html()
+    assert html.count('"gravis_binary"') == 1
+
+
+# Reads nodes and edges of a graph in binary form with the decoder of the templates in
+# the way their parsers do and writes them as gJGF
+DECODER_HARNESS = """
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const decoder = eval('(' + input.decoder + ')');
+const givenData = decoder.decodeGraphs([input.graph])[0];
+function toItem(row) {
+  const item = {}, metadata = {};
+  Object.keys(row).filter(key => key !== 'metadata' && row[key] !== undefined)
+    .forEach(key => { item[key] = row[key]; });
+  Object.keys(row.metadata).filter(key => row.metadata[key] !== undefined)
+    .forEach(key => { metadata[key] = row.metadata[key]; });
+  if (Object.keys(metadata).length > 0) { item.metadata = metadata; }
+  return item;
+}
+const nodes = {}, edges = [];
+for (const [nodeId, node] of decoder.iterNodes(givenData.nodes)) { nodes[nodeId] = toItem(node); }
+for (let i = 0; i < givenData.edges.length; i++) { edges.push(toItem(decoder.getEdge(givenData.edges, i))); }
+delete givenData.nodes;
+delete givenData.edges;
+process.stdout.write(JSON.stringify({graph: givenData, nodes: nodes, edges: edges}));
+"""
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='requires Node.js')
+def test_binary_graph_decoding_in_templates():
+    from gravis._internal.conversion import _binary
+    from gravis._internal.plotting import template_system
+
+    missing = ci.MISSING
+    graph = ci.ColumnarGraph(True, {'label': 'g', 'node_color': 'red'})
+    graph.add_nodes(['a', 'b', 'c', 'd'], {
+        'label': ['x', missing, 'y', 'z'], 'color': ['red', 'red', missing, 'blue'],
+        'x': [0.5, 1.5, 2.5, missing], 'flag': [True, False, True, True]})
+    graph.add_edges([0, 1, 2], [1, 2, 3], {
+        'weight': [1, -2, 2**40], 'count': [1, 2, missing], 'misc': [[1], 'a', missing],
+        'note': [None, 'a', missing], 'label': ['e', 'e', 'f']})
+    decoder = template_system.load(template_system.BINARY_DECODER_RESOURCE)
+    data = json.dumps({'decoder': decoder, 'graph': json.loads(_binary.encode_graph(graph))})
+    result = subprocess.run(['node', '-e', DECODER_HARNESS], input=data, stdout=subprocess.PIPE,
+                            universal_newlines=True, check=True, timeout=60)
+    decoded = json.loads(result.stdout)
+    expected = graph.to_gjgf()['graph']
+    assert decoded['nodes'] == expected.pop('nodes')
+    assert decoded['edges'] == expected.pop('edges')
+    assert decoded['graph'] == expected
+
+    # The decoder is inserted once into each template instead of being part of it
+    for plot in (gv.d3, gv.vis, gv.three):
+        html = plot({'graph': {'nodes': {'a': {}}}}).to_html()
+        assert html.count('decodeArray(text, type)') == 1
@@ -0,0 +1,245 @@
+from copy import deepcopy
+import json
+import os
+
+import numpy as np
+import pytest
+import shared
+
+import gravis as gv
+
+
+def get_positions(data, keys=('x', 'y')):
+    nodes = data['graph']['nodes']
+    if isinstance(nodes, dict):
+        nodes = nodes.values()
+    return np.array([[node['metadata'][key] for key in keys] for node in nodes])
+
+
+def test_force_directed_layout():
+    data = shared.TESTDATA_GJGF['undirected attributed']
+    original = deepcopy(data)
+    result = gv.layout.force_directed(data)
+    assert data == original
+    assert len(result['graph']['nodes']) == len(data['graph']['nodes'])
+    assert result['graph']['edges'] == data['graph']['edges']
+    positions = get_positions(result)
+    assert np.isfinite(positions).all()
+    assert len(np.unique(positions, axis=0)) == len(positions)
+    # Deterministic, centered and usable by all plotting functions
+    assert gv.layout.force_directed(data) == result
+    assert np.abs(positions.mean(axis=0)).max() < 1.0
+    for func in [gv.d3, gv.vis, gv.three]:
+        assert '"x"' in func(result).to_html()
+
+
+def test_force_directed_layout_resembles_d3_force():
+    nx = pytest.importorskip('networkx')
+    graph = nx.les_miserables_graph()
+    # Median edge length of d3-force in the browser with the default parameters of d3()
+    result = gv.layout.force_directed(graph)
+    positions = {node_id: (node['metadata']['x'], node['metadata']['y'])
+                 for node_id, node in result['graph']['nodes'].items()}
+    lengths = [np.hypot(*np.subtract(positions[edge['source']], positions[edge['target']]))
+               for edge in result['graph']['edges']]
+    assert 70.0 < np.median(lengths) < 90.0
+    # Stronger repulsion spreads the nodes further
+    spread = gv.layout.force_directed(graph, many_body_force_strength=-300.0)
+    assert np.ptp(get_positions(spread), axis=0).mean() > np.ptp(
+        get_positions(result), axis=0).mean()
+
+    # Columnar graphs from graph libraries give the same result as their gJGF
+    assert gv.layout.force_directed(gv.convert.networkx_to_gjgf(graph)) == result
+
+
+def test_force_directed_layout_keeps_given_positions():
+    data = {'graph': {
+        'nodes': {'a': {'metadata': {'x': 100, 'y': -20}}, 'b': {}, 'c': {'label': 'C'}},
+        'edges': [{'source': 'a', 'target': 'b'}, {'source': 'b', 'target': 'c'},
+                  {'source': 'c', 'target': 'unknown'}],
+    }}
+    result = gv.layout.force_directed(data, use_collision_force=True)
+    nodes = result['graph']['nodes']
+    assert nodes['a']['metadata'] == {'x': 100.0, 'y': -20.0}
+    assert nodes['c']['label'] == 'C'
+    assert 'x' not in data['graph']['nodes']['b']
+
+    # Multiple graphs
+    result = gv.layout.force_directed(
+        [data, shared.TESTDATA_GJGF['undirected attributed']], iterations=10)
+    assert len(result['graphs']) == 2
+
+    with pytest.raises(TypeError):
+        gv.layout.force_directed(data, iterations=1.5)
+
+
+def test_multilevel_layout():
+    # A grid is untangled better than by the simulation of d3-force
+    num_rows = 30
+    nodes = {'{},{}'.format(i, j): {} for i in range(num_rows) for j in range(num_rows)}
+    edges = [{'source': '{},{}'.format(i, j), 'target': '{},{}'.format(i + di, j + dj)}
+             for i in range(num_rows) for j in range(num_rows) for di, dj in [(0, 1), (1, 0)]
+             if i + di < num_rows and j + dj < num_rows]
+    nodes['0,0'] = {'metadata': {'x': 500, 'y': 500}}
+    data = {'graph': {'nodes': nodes, 'edges': edges}}
+
+    def edge_length_ratio(result):
+        metadata = result['graph']['nodes']
+        positions = {key: (node['metadata']['x'], node['metadata']['y'])
+                     for key, node in metadata.items()}
+        edge_lengths = [np.hypot(*np.subtract(positions[edge['source']],
+                                              positions[edge['target']]))
+                        for edge in edges]
+        values = np.array(list(positions.values()))
+        pair_lengths = np.hypot(*(values[:, None] - values[None, :]).T).ravel()
+        return np.median(edge_lengths) / np.median(pair_lengths)
+
+    result = gv.layout.multilevel(data, seed=1)
+    positions = get_positions(result)
+    assert np.isfinite(positions).all()
+    assert len(np.unique(positions, axis=0)) == len(positions)
+    assert result['graph']['nodes']['0,0']['metadata'] == {'x': 500.0, 'y': 500.0}
+    assert gv.layout.multilevel(data, seed=1) == result
+    assert edge_length_ratio(result) < 0.75 * edge_length_ratio(gv.layout.force_directed(data))
+
+    # Graphs smaller than the coarsest size are laid out by a single simulation
+    small = gv.layout.multilevel(shared.TESTDATA_GJGF['undirected attributed'])
+    assert np.isfinite(get_positions(small)).all()
+    with pytest.raises(TypeError):
+        gv.layout.multilevel(data, coarsest_size=None)
+
+
+def test_multilevel_coarsening_merges_isolated_nodes():
+    from gravis._internal.layout import _multilevel
+
+    # A path of 4 nodes, 5 isolated nodes and a fixed isolated node
+    sources, targets = np.array([0, 1, 2]), np.array([1, 2, 3])
+    masses = np.array([1.0, 1.0, 1.0, 1.0, 3.0, 1.0, 1.0, 1.0, 2.0, 1.0])
+    fixed = np.zeros(10, dtype=bool)
+    fixed[9] = True
+    parents, coarse = _multilevel.coarsen(10, sources, targets, masses, fixed,
+                                          np.random.default_rng(0))
+    num_coarse, coarse_sources, coarse_targets, coarse_masses, coarse_fixed = coarse
+    isolated_groups = sorted(sorted(np.flatnonzero(parents == parent))
+                             for parent in np.unique(parents[4:9]))
+    assert isolated_groups == [[4], [5, 6], [7, 8]]
+    assert num_coarse == 6
+    assert coarse_masses.sum() == masses.sum()
+    assert coarse_fixed.sum() == 1 and coarse_fixed[parents[9]]
+
+
+def test_three_dimensional_layouts():
+    data = deepcopy(shared.TESTDATA_GJGF['undirected attributed'])
+    first_node = data['graph']['nodes'][0]
+    first_node.setdefault('metadata', {}).update(x=1, y=2, z=3)
+    for layout_function in [gv.layout.force_directed, gv.layout.multilevel]:
+        result = layout_function(data, dim=3)
+        positions = get_positions(result, keys=('x', 'y', 'z'))
+        assert np.isfinite(positions).all()
+        assert np.ptp(positions[:, 2]) > 10.0
+        assert result['graph']['nodes'][0]['metadata']['z'] == 3.0
+        assert '"z"' in gv.three(result).to_html()
+    with pytest.raises(ValueError):
+        gv.layout.force_directed(data, dim=4)
+
+
+def test_spectral_layout():
+    # Two grids that are not connected to each other, plus an isolated node
+    num_rows = 25
+    nodes = {}
+    edges = []
+    for prefix in 'ab':
+        nodes.update({'{}{},{}'.format(prefix, i, j): {}
+                      for i in range(num_rows) for j in range(num_rows)})
+        edges += [{'source': '{}{},{}'.format(prefix, i, j),
+                   'target': '{}{},{}'.format(prefix, i + di, j + dj)}
+                  for i in range(num_rows) for j in range(num_rows)
+                  for di, dj in [(0, 1), (1, 0)] if i + di < num_rows and j + dj < num_rows]
+    nodes['single'] = {}
+    data = {'graph': {'nodes': nodes, 'edges': edges}}
+
+    for method in ['auto', 'arpack', 'lobpcg', 'dense']:
+        result = gv.layout.spectral(data, method=method, seed=0)
+        positions = get_positions(result)
+        assert np.isfinite(positions).all()
+        assert len(np.unique(positions, axis=0)) == len(positions)
+        # Neighbours are close compared to the size of the layout
+        index = {key: idx for idx, key in enumerate(result['graph']['nodes'])}
+        edge_lengths = [np.linalg.norm(positions[index[edge['source']]] -
+                                       positions[index[edge['target']]]) for edge in edges]
+        assert np.median(edge_lengths) < 0.05 * np.ptp(positions, axis=0).max()
+        # Components do not overlap
+        is_a = np.array([key.startswith('a') for key in result['graph']['nodes']])
+        is_b = np.array([key.startswith('b') for key in result['graph']['nodes']])
+        lower, upper = positions[is_a].min(axis=0), positions[is_a].max(axis=0)
+        assert not np.all((positions[is_b] >= lower) & (positions[is_b] <= upper), axis=1).any()
+
+    result = gv.layout.spectral(data, dim=3, seed=0)
+    assert np.isfinite(get_positions(result, keys=('x', 'y', 'z'))).all()
+
+    # Warm start of a force-directed layout
+    result = gv.layout.force_directed(data, iterations=50, initial_layout='spectral', seed=0)
+    assert np.isfinite(get_positions(result)).all()
+    with pytest.raises(ValueError):
+        gv.layout.spectral(data, method='unknown')
+
+
+def test_layout_cache(tmp_path):
+    def html_positions(fig, keys=('x', 'y')):
+        html = fig.to_html()
+        start = html.index('decodeGraphs(') + len('decodeGraphs(')
+        nodes = json.loads(html[start:html.index(');\n', start)])[0]['nodes']
+        return {node_id: [node['metadata'][key] for key in keys]
+                for node_id, node in nodes.items()}
+
+    num_nodes = 20
+    nodes = {str(i): {} for i in range(num_nodes)}
+    edges = [{'source': str(i), 'target': str((i + 1) % num_nodes)} for i in range(num_nodes)]
+    data = {'graph': {'nodes': nodes, 'edges': edges}}
+    cache = gv.layout.LayoutCache(str(tmp_path / 'layouts'))
+    positions = html_positions(gv.d3(data, layout_cache=cache))
+    assert len(positions) == num_nodes
+    assert len(cache) == 1
+
+    # Stored positions are used for the same topology, even if nodes are given in another
+    # order, edges in another direction and other metadata changed
+    filepath = next((tmp_path / 'layouts').iterdir())
+    stored = np.arange(2 * num_nodes, dtype=float).reshape(num_nodes, 2)
+    np.save(str(filepath), stored)
+    changed = {'graph': {
+        'nodes': {str(i): {'metadata': {'color': 'red'}} for i in reversed(range(num_nodes))},
+        'edges': [{'source': edge['target'], 'target': edge['source']} for edge in edges]}}
+    for fig in [gv.d3(changed, layout_cache=cache),
+                gv.d3(changed, layout_cache=str(tmp_path / 'layouts'))]:
+        positions = html_positions(fig)
+        for rank, node_id in enumerate(sorted(nodes)):
+            assert positions[node_id] == stored[rank].tolist()
+    assert len(cache) == 1
+
+    # Other force arguments or edges need another entry
+    gv.d3(data, layout_cache=cache, links_force_distance=80.0)
+    assert len(cache) == 2
+    gv.d3({'graph': {'nodes': nodes, 'edges': edges[1:]}}, layout_cache=cache)
+    assert len(cache) == 3
+
+    # three gets positions in 3D, which are pinned by the template
+    positions = html_positions(gv.three(data, layout_cache=cache), ('x', 'y', 'z'))
+    assert len(cache) == 4
+    assert np.ptp(np.array(list(positions.values())), axis=0).min() > 10.0
+    assert html_positions(gv.three(changed, layout_cache=cache), ('x', 'y', 'z')) == positions
+    assert len(cache) == 4
+
+    # Least recently used entries are removed when the cache grows too large
+    entry_size = filepath.stat().st_size
+    cache = gv.layout.LayoutCache(str(tmp_path / 'small'), max_size=2 * entry_size)
+    cache.put('a', stored)
+    cache.put('b', stored)
+    os.utime(str(tmp_path / 'small' / 'a.npy'), (1000, 1000))
+    os.utime(str(tmp_path / 'small' / 'b.npy'), (2000, 2000))
+    assert cache.get('a').tolist() == stored.tolist()
+    cache.put('c', stored)
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    cache.clear()
+    assert len(cache) == 0
@@ -1,4 +1,9 @@
+import json
 import os
+import re
+import shutil
+import subprocess
+import time
 from copy import deepcopy
 
 import pytest
@@ -25,6 +30,9 @@ def test_plotting_fig(my_outdir):
         for s in strings:
             assert isinstance(s, str)
             assert len(s) > 20
+        # Readiness signal for image export
+        for s in strings[2:]:
+            assert 'data-gravis-ready' in s
 
         # Display variants
         fig.display()
@@ -37,6 +45,134 @@ def test_plotting_fig(my_outdir):
             fig.export_html(filepath, overwrite=False)
 
 
+def test_exporting_html_with_shared_assets(tmp_path):
+    data = shared.TESTDATA_NETWORKX['undirected']
+    figs = [func(data) for func in [gv.d3, gv.vis, gv.three, gv.d3]]
+    directory = str(tmp_path / 'site')
+    filepaths = gv.export_html_many(figs, directory)
+    assert [os.path.basename(filepath) for filepath in filepaths] == [
+        'figure_1.html', 'figure_2.html', 'figure_3.html', 'figure_4.html']
+    assets = sorted(os.listdir(os.path.join(directory, 'assets')))
+    assert len(assets) == 5  # require.js, d3, vis-network, three, 3d-force-graph
+    for filepath, fig in zip(filepaths, figs):
+        with open(filepath) as file_handle:
+            html = file_handle.read()
+        assert len(html) < len(fig.to_html()) / 2
+        for resource_path in fig._get_resource_paths():
+            filename = gv._internal.plotting.template_system.asset_filename(resource_path)
+            assert '<script src="assets/{}"'.format(filename) in html
+    with pytest.raises(FileExistsError):
+        gv.export_html_many(figs[:1], directory)
+    assert len(gv.export_html_many({'a.html': figs[0]}, directory, overwrite=True,
+                                   compress=True)) == 1
+
+    html = figs[0].to_html_standalone(asset_url='https://example.org/lib/')
+    assert '<script src="https://example.org/lib/require.min.' in html
+    nested = str(tmp_path / 'nested' / 'fig.html')
+    os.makedirs(os.path.dirname(nested))
+    figs[0].export_html(nested, asset_dir=os.path.join(directory, 'assets'))
+    with open(nested) as file_handle:
+        assert '<script src="../site/assets/d3.v7.min.def.' in file_handle.read()
+
+
+def test_notebook_mode_loads_libraries_once():
+    pytest.importorskip('IPython')
+    notebook = gv._internal.plotting.notebook
+
+    data = shared.TESTDATA_NETWORKX['undirected']
+    figs = [func(data) for func in [gv.d3, gv.vis, gv.three]]
+    library_names = ['gravis-d3-v7', 'gravis-vis-network', 'gravis-three',
+                     'gravis-3d-force-graph']
+    bootstrap_html = notebook.get_bootstrap_html()
+    for name in library_names:
+        assert 'define("{}"'.format(name) in bootstrap_html
+    sizes = [len(fig.to_html_partial()) for fig in figs]
+    try:
+        gv.init_notebook_mode()
+        for fig, size in zip(figs, sizes):
+            html = fig._repr_html_()
+            assert len(html) < size / 2
+            assert not any('define("{}"'.format(name) in html for name in library_names)
+            assert 'define("gravis-' in fig.to_html_standalone()
+    finally:
+        notebook.reset()
+    assert [len(fig.to_html_partial()) for fig in figs] == sizes
+
+
+# Runs script elements in Node.js with the bundled require.js, but without a real DOM.
+# Every DOM access of a template is recorded and throws, which shows that its plot code
+# started. A message written into an element means the libraries were not found.
+BOOTSTRAP_HARNESS = """
+const vm = require('vm');
+const accesses = [];
+let message = null;
+function element(id) {
+  return new Proxy({}, {
+    get(target, prop) { accesses.push(id + '.' + String(prop)); throw new Error('DOM access'); },
+    set(target, prop, value) {
+      if (prop === 'innerText') { message = value; } else { accesses.push(id); }
+      return true;
+    },
+  });
+}
+const document = new Proxy({}, {
+  get(target, prop) {
+    if (prop === 'getElementById') { return element; }
+    accesses.push('document.' + String(prop));
+    throw new Error('DOM access');
+  },
+});
+process.on('uncaughtException', () => {});
+const context = vm.createContext({document, setTimeout, clearTimeout, console});
+context.window = context;
+const scripts = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+scripts.forEach(([delay, code]) => setTimeout(() => vm.runInContext(code, context), delay));
+setTimeout(() => {
+  process.stdout.write(JSON.stringify({accesses: accesses.length, message: message}));
+  process.exit(0);
+}, 1500);
+"""
+
+
+def run_template_bootstrap(scripts):
+    """Run delayed script element contents and report if the plot code of a template ran."""
+    result = subprocess.run(['node', '-e', BOOTSTRAP_HARNESS], input=json.dumps(scripts),
+                            stdout=subprocess.PIPE, universal_newlines=True, check=True,
+                            timeout=60)
+    return json.loads(result.stdout)
+
+
+def get_script_contents(html):
+    return '\n'.join(re.findall(
+        r'<script charset="utf-8" type="text/javascript">(.*?)</script>', html, re.S))
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='requires Node.js')
+def test_templates_start_plot_when_libraries_are_loaded():
+    pytest.importorskip('IPython')
+    notebook = gv._internal.plotting.notebook
+
+    data = shared.TESTDATA_NETWORKX['undirected']
+    figs = [func(data) for func in [gv.d3, gv.vis, gv.three]]
+    for fig in figs:
+        result = run_template_bootstrap([[0, get_script_contents(fig.to_html())]])
+        assert result['message'] is None
+        assert result['accesses'] > 0
+
+    # In a notebook, a figure waits for libraries that are loaded by a later output
+    bootstrap_script = get_script_contents(notebook.get_bootstrap_html())
+    try:
+        gv.init_notebook_mode()
+        for fig in figs:
+            figure_script = get_script_contents(fig._repr_html_())
+            assert 'define("gravis-' not in figure_script
+            result = run_template_bootstrap([[0, figure_script], [300, bootstrap_script]])
+            assert result['message'] is None
+            assert result['accesses'] > 0
+    finally:
+        notebook.reset()
+
+
 @pytest.mark.only_with_graph_libraries
 def test_plotting_fig_and_exporting_static_image(my_outdir):
     data = shared.TESTDATA_NETWORKX['undirected']
@@ -93,6 +229,154 @@ def test_plotting_fig_and_exporting_static_image(my_outdir):
             fig.export_svg(filepath, webdriver=driver, capture_delay=1.5, overwrite=True)
 
 
+def test_default_capture_delay():
+    # The readiness signal only shortens the wait, the maximum stays as before
+    import inspect
+
+    fig = gv.d3({'graph': {'nodes': {'a': {}}}})
+    for method in [fig.to_png, fig.to_jpg, fig.to_svg,
+                   fig.export_png, fig.export_jpg, fig.export_svg, gv.export_many]:
+        assert inspect.signature(method).parameters['capture_delay'].default == 3.5
+
+
+@pytest.mark.only_with_selenium
+def test_plots_signal_finished_layout(tmp_path):
+    rendering = gv._internal.plotting.rendering
+    data = shared.TESTDATA_NETWORKX['undirected']
+    figs = [gv.d3(data), gv.d3(data, layout_algorithm_active=False), gv.vis(data),
+            gv.three(data)]
+
+    for create_driver in (rendering.create_firefox_driver, rendering.create_chrome_driver):
+        driver = create_driver()
+        try:
+            for idx, fig in enumerate(figs):
+                filepath = str(tmp_path / 'fig_{}.html'.format(idx))
+                fig.export_html(filepath, overwrite=True)
+                driver.get('file://' + filepath)
+                # The attribute is set by the plot, not by a timeout
+                assert rendering.wait_until_ready(driver, 30.0)
+                # The image is created by the export routine of the plot
+                assert rendering.capture_image('png', driver).startswith(b'\x89PNG')
+            # three has no SVG export
+            assert rendering.capture_image('svg', driver) is None
+            # A page without a started plot is reported as such
+            driver.get('data:text/html,<div id="x-graph-div"></div>')
+            with pytest.raises(ValueError, match='did not start'):
+                rendering.capture_image('png', driver)
+        finally:
+            driver.quit()
+
+
+@pytest.mark.only_with_selenium
+def test_rendering_fully_positioned_3d_graph(tmp_path):
+    pytest.importorskip('numpy')
+    rendering = gv._internal.plotting.rendering
+    data = shared.TESTDATA_NETWORKX['undirected']
+    fig = gv.three(data, layout_cache=str(tmp_path / 'layouts'))
+    filepath = str(tmp_path / 'three.html')
+    fig.export_html(filepath)
+
+    for create_driver in (rendering.create_firefox_driver, rendering.create_chrome_driver):
+        driver = create_driver()
+        try:
+            driver.get('file://' + filepath)
+            # Without a warmup of the simulation the plot is finished almost at once
+            assert rendering.wait_until_ready(driver, 10.0)
+            first = rendering.capture_image('png', driver)
+            time.sleep(1.0)
+            # Pinned nodes do not move, so the same image is drawn again
+            assert rendering.capture_image('png', driver) == first
+        finally:
+            driver.quit()
+
+
+@pytest.mark.only_with_selenium
+def test_exporting_static_images_with_render_pool(my_outdir):
+    data = shared.TESTDATA_NETWORKX['undirected']
+    figs = {'d3': gv.d3(data), 'vis': gv.vis(data), 'three': gv.three(data)}
+
+    for driver in ('firefox', 'chrome'):
+        # A browser is replaced after two images, which happens twice with a single browser
+        with gv.RenderPool(size=1, webdriver=driver, max_renders=2) as pool:
+            for name, fig in figs.items():
+                filepath = os.path.join(my_outdir, '{}_pool_{}.png'.format(name, driver))
+                fig.export_png(filepath, capture_delay=1.5, overwrite=True, render_pool=pool)
+                assert os.path.getsize(filepath) > 0
+                assert fig.to_jpg(capture_delay=1.5, render_pool=pool)
+            # A failed job does not break the pool
+            with pytest.raises(ValueError):
+                figs['vis'].to_svg(capture_delay=0.5, render_pool=pool)
+            assert figs['d3'].to_svg(capture_delay=0.5, render_pool=pool).startswith('<svg')
+        with pytest.raises(ValueError):
+            figs['d3'].to_png(render_pool=pool)
+
+    with pytest.raises(ValueError):
+        gv.RenderPool(size=0)
+    with pytest.raises(ValueError):
+        gv.RenderPool(webdriver='safari')
+
+
+@pytest.mark.only_with_selenium
+def test_exporting_many_images(tmp_path):
+    data = shared.TESTDATA_NETWORKX['undirected']
+    directory = str(tmp_path / 'images')
+    os.makedirs(directory)
+    # An existing image is skipped, so that an interrupted export can be resumed
+    with open(os.path.join(directory, 'figure_1.png'), 'wb') as file_handle:
+        file_handle.write(b'existing')
+
+    reports_seen = []
+    reports = gv.export_many([gv.d3(data), gv.d3(data), data], out_dir=directory,
+                             capture_delay=1.5, callback=reports_seen.append)
+    assert [report['filepath'] for report in reports] == [
+        os.path.join(directory, 'figure_{}.png'.format(idx)) for idx in (1, 2, 3)]
+    assert sorted(map(id, reports_seen)) == sorted(map(id, reports))
+    assert reports[0]['status'] == 'skipped'
+    with open(os.path.join(directory, 'figure_1.png'), 'rb') as file_handle:
+        assert file_handle.read() == b'existing'
+    for report in reports[1:]:
+        assert report['status'] == 'done'
+        assert report['error'] is None
+        assert report['seconds'] > 0.0
+        assert os.path.isfile(report['filepath'])
+        assert os.path.getsize(report['filepath']) > 100
+    assert not any(filename.endswith('.tmp') for filename in os.listdir(directory))
+
+
+@pytest.mark.only_with_selenium
+def test_exporting_many_images_reports_failures(tmp_path):
+    data = shared.TESTDATA_NETWORKX['undirected']
+    directory = str(tmp_path / 'images')
+    # A failing job is reported instead of raised and does not stop the other jobs
+    reports = gv.export_many({'bad.png': 'not a graph', 'fine.png': data}, out_dir=directory,
+                             capture_delay=1.5)
+    assert [report['status'] for report in reports] == ['failed', 'done']
+    assert reports[0]['error'].startswith('ValueError: ')
+    assert reports[0]['seconds'] > 0.0
+    assert sorted(os.listdir(directory)) == ['fine.png']
+
+
+def test_exporting_many_images_with_invalid_arguments(tmp_path):
+    data = shared.TESTDATA_NETWORKX['undirected']
+    directory = str(tmp_path / 'images')
+    with pytest.raises(ValueError):
+        gv.export_many([data], fmt='gif', out_dir=directory)
+    with pytest.raises(ValueError):
+        gv.export_many([data], out_dir=directory, workers=0)
+
+
+@pytest.mark.only_with_selenium
+def test_exporting_many_images_removes_temporary_files(tmp_path):
+    data = shared.TESTDATA_NETWORKX['undirected']
+    directory = str(tmp_path / 'images')
+    # A directory in place of an image lets the final rename fail after writing
+    os.makedirs(os.path.join(directory, 'blocked.png'))
+    reports = gv.export_many({'blocked.png': data, 'fine.png': data}, out_dir=directory,
+                             overwrite=True, capture_delay=1.5)
+    assert [report['status'] for report in reports] == ['failed', 'done']
+    assert sorted(os.listdir(directory)) == ['blocked.png', 'fine.png']
+
+
 def test_plotting_with_each_keyword_argument(my_outdir):
     # Note: All outputs were inspected manually, all bugs were resolved and all shortcomings
     # documented in the docstrings. This becomes necessary again in case of major code changes
@@ -0,0 +1,125 @@
+import json
+import math
+
+import pytest
+
+import gravis as gv
+
+
+se = gv._internal.utils.serialization
+ci = gv._internal.conversion._internal
+
+
+def installed_backends():
+    backends = []
+    for backend in se.BACKENDS:
+        try:
+            se.JsonSerializer(backend)
+            backends.append(backend)
+        except ImportError:
+            pass
+    return backends
+
+
+@pytest.mark.parametrize('backend', installed_backends())
+def test_serializer_backends(backend):
+    serializer = se.JsonSerializer(backend)
+    data = {'a': [1, 2.5, 1e16, -0.0, True, None, 'x"\\/\nü '], 'b': {'c': 2**70}, 1: 'd'}
+    text = serializer(data)
+    assert json.loads(text) == {'a': data['a'], 'b': data['b'], '1': 'd'}
+    if backend == 'orjson':
+        # Accepted for speed, so that data with None needs no second encoding
+        assert serializer([float('nan'), None]) == '[null,null]'
+        assert serializer(float('inf')) == 'null'
+    else:
+        assert math.isnan(json.loads(serializer([float('nan')]))[0])
+        assert serializer(float('inf')) == 'Infinity'
+    if backend == 'json':
+        assert text == json.dumps(data)
+    with pytest.raises(TypeError):
+        serializer(object())
+    if backend != 'json':
+        # Data with None is encoded once by the fast backend, not again by json
+        calls = []
+        serializer._dumps_compact = calls.append
+        assert serializer({'a': 'null', 'b': [None, 1.5]}) == '{"a":"null","b":[null,1.5]}'
+        assert calls == []
+
+    columns = [
+        ['a', None, 'bü'], [1, None, -3], [1.5, 2.0, None], [True, False, None],
+        [float('nan'), 1.0], [1, 'a', None, [1, 2]], [None, None], [],
+    ]
+    for column in columns:
+        expected = [None if val is None else serializer(val) for val in column]
+        assert serializer.encode_values(column) == expected
+
+
+def test_default_serializer_is_json():
+    # The text of a figure does not depend on which JSON libraries are installed
+    assert se.get_serializer().backend == 'json'
+    graph = {'nodes': {'ü': {'metadata': {'size': 1.5, 'label': None}}}}
+    assert 'decodeGraphs({});'.format(json.dumps([graph])) in gv.d3({'graph': graph}).to_html()
+    for backend in installed_backends():
+        gv.configure_serializer(backend)
+        assert se.get_serializer().backend == backend
+    gv.configure_serializer()
+    assert se.get_serializer().backend == 'json'
+
+
+@pytest.mark.parametrize('backend', installed_backends())
+def test_serializer_with_numpy(backend):
+    np = pytest.importorskip('numpy')
+
+    serializer = se.JsonSerializer(backend)
+    data = {'a': np.arange(3), 'b': np.float32(1.5), 'c': np.int64(7), 'd': np.bool_(True)}
+    assert json.loads(serializer(data)) == {'a': [0, 1, 2], 'b': 1.5, 'c': 7, 'd': True}
+    first = json.loads(serializer({'a': np.array([np.nan, 1.0])}))['a'][0]
+    assert first is None if backend == 'orjson' else math.isnan(first)
+
+
+@pytest.mark.parametrize('backend', installed_backends())
+def test_columnar_graph_json_with_serializer(backend):
+    serializer = se.JsonSerializer(backend)
+    graph = ci.ColumnarGraph(True, {'label': 'g', 'node_color': 'red'})
+    graph.add_nodes(['a', 'b', 'c'], {'label': ['x', None, 'z'], 'size': [1.5, 2.5, 3.5]})
+    graph.add_edges([0, 1], [1, 2], {'weight': [1, 2]})
+    graph.add_edge('c', 'a', {'id': 'e3', 'color': 'blue'})
+    text = graph.to_json(serializer)
+    assert text == serializer(graph.to_gjgf()['graph'])
+    assert ''.join(ci.GraphDataJSON([graph, {'nodes': {}}], serializer)) == serializer(
+        [graph.to_gjgf()['graph'], {'nodes': {}}])
+
+
+@pytest.mark.parametrize('backend', installed_backends())
+def test_figure_with_non_str_keys(backend):
+    def embedded_data(fig):
+        html = fig.to_html()
+        start = html.index('decodeGraphs(') + len('decodeGraphs(')
+        return json.loads(html[start:html.index(');\n', start)])
+
+    data = {'graph': {
+        'nodes': {'a': {'metadata': {1: 'x', 2.5: 'y', False: 'z'}}, 'b': {}},
+        'edges': [{'source': 'a', 'target': 'b', 'metadata': {7: 1, True: 2}}]}}
+    previous = se.get_serializer().backend
+    se.configure_serializer(backend)
+    try:
+        graphs = embedded_data(gv.d3(data))
+        assert graphs[0]['nodes']['a']['metadata'] == {'1': 'x', '2.5': 'y', 'false': 'z'}
+        assert graphs[0]['edges'][0]['metadata'] == {'7': 1, 'true': 2}
+
+        # Graphs of external libraries are encoded column-wise, also in binary form
+        nx = pytest.importorskip('networkx')
+        graph = nx.Graph()
+        graph.add_node('a', color='red')
+        graph.nodes['a'].update({1: 'x', 2.5: 'y', False: 'z'})
+        graph.add_edge('a', 'b')
+        graph.edges['a', 'b'].update({7: 1, True: 2})
+        graphs = embedded_data(gv.d3(graph))
+        assert graphs[0]['nodes']['a']['metadata'] == {
+            'color': 'red', '1': 'x', '2.5': 'y', 'false': 'z'}
+        assert graphs[0]['edges'][0]['metadata'] == {'7': 1, 'true': 2}
+        graphs = embedded_data(gv.d3(graph, binary_data=True))
+        assert sorted(graphs[0]['nodes']['metadata']) == ['1', '2.5', 'color', 'false']
+        assert sorted(graphs[0]['edges']['metadata']) == ['7', 'true']
+    finally:
+        se.configure_serializer(previous)
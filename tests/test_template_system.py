@@ -0,0 +1,159 @@
+import base64
+import io
+import random
+import zlib
+
+import pytest
+
+import gravis as gv
+
+
+ts = gv._internal.plotting.template_system
+
+
+def insert_by_replacement(template, data):
+    for key, val in data.items():
+        template = template.replace('§' + key + '§', val)
+    return template
+
+
+def test_template_fill_and_render():
+    text = '§PREFIX§<a id="§ID§">§ID§</a>§DATA§§SUFFIX§'
+    template = ts.Template(text)
+    assert template.keys == {'PREFIX', 'ID', 'DATA', 'SUFFIX'}
+
+    # Partial filling leaves the remaining placeholders untouched
+    partial = template.fill({'DATA': '{"x": "§ID§"}', 'UNKNOWN': 'ignored'})
+    assert partial.keys == {'PREFIX', 'ID', 'SUFFIX'}
+    assert template.keys == {'PREFIX', 'ID', 'DATA', 'SUFFIX'}
+    assert str(partial) == '§PREFIX§<a id="§ID§">§ID§</a>{"x": "§ID§"}§SUFFIX§'
+
+    # Inserted values are not scanned for placeholders again
+    result = partial.render({'PREFIX': '<p>', 'ID': 'i1', 'SUFFIX': '</p>'})
+    assert result == '<p><a id="i1">i1</a>{"x": "§ID§"}</p>'
+
+    # Missing values keep their tag
+    assert ts.Template('a§B§c').render() == 'a§B§c'
+    assert ts.Template('').render() == ''
+    assert ts.Template('no tags').render({'X': 'y'}) == 'no tags'
+    assert ts.insert('a§B§c§B§', {'B': '-'}) == 'a-c-'
+
+
+@pytest.mark.parametrize('name', ['d3', 'vis', 'three'])
+def test_template_equivalence_with_replacement(name):
+    text = ts.load('templates/{}.html'.format(name))
+    template = ts.load_template('templates/{}.html'.format(name))
+    assert ts.load_template('templates/{}.html'.format(name)) is template
+    assert str(template) == text
+
+    data = {key: '<{}>'.format(key.lower()) for key in template.keys}
+    data1 = {key: val for key, val in data.items()
+             if key not in ('RANDOM_ID', 'PREFIX', 'LOAD_REQUIRE', 'SUFFIX')}
+    data2 = {key: val for key, val in data.items() if key not in data1}
+    expected = insert_by_replacement(insert_by_replacement(text, data1), data2)
+    assert template.fill(data1).render(data2) == expected
+    assert template.render(data) == expected
+    assert '§' not in expected
+
+
+def test_resource_cache(tmp_path):
+    resource_path = 'third_party/require/require.min.js'
+    text = ts.read_resource(resource_path)
+    assert ts.read_resource(resource_path, use_mmap=True) == text
+    # An empty file can not be memory-mapped, but is read as well
+    empty_filepath = str(tmp_path / 'empty.js')
+    open(empty_filepath, 'w').close()
+    assert ts._read_file(empty_filepath, use_mmap=True) == ''
+
+    # Repeated loading returns the same cached object
+    ts.clear_resource_cache()
+    assert ts.load(resource_path) is ts.load(resource_path)
+
+    # Size limit leads to eviction of least recently used entries
+    cache = ts.ResourceCache(max_size=len(text) + 10, use_mmap=True)
+    assert cache.get(resource_path) == text
+    assert len(cache) == 1
+    cache.get('third_party/require/ORIGINAL_LICENSE')
+    assert len(cache) == 1
+    cache.get('third_party/d3/d3.v7.min.def.js')  # too large to be cached
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+
+
+class Chunks:
+    def __init__(self, *chunks):
+        self.chunks = chunks
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+
+def test_template_with_chunked_values():
+    template = ts.Template('<§A§|§B§|§A§>').fill({'A': Chunks('x', 'y', 'z')})
+    assert template.keys == {'B'}
+    assert template.fill({'B': 'b'}).keys == set()
+    assert template.render() == '<xyz|§B§|xyz>'
+    assert template.render({'B': Chunks('1', '2')}) == '<xyz|12|xyz>'
+    assert list(template.iter_chunks({'B': '-'})) == ['<', 'x', 'y', 'z', '|', '-', '|',
+                                                      'x', 'y', 'z', '>']
+    file_handle = io.StringIO()
+    template.write(file_handle, {'B': '-'})
+    assert file_handle.getvalue() == '<xyz|-|xyz>'
+
+
+@pytest.mark.parametrize('func', [gv.d3, gv.vis, gv.three])
+def test_figure_write_html_equals_to_html(func):
+    nx = pytest.importorskip('networkx')
+
+    graph = nx.gnm_random_graph(200, 500, seed=0)
+    nx.set_node_attributes(graph, 'red', 'color')
+    data = [graph, {'graph': {'nodes': {'a': {}}}}]
+    fig = func(data)
+    file_handle = io.StringIO()
+    random.seed(0)
+    fig.write_html(file_handle)
+    random.seed(0)
+    assert file_handle.getvalue() == fig.to_html()
+
+    columns = gv._internal.conversion._internal.normalize_graph_data(graph)[0]
+    chunks = list(columns.iter_json(chunk_size=64))
+    assert len(chunks) > 10
+    assert ''.join(chunks) == columns.to_json()
+
+
+def test_iter_compressed_scripts():
+    def inflate(html):
+        start = html.index('const compressed = "') + len('const compressed = "')
+        data = base64.b64decode(html[start:html.index('"', start)])
+        return zlib.decompress(data, wbits=31).decode('utf-8')
+
+    code = 'if(a < b){ console.log("ä"); }\n' * 500
+    html = '<p>head</p><script charset="utf-8" type="text/javascript">' + code + '</script><p/>'
+    for size in [1, 7, 1000, len(html)]:
+        chunks = [html[pos:pos + size] for pos in range(0, len(html), size)]
+        compressed = ''.join(ts.iter_compressed_scripts(chunks))
+        assert compressed.startswith('<p>head</p><script charset="utf-8"')
+        assert compressed.endswith('</script><p/>')
+        assert compressed.count('</script>') == 1
+        assert inflate(compressed) == code
+    assert ''.join(ts.iter_compressed_scripts(['<p>no script</p>'])) == '<p>no script</p>'
+    with pytest.raises(ValueError):
+        list(ts.iter_compressed_scripts(['<script charset="utf-8" type="text/javascript">x']))
+
+
+@pytest.mark.parametrize('func', [gv.d3, gv.vis, gv.three])
+def test_figure_compressed_html(func, tmp_path):
+    fig = func({'graph': {'nodes': {'a': {}, 'b': {}}, 'edges': [{'source': 'a', 'target': 'b'}]}})
+    random.seed(0)
+    html = fig.to_html_standalone()
+    random.seed(0)
+    compressed = fig.to_html_standalone(compress=True)
+    assert len(compressed) * 2 < len(html)
+    start = html.index('<script charset="utf-8" type="text/javascript">')
+    assert compressed.startswith(html[:start])
+    filepath = str(tmp_path / 'figure.html')
+    random.seed(0)
+    fig.export_html(filepath, compress=True)
+    with open(filepath) as file_handle:
+        assert file_handle.read() == compressed